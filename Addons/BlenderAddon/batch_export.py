@@ -0,0 +1,198 @@
+"""Headless batch export of many .blend files to USD + .gcyc.
+
+Run it with a regular Python, every .blend is exported by its own background Blender process:
+
+    python batch_export.py "assets/**/*.blend" --output-dir export --jobs 8 --blender /path/to/blender
+
+Export settings use the defaults of the export operator, override them with a JSON file:
+
+    python batch_export.py scene.blend --settings settings.json      # {"gcyc_encoding": "BINARY", ...}
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+
+ADDON_DIR = Path(__file__).resolve().parent
+
+# Runs inside the Blender process, imports this module as part of the addon package and starts the worker.
+WORKER_EXPR = (
+    "import sys, importlib\n"
+    "sys.path.insert(0, {parent!r})\n"
+    "importlib.import_module({module!r}).run_worker(sys.argv[sys.argv.index('--') + 1:])\n"
+)
+
+
+#########################################
+#----------------WORKER-----------------#
+#########################################
+# Inside Blender: export the opened .blend and write the result for the batch process.
+def run_worker(argv):
+    from .functions.Blender_to_Gaffer_Main_Exporter import run_export
+
+    parser = argparse.ArgumentParser(prog="batch_export worker")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--result", required=True)
+    parser.add_argument("--settings", default="{}")
+    args = parser.parse_args(argv)
+
+    result = {"ok": False}
+    try:
+        exported = run_export(args.output, json.loads(args.settings))
+        result = {
+            "ok": True,
+            "usd_path": exported["usd_path"],
+            "json_path": exported["json_path"],
+            "manifest_path": exported["manifest_path"],
+            "stats_path": exported["stats_path"],
+            "phases": exported["stats"].phases,
+            "summary": exported["stats"].summary()
+        }
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        with open(args.result, "w") as f:
+            json.dump(result, f)
+
+
+#########################################
+#-------------BATCH PROCESS-------------#
+#########################################
+def collect_blend_files(patterns):
+    files = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            path = os.path.abspath(path)
+            if path.lower().endswith(".blend") and path not in seen:
+                seen.add(path)
+                files.append(path)
+    return files
+
+
+def output_path_for(blend_path, output_dir):
+    folder = output_dir if output_dir else os.path.dirname(blend_path)
+    return os.path.join(folder, Path(blend_path).stem + ".usd")
+
+
+def export_blend_file(blender, blend_path, output_path, settings, timeout):
+    # One background Blender per file, returns the result written by the worker plus the timing.
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = os.path.join(tmp, "result.json")
+        worker_expr = WORKER_EXPR.format(parent=str(ADDON_DIR.parent), module=ADDON_DIR.name + ".batch_export")
+        cmd = [
+            blender, "-b", blend_path,
+            "--python-exit-code", "1",
+            "--python-expr", worker_expr,
+            "--",
+            "--output", output_path,
+            "--result", result_path,
+            "--settings", json.dumps(settings)
+        ]
+        try:
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=timeout)
+            log = proc.stdout
+        except subprocess.TimeoutExpired as e:
+            log = e.stdout or ""
+            if isinstance(log, bytes):
+                log = log.decode(errors="replace")
+            result = {"ok": False, "error": f"timed out after {timeout}s"}
+        else:
+            if os.path.exists(result_path):
+                with open(result_path, "r") as f:
+                    result = json.load(f)
+            else:
+                result = {"ok": False, "error": f"Blender exited with code {proc.returncode} without a result"}
+
+    result["blend"] = blend_path
+    result["time"] = time.perf_counter() - start
+    if not result["ok"]:
+        # keep the end of the Blender output to see what went wrong
+        result["log"] = log[-4000:]
+    return result
+
+
+def run_batch(blend_files, blender="blender", output_dir=None, settings=None, jobs=None, timeout=None):
+    settings = settings or {}
+    jobs = jobs or os.cpu_count() or 1
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Files with the same name would overwrite each other in one output folder
+    outputs = {}
+    results = []
+    for blend_path in blend_files:
+        output_path = output_path_for(blend_path, output_dir)
+        if output_path in outputs:
+            results.append({"ok": False, "blend": blend_path, "time": 0.0, "error": f"same output as {outputs[output_path]}: {output_path}"})
+            continue
+        outputs[output_path] = blend_path
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(export_blend_file, blender, blend_path, output_path, settings, timeout)
+                   for output_path, blend_path in outputs.items()]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result["ok"]:
+                print(f"✅ {result['blend']} ({result['time']:.1f}s) -> {result['usd_path'] or result['json_path']}")
+            else:
+                print(f"❌ {result['blend']} ({result['time']:.1f}s): {result['error']}")
+
+    return results
+
+
+def print_summary(results, wall_time):
+    failed = [result for result in results if not result["ok"]]
+    print(f"\nExported {len(results) - len(failed)}/{len(results)} files in {wall_time:.1f}s")
+    for result in sorted(results, key=lambda result: result["time"], reverse=True)[:5]:
+        print(f"  {result['time']:7.1f}s  {result['blend']}")
+    if failed:
+        print(f"\n{len(failed)} failed:")
+        for result in failed:
+            print(f"  {result['blend']}: {result['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export .blend files to USD + .gcyc for Gaffer with background Blender processes.")
+    parser.add_argument("files", nargs="+", help=".blend files or glob patterns (use ** for sub folders)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable (default: $BLENDER or 'blender')")
+    parser.add_argument("--output-dir", help="Folder for the exported files (default: next to every .blend)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Blender processes running at once (default: CPU count)")
+    parser.add_argument("--settings", help="JSON file overriding the export settings, same names as the export operator properties")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a single file export is stopped")
+    parser.add_argument("--report", help="Write the per file results to this JSON file")
+    args = parser.parse_args(argv)
+
+    settings = {}
+    if args.settings:
+        with open(args.settings, "r") as f:
+            settings = json.load(f)
+
+    blend_files = collect_blend_files(args.files)
+    if not blend_files:
+        print("No .blend files found.")
+        return 1
+
+    start = time.perf_counter()
+    results = run_batch(blend_files, args.blender, args.output_dir, settings, args.jobs, args.timeout)
+    print_summary(results, time.perf_counter() - start)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=4)
+
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
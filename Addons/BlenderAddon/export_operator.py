@@ -2,7 +2,8 @@ import bpy
 import os
 
 from . import icons
-from .functions.Blender_to_Gaffer_Main_Exporter import BlenderExporter
+from .functions.Blender_to_Gaffer_Main_Exporter import EXPORT_DEFAULTS, run_export
+from .functions.Blender_Cycles_Schema import CYCLES_SCHEMA_FILE
 
 
 
@@ -86,6 +87,45 @@ class EXPORT_OT_blender_to_gaffer(bpy.types.Operator):
         description="Sets an attribute that bakes the procedurally generated Texture Space Coordinates that are used by the 'Generated' option in the 'Texture Coordinate' node",
         default=True
     ) # type: ignore
+    texspace_mode: bpy.props.EnumProperty(
+        name="Texture Space",
+        description="How the Texture Space Coordinates are brought to Gaffer",
+        items=[
+            ("ATTRIBUTE", "Baked Attribute", "Bake the coordinates into a per vertex attribute, works with deforming meshes"),
+            ("TRANSFORM", "Texture Space Transform", "Only export the texture space scale and offset of every mesh and rebuild the coordinates in the shader from the object space position. Keeps the USD and render memory small, only valid for non deforming meshes")
+        ],
+        default="ATTRIBUTE"
+    ) # type: ignore
+    preserve_source_meshes: bpy.props.BoolProperty(
+        name="Preserve Source Meshes",
+        description="Bake the Material Index and Texture Space attributes into temporary copies of the meshes used only for the USD export, so the meshes of the .blend are never modified. The copies are rebaked on every export, only meshes baked by an export without this option skip it. Linked meshes are always baked into copies",
+        default=False
+    ) # type: ignore
+    gcyc_encoding: bpy.props.EnumProperty(
+        name="Encoding",
+        description="How the .gcyc material and hierarchy file is written",
+        items=[
+            ("JSON", "JSON", "Indented, human readable JSON"),
+            ("JSON_COMPACT", "Compact JSON", "JSON without indentation, smaller and faster to write and read"),
+            ("BINARY", "Binary", "Compressed binary encoding with interned strings, a fraction of the JSON size")
+        ],
+        default="JSON"
+    ) # type: ignore
+    use_export_cache: bpy.props.BoolProperty(
+        name="Incremental Export",
+        description="Keep a cache next to the .gcyc and only trace again the materials and node groups that changed since the last export. The cached networks are held in memory during the export, so memory grows with the number of materials",
+        default=False
+    ) # type: ignore
+    write_texture_manifest: bpy.props.BoolProperty(
+        name="Texture Manifest",
+        description="Write the resolved paths, sizes and found sequence frames of all the textures next to the .gcyc, so missing textures are reported before the networks are built in Gaffer",
+        default=True
+    ) # type: ignore
+    resolve_cycles_names: bpy.props.BoolProperty(
+        name="Resolve Cycles Names",
+        description="Write the Gaffer Cycles parameter and socket names next to the Blender identifiers, using the Cycles schema written by generate_cycles_schema.py, so the importer does not have to search for them. Without the schema the names are resolved on import",
+        default=False
+    ) # type: ignore
 
     # --- Object Types ---
     export_meshes: bpy.props.BoolProperty(name="Meshes", default=True) # type: ignore
@@ -179,6 +219,14 @@ class EXPORT_OT_blender_to_gaffer(bpy.types.Operator):
             col.prop(self, "matlib_only")
             col.prop(self, "set_matindex")
             col.prop(self, "set_baked_texturespace")
+            row = col.row()
+            row.enabled = self.set_baked_texturespace
+            row.prop(self, "texspace_mode")
+            col.prop(self, "preserve_source_meshes")
+            col.prop(self, "use_export_cache")
+            col.prop(self, "write_texture_manifest")
+            col.prop(self, "resolve_cycles_names")
+            col.prop(self, "gcyc_encoding")
 
         # Object Types
         box = layout.box()
@@ -221,53 +269,20 @@ class EXPORT_OT_blender_to_gaffer(bpy.types.Operator):
     # Execution
     # ------------------------------------------------------------------
     def execute(self, context):
-        usd_path = self.filepath
-        json_path = os.path.splitext(usd_path)[0] + ".gcyc"
+        settings = {name: getattr(self, name) for name in EXPORT_DEFAULTS}
         try:
-            exporter = BlenderExporter(root="/root", selected_only=self.selection_only, set_mat_id=self.set_matindex, bake_TextureSpace=self.set_baked_texturespace)
-            
-            if self.matlib_only:
-                # Export materials only
-                exporter.export_materials(json_path)
-            else:
-                # Export Materials and Hierarchy and set mat_index property
-                exporter.export(json_path)
-                # Export USD
-                if not os.path.splitext(usd_path)[1].lower() in ("usd", "usdc", "usda"):
-                    usd_path = os.path.splitext(usd_path)[0] + ".usd"
-                bpy.ops.wm.usd_export(
-                    filepath=usd_path,
-                    root_prim_path=self.root_prim_path,
-                    selected_objects_only=self.selection_only,
-                    visible_objects_only=self.visible_only,
-                    export_animation=self.export_animation,
-                    evaluation_mode=self.use_settings,
-
-                    export_meshes = self.export_meshes,
-                    export_lights = self.export_lights,
-                    export_cameras = self.export_cameras,
-                    export_curves = self.export_curves,
-                    export_points = self.export_pointclouds,
-                    export_volumes = self.export_volumes,
-                    export_hair = self.export_hair,
-                    convert_world_material = self.export_world,
-
-                    export_uvmaps=self.export_uvmaps,
-                    rename_uvmaps =self.rename_uvmaps,
-                    export_normals=self.export_normals,
-                    export_materials=False,       
-                    use_instancing=self.use_instancing,
-                    export_shapekeys =self.export_blendshapes,
-                    export_armatures =self.export_skins,
-                    only_deform_bones =self.export_bones,
-                )
+            result = run_export(self.filepath, settings)
         except Exception as e:
             self.report({'ERROR'}, f"USD export failed: {e}")
             return {'CANCELLED'}
 
-        if not self.matlib_only:
-            self.report({'INFO'}, f"USD exported to {usd_path}")
-        self.report({'INFO'}, f"Materials exported to {json_path}")
+        self.report({'INFO'}, f"Export stats: {result['stats'].summary()}")
+        if result["cycles_schema_missing"]:
+            self.report({'WARNING'}, f"Resolve Cycles Names is on but {CYCLES_SCHEMA_FILE} is missing or outdated, "
+                                     "plug names are resolved on import. Generate it with generate_cycles_schema.py")
+        if result["usd_path"]:
+            self.report({'INFO'}, f"USD exported to {result['usd_path']}")
+        self.report({'INFO'}, f"Materials exported to {result['json_path']}")
         return {'FINISHED'}
 
     def invoke(self, context, event):
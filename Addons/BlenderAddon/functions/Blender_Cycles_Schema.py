@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import re
+
+
+# Generated inside Gaffer by GafferAddon/python/MagicHammer/Cycles_Import/utils/generate_cycles_schema.py
+# Not committed, it depends on the Gaffer version: generate it before using "Resolve Cycles Names".
+CYCLES_SCHEMA_FILE = "cycles_schema.json"
+CYCLES_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), CYCLES_SCHEMA_FILE)
+CYCLES_SCHEMA_VERSION = 1
+
+# Shader types the importer builds from several Gaffer nodes (or a Box), their plugs are only known there.
+UNRESOLVED_SHADER_TYPES = {"image_texture", "float_curve", "vector_curves", "rgb_curves", "rgb_ramp", "group"}
+
+
+def safe_plug_name(plugname):
+    return plugname.lower().replace(" ", "_")
+
+
+def normalize_name(name):
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+class CyclesPlugResolver:
+    # Export time version of BuildPlanner.resolve_plug_name in GafferAddon/.../Cycles_Import/build_plan.py,
+    # run against the plugs of the bundled schema instead of live Gaffer nodes. Names are written next to the Blender
+    # identifiers so the importer does not have to search for them.
+    def __init__(self, schema, fingerprint):
+        self.shaders = schema["shaders"]
+        self.label_map = schema.get("label_map", {})
+        self.shader_type_remap = schema.get("shader_type_remap", {})
+        # part of the material hashes of the export cache, networks are traced again when the schema changes
+        self.fingerprint = fingerprint
+        # (shader_type, io) -> {label: plug name or None}
+        self.resolved = {}
+        # (shader_type, io) -> {normalized plug name: plug name}
+        self.normalized = {}
+
+    @classmethod
+    def load(cls, filepath=None):
+        # None when there is no usable schema next to this module.
+        filepath = filepath or CYCLES_SCHEMA_PATH
+        try:
+            with open(filepath, "rb") as f:
+                content = f.read()
+            schema = json.loads(content)
+        except (OSError, ValueError):
+            return None
+        if schema.get("version") != CYCLES_SCHEMA_VERSION:
+            return None
+        return cls(schema, hashlib.sha1(content).hexdigest())
+
+    def shader_type(self, cycles_type):
+        # same as shader_safe_type on import
+        cycles_type = self.shader_type_remap.get(cycles_type) or cycles_type
+        return re.sub(r'\W|^(?=\d)', '_', cycles_type)
+
+    def resolve(self, shader_type, socket_label, io):
+        key = (shader_type, io)
+        resolved = self.resolved.setdefault(key, {})
+        if socket_label not in resolved:
+            resolved[socket_label] = self.resolve_uncached(shader_type, socket_label, io)
+        return resolved[socket_label]
+
+    def resolve_uncached(self, shader_type, socket_label, io):
+        plugs = self.shaders.get(shader_type, {}).get(io, {})
+
+        # 1. safe plug name
+        candidate = safe_plug_name(socket_label)
+        if candidate in plugs:
+            return candidate
+
+        # 2. label map
+        if shader_type in ["mix_closure", "add_closure"] and io == "out":
+            return "closure"
+        remap = self.label_map.get(shader_type, {}).get(socket_label.lower())
+        if remap and remap in plugs:
+            return remap
+        elif remap == 'UNSUPPORTED':
+            return 'UNSUPPORTED'
+
+        # 3. fuzzy match
+        key = (shader_type, io)
+        if key not in self.normalized:
+            self.normalized[key] = {}
+            for name in plugs:
+                self.normalized[key].setdefault(normalize_name(name), name)
+        return self.normalized[key].get(normalize_name(socket_label))
+
+    def resolve_node(self, cycles_type, params, node):
+        # {"parameters": {label: plug}, "out": {identifier: plug}} for the params and sockets of a node,
+        # None for the shaders the importer builds itself. Unresolved names are left out.
+        shader_type = self.shader_type(cycles_type)
+        if shader_type in UNRESOLVED_SHADER_TYPES or shader_type not in self.shaders:
+            return None
+
+        labels = list(params.keys()) + [inp.identifier for inp in node.inputs if inp.identifier not in params]
+        plugs = {"parameters": {}, "out": {}}
+        for io, io_labels in (("parameters", labels), ("out", [out.identifier for out in node.outputs])):
+            for label in io_labels:
+                plug_name = self.resolve(shader_type, label, io)
+                if plug_name:
+                    plugs[io][label] = plug_name
+        return plugs
@@ -0,0 +1,86 @@
+import json
+import os
+
+
+# Bump when the serialized network layout changes so old caches are ignored.
+EXPORT_CACHE_VERSION = 3
+EXPORT_CACHE_SUFFIX = ".cache"
+
+
+class ExportCache:
+    # Sidecar of the .gcyc that keeps the serialized network of every material and node group
+    # together with the content hash it was traced from, and the image table entries they use.
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.previous = {"materials": {}, "groups": {}, "images": {}}
+        self.current = {"materials": {}, "groups": {}, "images": {}}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        if not os.path.exists(self.filepath):
+            return
+        try:
+            with open(self.filepath, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable export cache {self.filepath}: {e}")
+            return
+        if data.get("version") != EXPORT_CACHE_VERSION:
+            print(f"Ignoring export cache {self.filepath} written by another exporter version.")
+            return
+        self.previous["materials"] = data.get("materials", {})
+        self.previous["groups"] = data.get("groups", {})
+        self.previous["images"] = data.get("images", {})
+
+    def get_material(self, name, content_hash, tree_hashes):
+        # Returns (network, {group_id: group}, {image_id: image}) or None when the material or any of its groups changed.
+        # Image changes are part of the material and group hashes.
+        entry = self.previous["materials"].get(name)
+        if entry is None or entry["hash"] != content_hash:
+            self.misses += 1
+            return None
+
+        groups = {}
+        for group_id in entry["groups"]:
+            group = self.previous["groups"].get(group_id)
+            if group is None or group["hash"] != tree_hashes.get(group_id):
+                self.misses += 1
+                return None
+            groups[group_id] = group["data"]
+
+        images = {}
+        for image_id in entry["images"]:
+            image = self.previous["images"].get(image_id)
+            if image is None:
+                self.misses += 1
+                return None
+            images[image_id] = image
+
+        self.hits += 1
+        return entry["data"], groups, images
+
+    def store_material(self, name, content_hash, network, groups, images, tree_hashes):
+        self.current["materials"][name] = {
+            "hash": content_hash,
+            "data": network,
+            "groups": list(groups.keys()),
+            "images": list(images.keys())
+        }
+        self.current["images"].update(images)
+        for group_id, group in groups.items():
+            self.current["groups"][group_id] = {
+                "hash": tree_hashes.get(group_id),
+                "data": group
+            }
+
+    def save(self):
+        # Only what was used on this export is written, so removed materials do not pile up.
+        data = {
+            "version": EXPORT_CACHE_VERSION,
+            "materials": self.current["materials"],
+            "groups": self.current["groups"],
+            "images": self.current["images"]
+        }
+        with open(self.filepath, "w") as f:
+            json.dump(data, f)
@@ -0,0 +1,74 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+EXPORT_STATS_SUFFIX = ".stats.json"
+
+
+class ExportStats:
+    # Timings and sizes of one export, written next to the .gcyc to find what makes an export slow.
+    def __init__(self):
+        self.start = time.perf_counter()
+        # phase name -> seconds: material_trace, hierarchy, attribute_bake (part of hierarchy), usd_export
+        self.phases = {}
+        self.materials = {}
+        self.objects = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def record_material(self, name, trace_time, network):
+        self.materials[name] = {
+            "nodes": len(network.get("nodes", {})) if network else 0,
+            "links": len(network.get("links", [])) if network else 0,
+            "trace_time": trace_time,
+            "bytes": 0
+        }
+
+    def record_material_size(self, name, size):
+        if name in self.materials:
+            self.materials[name]["bytes"] = size
+
+    def record_object(self, name, mesh_name, bake_time, shared):
+        self.objects[name] = {
+            "mesh_data": mesh_name,
+            "bake_time": bake_time,
+            # the mesh was already baked for another object
+            "shared": shared
+        }
+
+    def slowest(self, entries, key, count):
+        return sorted(entries.items(), key=lambda item: item[1][key], reverse=True)[:count]
+
+    def to_dict(self) -> dict:
+        return {
+            "total_time": time.perf_counter() - self.start,
+            "phases": self.phases,
+            "material_count": len(self.materials),
+            "object_count": len(self.objects),
+            "materials": self.materials,
+            "objects": self.objects
+        }
+
+    def summary(self, count=3) -> str:
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in self.phases.items()]
+        slow_mats = [f"{name} {entry['trace_time']:.2f}s" for name, entry in self.slowest(self.materials, "trace_time", count)]
+        if slow_mats:
+            parts.append("slowest materials: " + ", ".join(slow_mats))
+        slow_objs = [f"{name} {entry['bake_time']:.2f}s" for name, entry in self.slowest(self.objects, "bake_time", count)]
+        if slow_objs:
+            parts.append("slowest bakes: " + ", ".join(slow_objs))
+        return " | ".join(parts)
+
+    def save(self, filepath):
+        with open(filepath, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
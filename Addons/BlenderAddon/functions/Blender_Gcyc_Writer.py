@@ -0,0 +1,285 @@
+import json
+import os
+import struct
+import zlib
+
+
+#########################################
+#---------BINARY .gcyc ENCODING---------#
+#########################################
+# The binary .gcyc is read back by MagicHammer/Cycles_Import/gcyc_format.py on the Gaffer side,
+# both files have to agree on the layout below.
+#
+# header: b"GCYB", u8 format version, u8 compression (0 none, 1 zlib)
+# body:   one tagged value (the top level dict), zlib compressed as a single stream when enabled.
+#   END / NULL / FALSE / TRUE      tag only
+#   INT                            zigzag varint
+#   FLOAT                          little endian f64
+#   STR_NEW                        varint byte size + utf-8, appended to the string table
+#   STR_REF                        varint index in the string table
+#   SHORT_REF + i                  string table index i < 240 in the tag byte itself
+#   PATH                           varint segment count + segments, joined with "/" (shares path prefixes)
+#   LIST / DICT                    values (DICT: key, value pairs) until END
+#   LINKS                          varint count + the from_node, from_socket, to_node and to_socket columns
+GCYB_MAGIC = b"GCYB"
+GCYB_VERSION = 1
+GCYB_COMPRESSION_NONE = 0
+GCYB_COMPRESSION_ZLIB = 1
+
+T_END = 0
+T_NULL = 1
+T_FALSE = 2
+T_TRUE = 3
+T_INT = 4
+T_FLOAT = 5
+T_STR_NEW = 6
+T_STR_REF = 7
+T_PATH = 8
+T_LIST = 9
+T_DICT = 10
+T_LINKS = 11
+T_SHORT_REF = 16
+
+LINK_KEYS = ("from_node", "from_socket", "to_node", "to_socket")
+
+_F64 = struct.Struct("<d")
+
+
+def _key_text(key):
+    # Same key conversion as json, e.g. mat_by_index uses int keys.
+    return key if isinstance(key, str) else json.dumps(key)
+
+
+def _write_varint(value, out):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def open_gcyc_writer(filepath, encoding="JSON"):
+    # encoding matches the 'gcyc_encoding' enum of the export operator.
+    if encoding == "BINARY":
+        return GcycBinaryWriter(filepath)
+    return GcycStreamWriter(filepath, compact=(encoding == "JSON_COMPACT"))
+
+
+class GcycWriter:
+    # Interface shared by the .gcyc writers: open, begin_section, write_entry, end_section, close.
+    # The document is written to a temporary file that only replaces the .gcyc on close, a failed export
+    # calls abort and leaves the last good .gcyc untouched.
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def temp_path(self):
+        return f"{self.filepath}.{os.getpid()}.tmp"
+
+    def _open_file(self, mode):
+        self.file = open(self.temp_path(), mode)
+
+    def _commit_file(self):
+        self.file.close()
+        self.file = None
+        os.replace(self.temp_path(), self.filepath)
+
+    def abort(self):
+        # Drops the partial document
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        try:
+            os.remove(self.temp_path())
+        except OSError:
+            pass
+
+    def write_section(self, name, entries:dict):
+        self.begin_section(name)
+        for key, value in entries.items():
+            self.write_entry(key, value)
+        self.end_section()
+
+
+class GcycStreamWriter(GcycWriter):
+    # Writes the .gcyc document section by section. Every record is encoded and written to disk as soon
+    # as it is produced, so the exporter never holds the whole scene in one dict.
+    # The indented output is the same document json.dump(data, f, indent=4) would write.
+    def __init__(self, filepath, compact=False):
+        self.filepath = filepath
+        self.compact = compact
+        self.file = None
+        self.section_count = 0
+        self.entry_count = 0
+        self.bytes_written = 0
+
+        if compact:
+            self.dump_kwargs = {"separators": (",", ":")}
+        else:
+            self.dump_kwargs = {"indent": 4}
+
+    def _newline(self, depth):
+        if self.compact:
+            return ""
+        return "\n" + " " * (4 * depth)
+
+    def _write(self, text):
+        self.file.write(text)
+        self.bytes_written += len(text)
+
+    def open(self):
+        self._open_file("w")
+        self.section_count = 0
+        self.bytes_written = 0
+        self._write("{")
+
+    def begin_section(self, name):
+        separator = ":" if self.compact else ": "
+        self._write(("," if self.section_count else "") + self._newline(1) + json.dumps(name) + separator + "{")
+        self.section_count += 1
+        self.entry_count = 0
+
+    def write_entry(self, key, value):
+        # Returns the encoded size of the record, used for the export stats.
+        separator = ":" if self.compact else ": "
+        text = json.dumps(value, **self.dump_kwargs)
+        if not self.compact:
+            text = text.replace("\n", self._newline(2))
+        text = ("," if self.entry_count else "") + self._newline(2) + json.dumps(_key_text(key)) + separator + text
+        self._write(text)
+        self.entry_count += 1
+        return len(text)
+
+    def end_section(self):
+        self._write((self._newline(1) if self.entry_count else "") + "}")
+
+    def close(self):
+        if self.file is None:
+            return
+        self._write((self._newline(0) if self.section_count else "") + "}")
+        self._commit_file()
+
+
+class GcycBinaryWriter(GcycWriter):
+    # Streams the binary encoding described at the top of this file. Strings are interned on first use,
+    # so names, socket identifiers and path segments are stored once however many times they repeat.
+    def __init__(self, filepath, compress=True):
+        self.filepath = filepath
+        self.compress = compress
+        self.file = None
+        self.compressor = None
+        self.strings = {}
+        self.bytes_written = 0
+
+    def _emit(self, data):
+        # bytes_written counts the encoded size before compression.
+        self.bytes_written += len(data)
+        if self.compressor is not None:
+            data = self.compressor.compress(bytes(data))
+        self.file.write(data)
+
+    def _string(self, value, out):
+        index = self.strings.get(value)
+        if index is None:
+            self.strings[value] = len(self.strings)
+            data = value.encode("utf-8")
+            out.append(T_STR_NEW)
+            _write_varint(len(data), out)
+            out += data
+        elif index < 256 - T_SHORT_REF:
+            out.append(T_SHORT_REF + index)
+        else:
+            out.append(T_STR_REF)
+            _write_varint(index, out)
+
+    def _text(self, value, out):
+        if "/" in value:
+            segments = value.split("/")
+            out.append(T_PATH)
+            _write_varint(len(segments), out)
+            for segment in segments:
+                self._string(segment, out)
+        else:
+            self._string(value, out)
+
+    def _value(self, value, out):
+        if value is None:
+            out.append(T_NULL)
+        elif value is True:
+            out.append(T_TRUE)
+        elif value is False:
+            out.append(T_FALSE)
+        elif isinstance(value, str):
+            self._text(value, out)
+        elif isinstance(value, int):
+            out.append(T_INT)
+            _write_varint((value << 1) if value >= 0 else ((-value) << 1) - 1, out)
+        elif isinstance(value, float):
+            out.append(T_FLOAT)
+            out += _F64.pack(value)
+        elif isinstance(value, dict):
+            out.append(T_DICT)
+            for key, item in value.items():
+                self._text(_key_text(key), out)
+                self._value(item, out)
+            out.append(T_END)
+        elif isinstance(value, (list, tuple)):
+            if value and all(type(item) is dict and tuple(item) == LINK_KEYS for item in value):
+                # links are stored column by column
+                out.append(T_LINKS)
+                _write_varint(len(value), out)
+                for key in LINK_KEYS:
+                    for item in value:
+                        self._text(item[key], out)
+            else:
+                out.append(T_LIST)
+                for item in value:
+                    self._value(item, out)
+                out.append(T_END)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} can't be written to a .gcyc")
+
+    def open(self):
+        self._open_file("wb")
+        compression = GCYB_COMPRESSION_ZLIB if self.compress else GCYB_COMPRESSION_NONE
+        self.file.write(GCYB_MAGIC + bytes([GCYB_VERSION, compression]))
+        self.compressor = zlib.compressobj(6) if self.compress else None
+        self.strings = {}
+        self.bytes_written = 0
+        self._emit(bytes([T_DICT]))
+
+    def begin_section(self, name):
+        out = bytearray()
+        self._text(name, out)
+        out.append(T_DICT)
+        self._emit(out)
+
+    def write_entry(self, key, value):
+        # Returns the encoded size of the record, used for the export stats.
+        out = bytearray()
+        self._text(_key_text(key), out)
+        self._value(value, out)
+        self._emit(out)
+        return len(out)
+
+    def end_section(self):
+        self._emit(bytes([T_END]))
+
+    def close(self):
+        if self.file is None:
+            return
+        self._emit(bytes([T_END]))
+        if self.compressor is not None:
+            self.file.write(self.compressor.flush())
+            self.compressor = None
+        self._commit_file()
+
+    def abort(self):
+        self.compressor = None
+        super().abort()
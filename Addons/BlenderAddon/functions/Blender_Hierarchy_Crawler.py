@@ -1,15 +1,41 @@
 import bpy
+import hashlib
 import json
 import os
+import time
+import numpy as np
 from mathutils import Vector
 
+from .Blender_Export_Stats import ExportStats
+
+
+# Mesh custom property holding {attribute name: fingerprint of the data it was baked from}
+BAKE_FINGERPRINT_PROP = "gcyc_bake_fingerprints"
+# Bump when the baked values change so older bakes are redone.
+BAKE_FINGERPRINT_VERSION = b"1"
+
 
 class ScheneHierarchyExporter:
-    def __init__(self, root="/root", selected_only=False, set_mat_id=True, Bake_TextureSpace=True):
+    def __init__(self, root="/root", selected_only=False, set_mat_id=True, Bake_TextureSpace=True, preserve_source_meshes=False, texspace_mode="ATTRIBUTE", visible_only=False):
         self.root = root
         self.process_selected_only = selected_only
+        self.process_visible_only = visible_only
+        # The objects that end up in the USD, set once per export and shared with the material crawler.
+        self.export_objects = None
         self.set_mat_id = set_mat_id
         self.Bake_TextureSpace = Bake_TextureSpace
+        # ATTRIBUTE: per vertex baked_texturespace attribute, TRANSFORM: only the texspace scale and offset per mesh
+        self.texspace_mode = texspace_mode
+        self.preserve_source_meshes = preserve_source_meshes
+        # source mesh.name_full -> {"source", "copy"}, the temporary copies baked instead of the source
+        self.bake_meshes = {}
+        # (object, source mesh) while the copies are swapped in for the USD export
+        self.swapped_meshes = []
+        self.stats = ExportStats()
+        # object.name_full -> usd path of the object (without the data name), reset for every export.
+        self.usd_paths = {}
+        # mesh.name_full -> bake result, shared by all the objects using the mesh (linked duplicates)
+        self.mesh_bakes = {}
 
 
     # converted from blender/intern/cycles/blender/util.h on line 548 /* Texture Space */
@@ -33,53 +59,141 @@ class ScheneHierarchyExporter:
 
         return scale, offset
 
-    def generated_to_vector_attribute(self, obj, attr_name="baked_texturespace"):
-        if obj.type != 'MESH':
+    #########################################
+    #------------BAKE FINGERPRINT-----------#
+    #########################################
+    def bake_fingerprint(self, *arrays):
+        # Hash of the buffers an attribute is baked from
+        digest = hashlib.sha1(BAKE_FINGERPRINT_VERSION)
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    def is_baked(self, mesh, attr_name, fingerprint):
+        if attr_name not in mesh.attributes:
+            return False
+        fingerprints = mesh.get(BAKE_FINGERPRINT_PROP)
+        return fingerprints is not None and fingerprints.get(attr_name) == fingerprint
+
+    def set_bake_fingerprint(self, mesh, attr_name, fingerprint):
+        if BAKE_FINGERPRINT_PROP not in mesh:
+            mesh[BAKE_FINGERPRINT_PROP] = {}
+        mesh[BAKE_FINGERPRINT_PROP][attr_name] = fingerprint
+
+    def is_mesh_editable(self, mesh):
+        # Linked meshes and system library overrides can not be renamed or get new attributes
+        if mesh.library is not None:
+            return False
+        override = mesh.override_library
+        return override is None or not override.is_system_override
+
+    def get_writable_mesh(self, mesh):
+        # The mesh the attributes are written to, a temporary copy when the source meshes are preserved
+        # or can not be edited.
+        if not self.preserve_source_meshes and self.is_mesh_editable(mesh):
+            return mesh
+        entry = self.bake_meshes.get(mesh.name_full)
+        if entry is None:
+            entry = {"source": mesh, "copy": mesh.copy()}
+            self.bake_meshes[mesh.name_full] = entry
+        return entry["copy"]
+
+    def generated_to_vector_attribute(self, mesh, attr_name="baked_texturespace"):
+        scale, offset = self.mesh_texspace_transform(mesh)
+
+        count = len(mesh.vertices)
+        co = np.empty(count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+
+        scale = np.array(scale, dtype=np.float32)
+        offset = np.array(offset, dtype=np.float32)
+        fingerprint = self.bake_fingerprint(co, scale, offset)
+        if self.is_baked(mesh, attr_name, fingerprint):
             return
+
+        target = self.get_writable_mesh(mesh)
+        if attr_name not in target.attributes:
+            target.attributes.new(name=attr_name, type='FLOAT_VECTOR', domain='POINT')
+
+        # Same math as v.co * scale - offset on every vertex. mathutils stores floats in single precision,
+        # so keeping every step in float32 gives the exact same values as the per vertex Vector math.
+        co = co.reshape(count, 3)
+        co *= scale
+        co -= offset
+        target.attributes[attr_name].data.foreach_set("vector", co.ravel())
+        if target is mesh:
+            # The copies are removed after the export, only a bake in the source mesh can be reused
+            self.set_bake_fingerprint(mesh, attr_name, fingerprint)
+
+    def get_face_mat_indices(self, obj):
+        # Returns the material index of every face and the sorted slot indices that are really used
         mesh = obj.data
-        
-        if attr_name not in mesh.attributes:
-            mesh.attributes.new(name=attr_name, type='FLOAT_VECTOR', domain='POINT')
-            
-        attr = mesh.attributes[attr_name].data
+        slot_count = len(obj.material_slots)
 
-        scale, offset = self.mesh_texspace_transform(mesh)
-        for i, v in enumerate(mesh.vertices):
-            gen = v.co * scale - offset
-            attr[i].vector = gen
+        mat_ids = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", mat_ids)
+        # Blender renders out of range indices with the last slot
+        np.clip(mat_ids, 0, slot_count - 1, out=mat_ids)
 
-    def assign_mat_id(self, obj):
+        used_indices = np.unique(mat_ids).tolist()
+        if not used_indices:
+            # no faces, keep the first slot so the object still gets a material
+            used_indices = [0]
+        return mat_ids, used_indices
+
+    def assign_mat_id(self, mesh, mat_ids):
         # assign ID attr to meshes to split in Gaffer
-        mesh = obj.data
-        hasmultiplemat:bool = False
+        fingerprint = self.bake_fingerprint(mat_ids)
+        if self.is_baked(mesh, "mat_index", fingerprint):
+            return
 
+        target = self.get_writable_mesh(mesh)
         # Create the attribute if it doesn't already exist
-        if "mat_index" not in mesh.attributes:
-            mesh.attributes.new(name="mat_index", type='INT', domain='FACE')
-
-        # Access the attribute data
-        attr = mesh.attributes["mat_index"].data
-        
-        if len(obj.material_slots)>0:
-            # Assign the material index to each face
-            for i, poly in enumerate(mesh.polygons):
-                attr[i].value = poly.material_index
-            print("attr: ", attr)
-            hasmultiplemat = len(obj.material_slots) > 1
-
-        return hasmultiplemat
-        
+        if "mat_index" not in target.attributes:
+            target.attributes.new(name="mat_index", type='INT', domain='FACE')
 
-    def build_usd_path(self, obj, include_data=True):
-        # Build parent path first (no data names in recursion)
-        if obj.parent:
-            base = self.build_usd_path(obj.parent, include_data=False)
-        else:
-            base = self.root
+        target.attributes["mat_index"].data.foreach_set("value", mat_ids)
+        if target is mesh:
+            self.set_bake_fingerprint(mesh, "mat_index", fingerprint)
 
-        # Append just this object's name
-        path = f"{base}/{obj.name}"
+    def get_mesh_bake(self, obj):
+        # Bake the texture space and read the face material indices once per mesh datablock
+        mesh = obj.data
+        bake = self.mesh_bakes.get(mesh.name_full)
+        if bake is None:
+            mat_ids, used_indices = self.get_face_mat_indices(obj)
+            bake = {
+                # only kept while a split could still need the mat_index attribute
+                "mat_ids": mat_ids if len(used_indices) > 1 else None,
+                "used_indices": used_indices,
+                "mat_index_set": False,
+                "users": []
+            }
+            if self.Bake_TextureSpace:
+                if self.texspace_mode == "TRANSFORM":
+                    # Gaffer rebuilds Generated as object position * scale - offset
+                    scale, offset = self.mesh_texspace_transform(mesh)
+                    bake["texspace"] = {"scale": list(scale), "offset": list(offset)}
+                else:
+                    self.generated_to_vector_attribute(mesh)
+            self.mesh_bakes[mesh.name_full] = bake
+        return bake
+
+    def get_object_usd_path(self, obj):
+        # Walk up to the first cached parent, then fill the cache top-down
+        chain = []
+        while obj is not None and obj.name_full not in self.usd_paths:
+            chain.append(obj)
+            obj = obj.parent
+        path = self.usd_paths[obj.name_full] if obj is not None else self.root
+
+        for item in reversed(chain):
+            path = f"{path}/{item.name}"
+            self.usd_paths[item.name_full] = path
+        return path
 
+    def build_usd_path(self, obj, include_data=True):
+        path = self.get_object_usd_path(obj)
 
         # Optionally append the mesh datablock name (only for the leaf)
         if include_data and obj.type == 'MESH' and obj.data:
@@ -91,45 +205,118 @@ class ScheneHierarchyExporter:
     def process_object(self, obj):
         # Process a single mesh object
         usd_path = self.build_usd_path(obj)
-        has_multiple_mat = False
-        if self.set_mat_id:
-            has_multiple_mat = self.assign_mat_id(obj)
-        if self.Bake_TextureSpace:
-            self.generated_to_vector_attribute(obj)
+        start = time.perf_counter()
+        shared = obj.data.name_full in self.mesh_bakes
+        bake = self.get_mesh_bake(obj)
 
-        # Build material index → name mapping
+        # Build material index → name mapping, only for the slots the faces use.
+        # Slots can be linked to the object, so this is done per object and not per mesh.
         mat_by_index = {}
-        for idx, slot in enumerate(obj.material_slots):
-            if slot.material:
-                mat_by_index[idx] = slot.material.name
+        used_materials = set()
+        for idx in bake["used_indices"]:
+            material = obj.material_slots[idx].material
+            used_materials.add(material)
+            if material:
+                mat_by_index[idx] = material.name
+
+        # Slots sharing one material do not need a split either
+        has_multiple_mat = False
+        if self.set_mat_id and len(used_materials) > 1:
+            if not bake["mat_index_set"]:
+                self.assign_mat_id(obj.data, bake["mat_ids"])
+                bake["mat_index_set"] = True
+                bake["mat_ids"] = None
+            has_multiple_mat = True
+
+        bake_time = time.perf_counter() - start
+        self.stats.add_time("attribute_bake", bake_time)
+        self.stats.record_object(obj.name, obj.data.name, bake_time, shared)
+        bake["users"].append(obj)
 
         dataobj = {
             obj.name:{
                 "path": usd_path,
+                "mesh_data": obj.data.name,
                 "mat_by_index": mat_by_index,
                 "has_multiple_mat": has_multiple_mat
             }
         }
+        if "texspace" in bake:
+            dataobj[obj.name]["texspace"] = bake["texspace"]
 
         return dataobj
 
+    def get_export_settings(self) -> dict:
+        # Tells the importer how the hierarchy was baked
+        return {
+            "texspace_mode": self.texspace_mode if self.Bake_TextureSpace else "NONE"
+        }
+
+    def get_export_objects(self):
+        # Same selection and visibility rules as the USD export, so the hierarchy and the materials
+        # only describe objects that are in the USD.
+        view_layer = bpy.context.view_layer
+        objs = list(view_layer.objects)
+        if self.process_selected_only:
+            objs = [obj for obj in objs if obj.select_get(view_layer=view_layer)]
+        if self.process_visible_only:
+            objs = [obj for obj in objs if obj.visible_get(view_layer=view_layer)]
+        return objs
+
+    def iter_serialized_hierarchy(self):
+        # Yields (object name, hierarchy entry) for all the mesh objects, one object at a time.
+        self.usd_paths = {}
+        self.mesh_bakes = {}
+        self.bake_meshes = {}
+        obj_iter_collection = self.export_objects if self.export_objects is not None else self.get_export_objects()
+
+        # Sorted by usd path: stable output order, and parents are always visited before their children
+        mesh_objs = [obj for obj in obj_iter_collection if obj.type == 'MESH' and len(obj.material_slots) > 0]
+        mesh_objs.sort(key=self.build_usd_path)
+
+        for obj in mesh_objs:
+            dataobj = self.process_object(obj)
+            yield from dataobj.items()
+
+    #########################################
+    #---------PRESERVED SOURCE MESHES-------#
+    #########################################
+    def swap_in_baked_meshes(self):
+        # Give the objects their baked copies for the USD export, the copies take the source name
+        # so the exported prim paths do not change. restore_source_meshes undoes it.
+        for name_full, entry in self.bake_meshes.items():
+            source, copy = entry["source"], entry["copy"]
+            source_name = source.name
+            if source.library is None:
+                if not self.is_mesh_editable(source):
+                    # Can't be renamed, its copy would be exported under another prim path
+                    print(f"⚠️ Mesh {name_full} is a non editable library override, exported without its baked attributes")
+                    continue
+                source.name = source_name + ".gcyc_source"
+                entry["renamed"] = True
+            # A linked mesh keeps its name, the local copy can share it
+            entry["source_name"] = source_name
+            copy.name = source_name
+            for obj in self.mesh_bakes[name_full]["users"]:
+                obj.data = copy
+                self.swapped_meshes.append((obj, source))
+
+    def restore_source_meshes(self):
+        for obj, source in self.swapped_meshes:
+            obj.data = source
+        for entry in self.bake_meshes.values():
+            source, copy = entry["source"], entry["copy"]
+            if "source_name" in entry:
+                copy.name = entry["source_name"] + ".gcyc_bake"
+            if entry.get("renamed"):
+                source.name = entry["source_name"]
+            bpy.data.meshes.remove(copy)
+        self.swapped_meshes = []
+        self.bake_meshes = {}
+
     def get_serialized_hierarchy_dict(self) -> dict:
          # Export the hierarchy of all mesh objects to JSON
-        data = {}  # reset before exporting
-        obj_iter_collection = bpy.context.scene.objects
-        if self.process_selected_only:
-            # set mat_iter_collection to an iterated list of selected objects
-            selected_objs = set()
-            for obj in bpy.context.selected_objects:
-                if obj.type == "MESH":
-                    selected_objs.add(obj)
-            obj_iter_collection = list(selected_objs)
-
-        for obj in obj_iter_collection:
-            if obj.type == 'MESH' and len(obj.material_slots) > 0:
-                dataobj = self.process_object(obj)
-                data.update(dataobj)
-        return data
+        return dict(self.iter_serialized_hierarchy())
 
     def export(self, filepath):       
         serialized_dict = self.get_serialized_hierarchy_dict()
@@ -1,40 +1,113 @@
 import bpy
 import mathutils
+import hashlib
 import json
 import os
 import re
+import time
 
 from pathlib import Path
 
+from .Blender_Export_Cache import ExportCache, EXPORT_CACHE_SUFFIX
+from .Blender_Export_Stats import ExportStats
+from .Blender_Node_Handlers import BLENDER_TO_CYCLES_SHADER_MAP, get_node_handler
+from .Blender_Gcyc_Writer import open_gcyc_writer
+from .Blender_Cycles_Schema import CYCLES_SCHEMA_PATH, CyclesPlugResolver
+from .Blender_Texture_Manifest import build_texture_manifest, write_texture_manifest
 
 
+# Node RNA properties that only matter to the Blender UI and are never consumed by Cycles.
+NODE_PROPERTY_SKIP = {
+    "name", "label", "type", "location", "location_absolute", "select", "color_tag", "color",
+    "width", "height", "dimensions", "inputs", "outputs", "internal_links",
+    "show_options", "show_preview", "show_texture", "use_custom_color",
+    "parent", "hide", "mute", "warning_propagation", "rna_type",
+    "color_mapping", "texture_mapping"
+}
+
+# Frame kinds of the MaterialExporter.walk stack.
+WALK_SOCKET = 0
+WALK_NODE = 1
+
+# bl_idname -> tuple of the serializable RNA property identifiers of that node type.
+# The set only depends on the node class so it is resolved once per Blender session.
+NODE_PROPERTY_SCHEMA = {}
+
 
 class MaterialExporter:
-    def __init__(self, selected_only=False):
+    def __init__(self, selected_only=False, use_export_cache=False, resolve_cycles_names=False):
         ######################
         #####  UI_STUFF  #####
         ######################
         self.process_selected_only = selected_only
+        self.use_export_cache = use_export_cache
         
         #####################
         #####  MAPPING  #####
         #####################
-        """Initialize with a path to the Blender→Cycles shader map JSON file."""
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        mapping_path = os.path.join(script_dir, "blender_shader_class_to_cycles_name.json")
-        with open(mapping_path, "r") as f:
-            self.BLENDER_TO_CYCLES_SHADER_MAP = json.load(f)
+        # Blender→Cycles shader map, loaded once per process by Blender_Node_Handlers.
+        self.BLENDER_TO_CYCLES_SHADER_MAP = BLENDER_TO_CYCLES_SHADER_MAP
+        # Cycles plug names resolved against the bundled schema, written as "plugs" on every node.
+        self.plug_resolver = None
+        if resolve_cycles_names:
+            self.plug_resolver = CyclesPlugResolver.load()
+            if self.plug_resolver is None:
+                print(f"⚠️ No usable Cycles schema at {CYCLES_SCHEMA_PATH}, plug names are resolved on import. "
+                      "Generate it with Cycles_Import/utils/generate_cycles_schema.py")
+
+        ########################
+        #####  GROUP TABLE #####
+        ########################
+        # Every node_tree used by a group node is traced only once and stored here,
+        # group instances inside the networks point to it by id.
+        self.group_table = {}
+
+        ########################
+        #####  IMAGE TABLE #####
+        ########################
+        # image.name_full -> path, source, alpha and colorspace, image nodes point to it by id.
+        self.image_table = {}
+
+        ##########################
+        #####  EXPORT CACHE  #####
+        ##########################
+        self.export_cache = None
+        # node_tree.name_full -> content hash, filled while hashing the materials of one export.
+        self.tree_hashes = {}
+
+        ##########################
+        #####  PATH CACHE    #####
+        ##########################
+        # object.name_full -> parent path, reset for every export.
+        self.parent_paths = {}
+
+        ##########################
+        #####  EXPORT OBJECTS  ###
+        ##########################
+        # Objects of a full export, only their materials are traced. None on material library exports.
+        self.export_objects = None
+
+        ###################
+        #####  STATS  #####
+        ###################
+        self.stats = ExportStats()
 
     #####################################
     #-------------HIERARCHY-------------#
     #####################################
 
     def get_parent_path(self, obj):
-        path = [obj.name]
-        while obj.parent:
+        # Walk up to the first cached parent, then fill the cache top-down
+        chain = []
+        while obj is not None and obj.name_full not in self.parent_paths:
+            chain.append(obj)
             obj = obj.parent
-            path.append(obj.name)
-        return "/".join(reversed(path))
+        path = self.parent_paths[obj.name_full] if obj is not None else None
+
+        for item in reversed(chain):
+            path = item.name if path is None else f"{path}/{item.name}"
+            self.parent_paths[item.name_full] = path
+        return path
 
 
     #########################################
@@ -42,28 +115,7 @@ class MaterialExporter:
     #########################################
 
     def blender_node_to_cycles(self, node):
-        cycles_name = self.BLENDER_TO_CYCLES_SHADER_MAP.get(node.bl_idname)
-        if cycles_name is None:
-            print(f"⚠️ No mapping for {node.bl_idname}")
-            return "unknown"
-        # Special Cases.
-        if node.bl_idname == 'ShaderNodeMix':
-            if node.data_type == 'FLOAT':
-                cycles_name = 'mix_float'
-            elif node.data_type == 'VECTOR':
-                if node.factor_mode == 'UNIFORM':
-                    cycles_name = 'mix_vector'
-                else:
-                    cycles_name = 'mix_vector_non_uniform'
-            elif node.data_type == 'RGBA':
-                cycles_name = 'mix_color'
-        if node.bl_idname == 'ShaderNodeMapRange':
-            if node.data_type == 'FLOAT':
-                cycles_name = 'map_range'
-            elif node.data_type == 'VECTOR':
-                cycles_name = 'vector_map_range'
-
-        return cycles_name
+        return get_node_handler(node.bl_idname).cycles_type(node)
 
     def get_image_sequence_padding(self, img: bpy.types.Image):
         """Return the padding (number of digits) of an image sequence.
@@ -121,30 +173,37 @@ class MaterialExporter:
 
         return imgpath
 
+    def get_image_id(self, img):
+        # Datablock data shared by every node using the image goes in the "images" table, once per image.
+        image_id = img.name_full
+        if image_id not in self.image_table:
+            entry = {
+                "image": self.get_image_filepath(img).replace("\\", "/"),
+                "Source": img.source,
+                "alpha_mode": img.alpha_mode,
+                "image_color_space": img.colorspace_settings.name
+            }
+            # '#' padded path, used by the image texture nodes.
+            if img.source in ['SEQUENCE', 'MOVIE']:
+                root, ext = os.path.splitext(entry["image"])
+                if ext.lower() in ['.mov', '.mp4', '.avi']:
+                    print(f"for image {img.name} where the file extension is {ext} Video files are not supported in Gaffer as a valid sequence")
+                else:
+                    entry["sequence_pattern"] = self.path_to_sequence_pattern(entry["image"])
+            self.image_table[image_id] = entry
+        return image_id
+
     def handle_image_nodes(self, node):
         uiparams = {}
         if node.image:
-            uiparams["image"] = self.get_image_filepath(node.image).replace("\\", "/")
-            uiparams["Source"] = node.image.source
+            uiparams["image_id"] = self.get_image_id(node.image)
+            # image_user settings belong to the node
             uiparams["frame_duration"] = node.image_user.frame_duration
             uiparams["frame_offset"] = node.image_user.frame_offset
             uiparams["frame_start"] = node.image_user.frame_start
             uiparams["frame_current"] = node.image_user.frame_current
             uiparams["use_auto_refresh"] = node.image_user.use_auto_refresh
             uiparams["use_cyclic"] = node.image_user.use_cyclic
-            uiparams["alpha_mode"] = node.image.alpha_mode
-            uiparams["image_color_space"] = node.image.colorspace_settings.name
-
-            # Set path as '#' padded path.
-            if node.type == "TEX_IMAGE" and node.image.source in ['SEQUENCE', 'MOVIE']:
-                root, ext = os.path.splitext(uiparams["image"])
-                if ext in ['mov', 'mp4', 'avi']:
-                    print(f"for image in {node.name} where the file extension is {ext} Video files are not supported in Gaffer as a valid sequence")
-                else:
-                    # padding = self.get_image_sequence_padding(node.image)
-                    imgpath = uiparams["image"]
-                    uiparams["image"] = self.path_to_sequence_pattern(imgpath)
-
 
         return uiparams
 
@@ -173,244 +232,138 @@ class MaterialExporter:
 
         return str(val)
 
+    def get_node_property_schema(self, node):
+        schema = NODE_PROPERTY_SCHEMA.get(node.bl_idname)
+        if schema is None:
+            # Sockets of builtin nodes are static per type, so they can be filtered here too.
+            socket_names = {s.name for s in node.inputs} | {s.name for s in node.outputs}
+            # Pointers (images, objects, texts...) and collections are handled explicitly where
+            # Cycles needs them, read only properties are Blender internal state.
+            schema = tuple(
+                prop.identifier for prop in node.bl_rna.properties
+                if not prop.identifier.startswith("bl_")
+                and prop.identifier not in NODE_PROPERTY_SKIP
+                and prop.identifier not in socket_names
+                and not prop.is_readonly
+                and prop.type not in ("POINTER", "COLLECTION")
+            )
+            NODE_PROPERTY_SCHEMA[node.bl_idname] = schema
+        return schema
+
     def extract_node_extras(self, node):
         extras = {}
-        socket_names = {s.name for s in node.inputs} | {s.name for s in node.outputs}
-        skip_exact = {
-            "bl_idname", "bl_label", "bl_description", "bl_icon", "bl_static_type",
-            "name", "label", "type", "location", "select", "color_tag", "color",
-            "width", "height", "bl_width_min", "bl_width_max", "bl_width_default",
-            "bl_height_min", "bl_height_max", "bl_height_default", "inputs", "internal_links",
-            "show_options", "show_preview", "show_texture", "use_custom_color",
-            "parent", "hide", "mute", "warning_propagation", "debug_zone_body_lazy_function_graph",
-            "debug_zone_lazy_function_graph", "dimensions", "draw_buttons", "draw_buttons_ext", 
-            "input_template", "is_registered_node_type", "location_absolute", "output_template",
-            "outputs", "poll", "poll_instance", "rna_type", "socket_value_update", "update",
-            "color_mapping", "texture_mapping"
-            
-        }
-        skip_specific ={}
-        if node.bl_idname == "ShaderNodeTexPointDensity":
-            skip_specific = {"cache_point_density", "calc_point_density", "calc_point_density_minmax", "object"}
-        if node.bl_idname in ("ShaderNodeTexImage", "ShaderNodeTexEnvironment"):
-            skip_specific = {"image", "image_user"}
-
-        for attr in dir(node):
-            if attr.startswith("_") or attr.startswith("bl_") or attr in socket_names or attr in skip_exact or attr in skip_specific:
-                continue
-            
-            val = getattr(node, attr)
-            #print(f"{attr} : {val}")
-            if hasattr(node, attr):
-                extras[attr] = self.to_serializable(val)
-                
-                
+        for attr in self.get_node_property_schema(node):
+            extras[attr] = self.to_serializable(getattr(node, attr))
         return extras
 
-    # Handles Only the extra Params and adds to the auto inputs
-    def handle_ui_params(self, node):
-        uiparams = {}
-        if node.bl_idname in ("ShaderNodeVertexColor", "ShaderNodeAttribute", "ShaderNodeUVMap", "ShaderNodeVectorTransform"):
-            attrs=["layer_name", "attribute_name", "attribute_type", "uv_map", "from_instancer"]
-            attrs.extend(["vector_type", "convert_from", "convert_to"])
-            for attr in attrs:
-                if hasattr(node, attr):
-                    uiparams[attr] = getattr(node, attr, "")
-
-        if node.bl_idname == "ShaderNodeTexPointDensity":
-            if node.object is not None:
-                uiparams["Object"] = self.get_parent_path(node.object)
-        #if node.bl_idname == "ShaderNodeTexImage":
-
-        if node.bl_idname in ("ShaderNodeTexImage", "ShaderNodeTexEnvironment"):        
-            uiparams.update(self.handle_image_nodes(node))
-
-        return uiparams
-
-
-    # Handles the whole object
-    def handle_special_cases(self, node):
-        specials = {}
-        if node.bl_idname == "ShaderNodeMix":
-            specials["data_type"] = node.data_type
-            specials["clamp_factor"] = node.clamp_factor
-            if node.data_type == 'RGBA':
-                specials["blending_mode"] = node.blend_type
-                specials["clamp_result"] = node.clamp_result
-                specials["Factor_Float"] = node.inputs[0].default_value
-                specials["A_Color"] = self.to_serializable(node.inputs[6])
-                specials["B_Color"] = self.to_serializable(node.inputs[7])
-            elif node.data_type == 'VECTOR':
-                if node.factor_mode == 'UNIFORM':
-                    specials["Factor_Float"] = node.inputs[0].default_value
-                else:
-                    specials["Factor_Vector"] = self.to_serializable(node.inputs[1])
-                specials["A_Vector"] = self.to_serializable(node.inputs[4])
-                specials["B_Vector"] = self.to_serializable(node.inputs[5])
-            elif node.data_type == 'FLOAT':
-                specials["Factor_Float"] = node.inputs[0].default_value
-                specials["A_Float"] = node.inputs[2].default_value
-                specials["B_Float"] = node.inputs[3].default_value
-        elif node.bl_idname == "ShaderNodeMapRange":
-            specials["data_type"] = node.data_type
-            specials["interpolation_type"] = node.interpolation_type
-            specials["clamp"] = node.clamp
-            if node.data_type == 'FLOAT':
-                specials["Value"] = node.inputs[0].default_value
-                specials["From Min"] = node.inputs[1].default_value
-                specials["From Max"] = node.inputs[2].default_value
-                specials["To Min"] = node.inputs[3].default_value
-                specials["To Max"] = node.inputs[4].default_value
-                specials["Steps"] = node.inputs[5].default_value
-            elif node.data_type == 'FLOAT_VECTOR':            
-                specials["Vector"] = self.to_serializable(node.inputs[6])
-                specials["Value"] = node.inputs[0].default_value
-                specials["From Min"] = self.to_serializable(node.inputs[7])
-                specials["From Max"] = self.to_serializable(node.inputs[8])
-                specials["To Min"] = self.to_serializable(node.inputs[9])
-                specials["To Max"] = self.to_serializable(node.inputs[10])
-                specials["Steps"] = self.to_serializable(node.inputs[11])
-        elif node.bl_idname == "ShaderNodeFloatCurve":
-            specials["Factor"] = node.inputs["Factor"].default_value
-            specials["Value"] = node.inputs["Value"].default_value
-            curve = node.mapping.curves[0]
-            points = [[point.location[0], point.location[1], point.handle_type] for point in curve.points]
-            specials["curve"] = points
-        elif node.bl_idname in ("ShaderNodeVectorCurve", "ShaderNodeRGBCurve"):
-            specials["Factor"] = node.inputs["Fac"].default_value
-            labels = []
-            if node.bl_idname =="ShaderNodeVectorCurve":
-                specials["Vector"] = self.to_serializable(node.inputs["Vector"])
-                labels = ['x','y','z']
-            if node.bl_idname =="ShaderNodeRGBCurve":
-                specials["Color"] = self.to_serializable(node.inputs["Color"])
-                labels = ['r','g','b','c']
-            curves = node.mapping.curves
-            index = 0
-            for curve in curves:
-                specials[labels[index]] = [[point.location[0], point.location[1], point.handle_type] for point in curve.points]
-                index += 1
-        elif node.bl_idname == "ShaderNodeValToRGB": # ColorRamp
-            specials["Factor"] = node.inputs["Fac"].default_value
-            ramp = node.color_ramp
-            specials["color_mode"] = ramp.color_mode
-            specials["interpolation"] = ramp.interpolation
-            elements = node.color_ramp.elements
-            specials["ramp_elements"] = [{"pos":element.position, "color":list(element.color)} for element in elements]
-        elif node.bl_idname in ("ShaderNodeMath", "ShaderNodeVectorMath"):
-            # Common properties
-            if hasattr(node, "operation"):
-                specials["operation"] = node.operation
-            if hasattr(node, "use_clamp"):
-                specials["use_clamp"] = node.use_clamp
-            # Capture all default values from unconnected inputs
-            for idx, input_socket in enumerate(node.inputs):
-                name = input_socket.name
-                if input_socket.name.lower() in ("value", "vector"):
-                    name = name+str(idx+1)
-                val = self.to_serializable(input_socket)
-                specials[name] = val
-        elif node.bl_idname == "ShaderNodeValue":
-            specials["Value"] = node.outputs['Value'].default_value
-        elif node.bl_idname == "ShaderNodeRGB":
-            specials["Color"] = self.to_serializable(node.outputs['Color'])
-        elif node.bl_idname == "ShaderNodeTexCoord":
-            if node.object is not None:
-                specials["Object"] = self.get_parent_path(node.object)
-            specials["from_instancer"] = node.from_instancer
-
-        return specials
-
     ############ WALK THE TREE ##############
     ### this is where the tracing happens ###
     #########################################
-    def walk(self, socket, material, visited, node_info, links):
-        # Go through all the links of the socket.
-        for link in socket.links:
-            from_node = link.from_node
-            from_socket = link.from_socket
-            to_node = link.to_socket.node
-            to_socket = link.to_socket
-            # Only process not visited nodes
-            if from_node.name not in visited:
-                visited.add(from_node.name)
-
-                ## HANDLE GROUPS
-                if from_node.type == 'GROUP':
-                    params = {
-                        inp.identifier: self.to_serializable(inp)
-                        for inp in from_node.inputs
-                        if hasattr(inp, "default_value")
-                    }
-                    group_data = self.trace_group_network(from_node)
-                    node_info[from_node.name] = {
-                        "type": from_node.bl_idname,
-                        "cycles_type": "group",
-                        "params": params,
-                        "location": self.to_serializable(from_node.location),
-                        "group": group_data   # embed the group subtree
-                    }
-                
-                # HANDLE 99.9% of the cases here.
-                else:
-                    # Remap the UI name blender is using to a more appropiate technical cycles name, and handle special cases
-                    cycles_type = self.blender_node_to_cycles(from_node)
-                    # Handle cases where shader could not be mapped
-                    if cycles_type == "unknown":
-                        print("On ",material.name, " the node ", from_node.name, " of Type: ", from_node.bl_idname, " mapped to unknown.")
-                        return None
-                    
-                    # PARAMETERS
-                    # We check for special handling and if the params dict is not set, means was not special and we proceed with regular node handling.
-                    params = self.handle_special_cases(from_node)            
-                    if len(params)==0:
-                        params = {
-                            inp.identifier: self.to_serializable(inp)
-                            for inp in from_node.inputs
-                            if hasattr(inp, "default_value")
-                        }
-                        params.update(self.extract_node_extras(from_node))
-                        params.update(self.handle_ui_params(from_node))
-
-                    # Set the dictionary to setrialize
-                    
-                    node_info[from_node.name] = {
-                        "type": from_node.bl_idname,
-                        "cycles_type": cycles_type,
-                        "params": params,
-                        "location": self.to_serializable(from_node.location)
-                    }
-
-                # We do the navigation backwards to other nodes connected to this one's inputs
-                for input_socket in from_node.inputs:
-                    if input_socket.is_linked:
-                        self.walk(socket=input_socket, material=material, visited=visited, node_info=node_info, links=links)
-
-            # Only add link if the to_node (downstream) is already in visited
-            if to_node.name in visited:
-                linkdict = {
+    def serialize_node(self, node, material, node_info):
+        ## HANDLE GROUPS
+        if node.type == 'GROUP':
+            params = {
+                inp.identifier: self.to_serializable(inp)
+                for inp in node.inputs
+                if hasattr(inp, "default_value")
+            }
+            group_id = self.get_group_id(node)
+            node_info[node.name] = {
+                "type": node.bl_idname,
+                "cycles_type": "group",
+                "params": params,
+                "location": self.to_serializable(node.location),
+                "group_id": group_id   # points to the shared "groups" table
+            }
+            return True
+
+        # HANDLE 99.9% of the cases here.
+        # Remap the UI name blender is using to a more appropiate technical cycles name, and handle special cases.
+        # One registry lookup gives the handler doing the name resolution and the parameters of this node type.
+        handler = get_node_handler(node.bl_idname)
+        cycles_type = handler.cycles_type(node)
+        # Handle cases where shader could not be mapped
+        if cycles_type == "unknown":
+            print("On ",material.name, " the node ", node.name, " of Type: ", node.bl_idname, " mapped to unknown.")
+            return False
+
+        # PARAMETERS
+        params = handler.params(self, node)
+
+        # Set the dictionary to setrialize
+        node_info[node.name] = {
+            "type": node.bl_idname,
+            "cycles_type": cycles_type,
+            "params": params,
+            "location": self.to_serializable(node.location)
+        }
+        if self.plug_resolver is not None:
+            plugs = self.plug_resolver.resolve_node(cycles_type, params, node)
+            if plugs:
+                node_info[node.name]["plugs"] = plugs
+        return True
+
+    def record_link(self, link, visited, links):
+        from_node = link.from_node
+        from_socket = link.from_socket
+        to_node = link.to_socket.node
+        to_socket = link.to_socket
+        # Only add link if the to_node (downstream) is already in visited
+        if to_node.name in visited:
+            # links is an insertion ordered dict keyed by the link ends, so duplicates are dropped in O(1)
+            linkkey = (from_node.name, from_socket.identifier, to_node.name, to_socket.identifier)
+            if linkkey not in links:
+                links[linkkey] = {
                     "from_node": from_node.name,
                     "from_socket": from_socket.identifier,
                     "to_node": to_node.name,
                     "to_socket": to_socket.identifier
                 }
-                if not linkdict in links:
-                    links.append(linkdict)
-        
-        return "SUCCESS"
 
-    def trace_group_network(self, group_node):
-        group_tree = group_node.node_tree
-        nodes = group_tree.nodes
+    def walk(self, socket, material, visited, node_info, links):
+        # Depth first walk upstream of a socket, using an explicit stack instead of recursion.
+        # WALK_SOCKET frames iterate the links of one socket, WALK_NODE frames iterate the linked inputs
+        # of a node that was just serialized and record the link that led to it once they are done,
+        # so nodes and links come out in the same order a recursive walk would produce.
+        stack = [(WALK_SOCKET, iter(socket.links), None)]
+        while stack:
+            kind, items, pending_link = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                if pending_link is not None:
+                    self.record_link(pending_link, visited, links)
+                continue
 
-        output_node = next((n for n in nodes if n.type == 'GROUP_OUTPUT' and n.is_active_output), None)
-        if output_node is None:
-            print(f"No group Output found in {group_node.name}")
-            return None
-            
+            if kind == WALK_NODE:
+                stack.append((WALK_SOCKET, iter(item.links), None))
+                continue
+
+            from_node = item.from_node
+            # Only process not visited nodes
+            if from_node.name in visited:
+                self.record_link(item, visited, links)
+                continue
+            visited.add(from_node.name)
+
+            if not self.serialize_node(from_node, material, node_info):
+                # Unmapped node, skip the rest of this socket. Only fatal for the socket the walk started on.
+                stack.pop()
+                if not stack:
+                    return None
+                continue
+
+            # We do the navigation backwards to other nodes connected to this one's inputs
+            linked_inputs = [inp for inp in from_node.inputs if inp.is_linked]
+            stack.append((WALK_NODE, iter(linked_inputs), item))
+
+        return "SUCCESS"
+
+    def trace_output_node(self, output_node, input_sockets, owner):
+        # Shared by materials and groups, walks upstream of every linked input of the output node.
         visited = set()
         node_info = {}
-        links = []    
+        links = {}
 
         # add the output node to the dictionary nodes
         visited.add(output_node.name)
@@ -420,14 +373,42 @@ class MaterialExporter:
             "params": {},
             "location": list(output_node.location)
         }
-        # Do the node net navigation, Start from Surface / Displacement / Volume.
-        for socket in output_node.inputs:
+        for socket in input_sockets:
             if socket.is_linked:
                 for link in socket.links:
-                    success = self.walk(socket=link.from_socket, material=group_node, visited=visited, node_info=node_info, links=links)
+                    success = self.walk(socket=link.from_socket, material=owner, visited=visited, node_info=node_info, links=links)
                     if not success:
-                        print(f"{group_node.name} encountered an error and the Matiral won't be processed")
+                        print(f"{owner.name} encountered an error and the Matiral won't be processed")
                         return None
+        return node_info, list(links.values())
+
+    def get_group_id(self, group_node):
+        # Trace the node_tree of a group the first time it is seen, later instances only get the id.
+        group_tree = group_node.node_tree
+        if group_tree is None:
+            print(f"{group_node.name} has no node tree assigned.")
+            return None
+        group_id = group_tree.name_full
+        if group_id not in self.group_table:
+            self.group_table[group_id] = self.trace_group_network(group_node)
+        if self.group_table[group_id] is None:
+            return None
+        return group_id
+
+    def trace_group_network(self, group_node):
+        group_tree = group_node.node_tree
+        nodes = group_tree.nodes
+
+        output_node = next((n for n in nodes if n.type == 'GROUP_OUTPUT' and n.is_active_output), None)
+        if output_node is None:
+            print(f"No group Output found in {group_node.name}")
+            return None
+
+        traced = self.trace_output_node(output_node, output_node.inputs, group_node)
+        if traced is None:
+            return None
+        node_info, links = traced
+
         # Create a map for sockets that goes from identifier to name.
         socketmap = {}
         for input in group_node.inputs:
@@ -435,11 +416,10 @@ class MaterialExporter:
         for output in group_node.outputs:
             socketmap.update({output.identifier : output.name})
         return {
-            group_node.name: {
-                "nodes": node_info,
-                "links": links,
-                "socket_map":socketmap
-            }
+            "name": group_tree.name,
+            "nodes": node_info,
+            "links": links,
+            "socket_map":socketmap
         }
 
 
@@ -457,27 +437,13 @@ class MaterialExporter:
             print(f"No Material Output found in {material.name}")
             return None
 
-        
-        visited = set()
-        node_info = {}
-        links = []    
-
-        # add the output node to the dictionary nodes
-        visited.add(output_node.name)
-        node_info[output_node.name] = {
-            "type": output_node.bl_idname,
-            "cycles_type": self.blender_node_to_cycles(output_node),
-            "params": {},
-            "location": list(output_node.location)
-        }
         # Do the node net navigation, Start from Surface / Displacement / Volume.
-        for socket_name in ("Surface", "Displacement", "Volume"):
-            if socket_name in output_node.inputs and output_node.inputs[socket_name].is_linked:
-                for link in output_node.inputs[socket_name].links:
-                    success = self.walk(socket=link.from_socket, material=material, visited=visited, node_info=node_info, links=links)
-                    if not success:
-                        print(f"{material.name} encountered an error and the Matiral won't be processed")
-                        return None
+        input_sockets = [output_node.inputs[socket_name] for socket_name in ("Surface", "Displacement", "Volume") if socket_name in output_node.inputs]
+        traced = self.trace_output_node(output_node, input_sockets, material)
+        if traced is None:
+            return None
+        node_info, links = traced
+
         return {
             material.name: {
                 "nodes": node_info,
@@ -485,37 +451,212 @@ class MaterialExporter:
             }
         }
 
+    #########################################
+    #-------------EXPORT CACHE--------------#
+    #########################################
+    def image_fingerprint(self, img):
+        fingerprint = [img.name_full, img.filepath, img.source, img.alpha_mode, img.colorspace_settings.name]
+        try:
+            stat = os.stat(bpy.path.abspath(img.filepath, library=img.library))
+            fingerprint.extend([stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            fingerprint.append(None)
+        return fingerprint
+
+    def node_fingerprint(self, node):
+        # Everything the serialized node depends on, without building the params dict.
+        fingerprint = [node.bl_idname, node.name, list(node.location)]
+        for sockets in (node.inputs, node.outputs):
+            fingerprint.append([
+                [s.identifier, s.name, self.to_serializable(s) if hasattr(s, "default_value") else None]
+                for s in sockets
+            ])
+
+        if node.type == 'GROUP':
+            fingerprint.append(self.hash_node_tree(node.node_tree) if node.node_tree else None)
+            return fingerprint
+
+        fingerprint.append([self.to_serializable(getattr(node, attr)) for attr in self.get_node_property_schema(node)])
+        if node.bl_idname in ("ShaderNodeFloatCurve", "ShaderNodeVectorCurve", "ShaderNodeRGBCurve"):
+            fingerprint.append([[[p.location[0], p.location[1], p.handle_type] for p in curve.points] for curve in node.mapping.curves])
+        if node.bl_idname == "ShaderNodeValToRGB":
+            ramp = node.color_ramp
+            fingerprint.append([ramp.color_mode, ramp.interpolation, [[e.position, list(e.color)] for e in ramp.elements]])
+        if getattr(node, "object", None) is not None:
+            fingerprint.append(self.get_parent_path(node.object))
+        if getattr(node, "image", None) is not None:
+            fingerprint.append(self.image_fingerprint(node.image))
+            image_user = node.image_user
+            fingerprint.append([image_user.frame_duration, image_user.frame_offset, image_user.frame_start,
+                                image_user.frame_current, image_user.use_auto_refresh, image_user.use_cyclic])
+        return fingerprint
+
+    def hash_node_tree(self, tree):
+        tree_hash = self.tree_hashes.get(tree.name_full)
+        if tree_hash is None:
+            content = {
+                "nodes": [self.node_fingerprint(node) for node in tree.nodes],
+                "links": [[link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier] for link in tree.links],
+                "active_output": [node.name for node in tree.nodes if getattr(node, "is_active_output", False)],
+                "plugs": self.plug_resolver.fingerprint if self.plug_resolver else None
+            }
+            tree_hash = hashlib.sha1(json.dumps(content, default=str).encode("utf-8")).hexdigest()
+            self.tree_hashes[tree.name_full] = tree_hash
+        return tree_hash
+
+    def hash_material(self, material):
+        content = [material.name, material.use_nodes]
+        if material.use_nodes and material.node_tree:
+            content.append(self.hash_node_tree(material.node_tree))
+        return hashlib.sha1(json.dumps(content).encode("utf-8")).hexdigest()
+
+    def collect_group_ids(self, network):
+        # All the groups a network needs, nested ones included.
+        group_ids = []
+        pending = [network]
+        while pending:
+            for node in pending.pop()["nodes"].values():
+                group_id = node.get("group_id")
+                if group_id is not None and group_id not in group_ids:
+                    group_ids.append(group_id)
+                    pending.append(self.group_table[group_id])
+        return group_ids
+
+    def collect_image_ids(self, network, group_ids):
+        # All the images used by a network and by the groups it needs.
+        image_ids = []
+        for net in [network] + [self.group_table[group_id] for group_id in group_ids]:
+            for node in net["nodes"].values():
+                image_id = node.get("params", {}).get("image_id")
+                if image_id is not None and image_id not in image_ids:
+                    image_ids.append(image_id)
+        return image_ids
+
+    def begin_export_cache(self, filepath):
+        self.export_cache = None
+        self.tree_hashes = {}
+        if self.use_export_cache:
+            self.export_cache = ExportCache(filepath + EXPORT_CACHE_SUFFIX)
+            self.export_cache.load()
+
+    def end_export_cache(self):
+        if self.export_cache is not None:
+            self.export_cache.save()
+            print(f"Export cache: {self.export_cache.hits} materials reused, {self.export_cache.misses} traced.")
+            self.export_cache = None
+
+    def get_material_network(self, material):
+        # Trace a material, or reuse the cached network when its content did not change since the last export.
+        if self.export_cache is None:
+            return self.trace_shader_network(material)
+
+        # Keyed on name_full like the groups and images, a linked material can share its name with a local one.
+        content_hash = self.hash_material(material)
+        cached = self.export_cache.get_material(material.name_full, content_hash, self.tree_hashes)
+        if cached is not None:
+            network, groups, images = cached
+            self.group_table.update(groups)
+            self.image_table.update(images)
+            self.export_cache.store_material(material.name_full, content_hash, network, groups, images, self.tree_hashes)
+            return {material.name: network}
+
+        data = self.trace_shader_network(material)
+        if data:
+            network = data[material.name]
+            group_ids = self.collect_group_ids(network)
+            groups = {group_id: self.group_table[group_id] for group_id in group_ids}
+            images = {image_id: self.image_table[image_id] for image_id in self.collect_image_ids(network, group_ids)}
+            self.export_cache.store_material(material.name_full, content_hash, network, groups, images, self.tree_hashes)
+        return data
+
     #########################################
     #-------------EXPORT ENTRY--------------#
     #########################################
-    def get_serialized_mat_dict(self) -> dict:
-        all_materials_data = {}
+    def get_reachable_materials(self, objects):
+        materials = {}
+        for obj in objects:
+            for slot in obj.material_slots:
+                if slot.material:
+                    materials[slot.material.name_full] = slot.material
+        # sorted so the output order does not depend on the object order
+        return [materials[name] for name in sorted(materials)]
+
+    def iter_serialized_materials(self):
+        # Yields (material name, network) one material at a time, the group table fills up on the way.
+        self.group_table = {}
+        self.image_table = {}
+        self.parent_paths = {}
         mat_iter_collection = bpy.data.materials
-        
+
+        # Only the materials used by the exported objects
+        if self.export_objects is not None:
+            mat_iter_collection = self.get_reachable_materials(self.export_objects)
         # Selection Only
-        if self.process_selected_only:
+        elif self.process_selected_only:
             selected_mats = set()
             for obj in bpy.context.selected_objects:
                 if obj.type == "MESH":
                     for slot in obj.material_slots:
                         if slot.material:
                             selected_mats.add(slot.material)
-            mat_iter_collection = list(selected_mats)
+            # sorted so the output order does not depend on set ordering
+            mat_iter_collection = sorted(selected_mats, key=lambda mat: mat.name_full)
 
         # Iterate
         for mat in mat_iter_collection:
-            data = self.trace_shader_network(mat)
+            start = time.perf_counter()
+            data = self.get_material_network(mat)
+            self.stats.record_material(mat.name, time.perf_counter() - start, data.get(mat.name) if data else None)
             if data:
-                all_materials_data.update(data)
-
-        return all_materials_data
-        
+                yield from data.items()
 
-
-    def export_materials(self, filepath):
-        serialized_dict = self.get_serialized_mat_dict()
-        with open(filepath, 'w') as f:
-            json.dump(serialized_dict, f, indent=2)
+    def get_serialized_mat_dict(self) -> dict:
+        return dict(self.iter_serialized_materials())
+
+    def get_serialized_groups_dict(self) -> dict:
+        # Only valid after get_serialized_mat_dict, drop the groups that failed to trace.
+        return {group_id: group for group_id, group in self.group_table.items() if group is not None}
+
+    def write_materials(self, writer):
+        # Stream the materials and then the groups and images they collected into a .gcyc writer.
+        with self.stats.phase("material_trace"):
+            writer.begin_section("materials")
+            for mat_name, network in self.iter_serialized_materials():
+                size = writer.write_entry(mat_name, network)
+                self.stats.record_material_size(mat_name, size)
+            writer.end_section()
+            writer.write_section("groups", self.get_serialized_groups_dict())
+            writer.write_section("images", self.image_table)
+
+    def get_texture_sources(self) -> dict:
+        # image_id -> absolute path and '#' pattern of the images in the table, for the texture manifest.
+        images = {img.name_full: img for img in bpy.data.images}
+        sources = {}
+        for image_id, entry in self.image_table.items():
+            img = images.get(image_id)
+            if img is None or img.source not in ['FILE', 'SEQUENCE', 'TILED']:
+                continue
+            path = Path(os.path.normpath(bpy.path.abspath(img.filepath, library=img.library))).as_posix()
+            pattern = None
+            if "sequence_pattern" in entry:
+                pattern = path if "#" in path else self.path_to_sequence_pattern(path)
+            sources[image_id] = {"path": path, "pattern": pattern}
+        return sources
+
+    def export_texture_manifest(self, filepath) -> dict:
+        # Resolved paths, sizes and found sequence frames of every exported image, checked by the Gaffer importer.
+        with self.stats.phase("texture_manifest"):
+            manifest = build_texture_manifest(self.get_texture_sources())
+            write_texture_manifest(filepath, manifest)
+        for image_id in manifest["missing"]:
+            print(f"⚠️ Missing texture for image {image_id}: {manifest['textures'][image_id]['path']}")
+        return manifest
+
+    def export_materials(self, filepath, encoding="JSON"):
+        self.begin_export_cache(filepath)
+        with open_gcyc_writer(filepath, encoding) as writer:
+            self.write_materials(writer)
+        self.end_export_cache()
         print(f"\n✅ Shader network exported to {filepath}")
 
 
@@ -0,0 +1,265 @@
+import json
+import os
+
+
+#########################################
+#-------------SHADER MAPPING------------#
+#########################################
+# Blender node bl_idname -> Cycles shader name, loaded once per process.
+def load_shader_map():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    mapping_path = os.path.join(script_dir, "blender_shader_class_to_cycles_name.json")
+    with open(mapping_path, "r") as f:
+        return json.load(f)
+
+BLENDER_TO_CYCLES_SHADER_MAP = load_shader_map()
+
+
+#########################################
+#---------------REGISTRY----------------#
+#########################################
+# bl_idname -> NodeHandler instance. Nodes without an entry use DEFAULT_NODE_HANDLER.
+NODE_HANDLERS = {}
+
+
+def register_node_handler(*bl_idnames):
+    # Class decorator, registers one instance of the handler for all the given node types.
+    def decorator(cls):
+        handler = cls()
+        for bl_idname in bl_idnames:
+            NODE_HANDLERS[bl_idname] = handler
+        return cls
+    return decorator
+
+
+class NodeHandler:
+    # Cycles name resolution and parameter extraction of one Blender node type.
+    # The exporter is passed in for its serialization helpers and per export caches.
+    def cycles_type(self, node):
+        cycles_name = BLENDER_TO_CYCLES_SHADER_MAP.get(node.bl_idname)
+        if cycles_name is None:
+            print(f"⚠️ No mapping for {node.bl_idname}")
+            return "unknown"
+        return cycles_name
+
+    def params(self, exporter, node):
+        # Special handlers replace the whole parameter set, the others get the socket values + extras.
+        specials = self.special_params(exporter, node)
+        if len(specials) > 0:
+            return specials
+        params = {
+            inp.identifier: exporter.to_serializable(inp)
+            for inp in node.inputs
+            if hasattr(inp, "default_value")
+        }
+        params.update(exporter.extract_node_extras(node))
+        params.update(self.ui_params(exporter, node))
+        return params
+
+    # Handles the whole object
+    def special_params(self, exporter, node):
+        return {}
+
+    # Handles Only the extra Params and adds to the auto inputs
+    def ui_params(self, exporter, node):
+        return {}
+
+
+DEFAULT_NODE_HANDLER = NodeHandler()
+
+
+def get_node_handler(bl_idname):
+    return NODE_HANDLERS.get(bl_idname, DEFAULT_NODE_HANDLER)
+
+
+#########################################
+#---------------HANDLERS----------------#
+#########################################
+@register_node_handler("ShaderNodeMix")
+class MixHandler(NodeHandler):
+    def cycles_type(self, node):
+        cycles_name = super().cycles_type(node)
+        if cycles_name == "unknown":
+            return cycles_name
+        if node.data_type == 'FLOAT':
+            cycles_name = 'mix_float'
+        elif node.data_type == 'VECTOR':
+            if node.factor_mode == 'UNIFORM':
+                cycles_name = 'mix_vector'
+            else:
+                cycles_name = 'mix_vector_non_uniform'
+        elif node.data_type == 'RGBA':
+            cycles_name = 'mix_color'
+        return cycles_name
+
+    def special_params(self, exporter, node):
+        specials = {}
+        specials["data_type"] = node.data_type
+        specials["clamp_factor"] = node.clamp_factor
+        if node.data_type == 'RGBA':
+            specials["blending_mode"] = node.blend_type
+            specials["clamp_result"] = node.clamp_result
+            specials["Factor_Float"] = node.inputs[0].default_value
+            specials["A_Color"] = exporter.to_serializable(node.inputs[6])
+            specials["B_Color"] = exporter.to_serializable(node.inputs[7])
+        elif node.data_type == 'VECTOR':
+            if node.factor_mode == 'UNIFORM':
+                specials["Factor_Float"] = node.inputs[0].default_value
+            else:
+                specials["Factor_Vector"] = exporter.to_serializable(node.inputs[1])
+            specials["A_Vector"] = exporter.to_serializable(node.inputs[4])
+            specials["B_Vector"] = exporter.to_serializable(node.inputs[5])
+        elif node.data_type == 'FLOAT':
+            specials["Factor_Float"] = node.inputs[0].default_value
+            specials["A_Float"] = node.inputs[2].default_value
+            specials["B_Float"] = node.inputs[3].default_value
+        return specials
+
+
+@register_node_handler("ShaderNodeMapRange")
+class MapRangeHandler(NodeHandler):
+    def cycles_type(self, node):
+        cycles_name = super().cycles_type(node)
+        if cycles_name == "unknown":
+            return cycles_name
+        if node.data_type == 'FLOAT':
+            cycles_name = 'map_range'
+        elif node.data_type == 'VECTOR':
+            cycles_name = 'vector_map_range'
+        return cycles_name
+
+    def special_params(self, exporter, node):
+        specials = {}
+        specials["data_type"] = node.data_type
+        specials["interpolation_type"] = node.interpolation_type
+        specials["clamp"] = node.clamp
+        if node.data_type == 'FLOAT':
+            specials["Value"] = node.inputs[0].default_value
+            specials["From Min"] = node.inputs[1].default_value
+            specials["From Max"] = node.inputs[2].default_value
+            specials["To Min"] = node.inputs[3].default_value
+            specials["To Max"] = node.inputs[4].default_value
+            specials["Steps"] = node.inputs[5].default_value
+        elif node.data_type == 'FLOAT_VECTOR':
+            specials["Vector"] = exporter.to_serializable(node.inputs[6])
+            specials["Value"] = node.inputs[0].default_value
+            specials["From Min"] = exporter.to_serializable(node.inputs[7])
+            specials["From Max"] = exporter.to_serializable(node.inputs[8])
+            specials["To Min"] = exporter.to_serializable(node.inputs[9])
+            specials["To Max"] = exporter.to_serializable(node.inputs[10])
+            specials["Steps"] = exporter.to_serializable(node.inputs[11])
+        return specials
+
+
+@register_node_handler("ShaderNodeFloatCurve")
+class FloatCurveHandler(NodeHandler):
+    def special_params(self, exporter, node):
+        specials = {}
+        specials["Factor"] = node.inputs["Factor"].default_value
+        specials["Value"] = node.inputs["Value"].default_value
+        curve = node.mapping.curves[0]
+        points = [[point.location[0], point.location[1], point.handle_type] for point in curve.points]
+        specials["curve"] = points
+        return specials
+
+
+@register_node_handler("ShaderNodeVectorCurve", "ShaderNodeRGBCurve")
+class CurvesHandler(NodeHandler):
+    def special_params(self, exporter, node):
+        specials = {}
+        specials["Factor"] = node.inputs["Fac"].default_value
+        labels = []
+        if node.bl_idname =="ShaderNodeVectorCurve":
+            specials["Vector"] = exporter.to_serializable(node.inputs["Vector"])
+            labels = ['x','y','z']
+        if node.bl_idname =="ShaderNodeRGBCurve":
+            specials["Color"] = exporter.to_serializable(node.inputs["Color"])
+            labels = ['r','g','b','c']
+        curves = node.mapping.curves
+        index = 0
+        for curve in curves:
+            specials[labels[index]] = [[point.location[0], point.location[1], point.handle_type] for point in curve.points]
+            index += 1
+        return specials
+
+
+@register_node_handler("ShaderNodeValToRGB")
+class ColorRampHandler(NodeHandler):
+    def special_params(self, exporter, node):
+        specials = {}
+        specials["Factor"] = node.inputs["Fac"].default_value
+        ramp = node.color_ramp
+        specials["color_mode"] = ramp.color_mode
+        specials["interpolation"] = ramp.interpolation
+        elements = node.color_ramp.elements
+        specials["ramp_elements"] = [{"pos":element.position, "color":list(element.color)} for element in elements]
+        return specials
+
+
+@register_node_handler("ShaderNodeMath", "ShaderNodeVectorMath")
+class MathHandler(NodeHandler):
+    def special_params(self, exporter, node):
+        specials = {}
+        # Common properties
+        if hasattr(node, "operation"):
+            specials["operation"] = node.operation
+        if hasattr(node, "use_clamp"):
+            specials["use_clamp"] = node.use_clamp
+        # Capture all default values from unconnected inputs
+        for idx, input_socket in enumerate(node.inputs):
+            name = input_socket.name
+            if input_socket.name.lower() in ("value", "vector"):
+                name = name+str(idx+1)
+            val = exporter.to_serializable(input_socket)
+            specials[name] = val
+        return specials
+
+
+@register_node_handler("ShaderNodeValue")
+class ValueHandler(NodeHandler):
+    def special_params(self, exporter, node):
+        return {"Value": node.outputs['Value'].default_value}
+
+
+@register_node_handler("ShaderNodeRGB")
+class RGBHandler(NodeHandler):
+    def special_params(self, exporter, node):
+        return {"Color": exporter.to_serializable(node.outputs['Color'])}
+
+
+@register_node_handler("ShaderNodeTexCoord")
+class TexCoordHandler(NodeHandler):
+    def special_params(self, exporter, node):
+        specials = {}
+        if node.object is not None:
+            specials["Object"] = exporter.get_parent_path(node.object)
+        specials["from_instancer"] = node.from_instancer
+        return specials
+
+
+@register_node_handler("ShaderNodeVertexColor", "ShaderNodeAttribute", "ShaderNodeUVMap", "ShaderNodeVectorTransform")
+class AttributeHandler(NodeHandler):
+    ATTRS = ["layer_name", "attribute_name", "attribute_type", "uv_map", "from_instancer",
+             "vector_type", "convert_from", "convert_to"]
+
+    def ui_params(self, exporter, node):
+        uiparams = {}
+        for attr in self.ATTRS:
+            if hasattr(node, attr):
+                uiparams[attr] = getattr(node, attr, "")
+        return uiparams
+
+
+@register_node_handler("ShaderNodeTexPointDensity")
+class PointDensityHandler(NodeHandler):
+    def ui_params(self, exporter, node):
+        uiparams = {}
+        if node.object is not None:
+            uiparams["Object"] = exporter.get_parent_path(node.object)
+        return uiparams
+
+
+@register_node_handler("ShaderNodeTexImage", "ShaderNodeTexEnvironment")
+class ImageHandler(NodeHandler):
+    def ui_params(self, exporter, node):
+        return exporter.handle_image_nodes(node)
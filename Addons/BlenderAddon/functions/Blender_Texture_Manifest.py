@@ -0,0 +1,120 @@
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Read back by MagicHammer/Cycles_Import/texture_manifest.py on the Gaffer side.
+TEXTURE_MANIFEST_VERSION = 2
+TEXTURE_MANIFEST_SUFFIX = ".textures.json"
+
+# Frame token of a sequence pattern (file.####.exr) or of UDIM tiles (file.<UDIM>.exr)
+FRAME_TOKEN = re.compile(r"#+|<UDIM>")
+
+
+class StatCache:
+    # os.stat and directory listings shared by all the textures of a scan, many textures live in the
+    # same folders and several images can point to the same file.
+    def __init__(self):
+        self.stats = {}
+        self.listings = {}
+
+    def stat(self, path):
+        if path not in self.stats:
+            try:
+                self.stats[path] = os.stat(path)
+            except OSError:
+                self.stats[path] = None
+        return self.stats[path]
+
+    def listdir(self, folder):
+        if folder not in self.listings:
+            try:
+                with os.scandir(folder) as entries:
+                    self.listings[folder] = [entry.name for entry in entries if entry.is_file()]
+            except OSError:
+                self.listings[folder] = []
+        return self.listings[folder]
+
+
+def to_ranges(frames):
+    # [1, 2, 3, 7, 8] -> [[1, 3], [7, 8]]
+    ranges = []
+    for frame in frames:
+        if ranges and frame == ranges[-1][1] + 1:
+            ranges[-1][1] = frame
+        else:
+            ranges.append([frame, frame])
+    return ranges
+
+
+def scan_file(path, stat_cache):
+    st = stat_cache.stat(path)
+    if st is None:
+        return {"path": path, "exists": False}
+    return {"path": path, "exists": True, "size": st.st_size, "mtime": st.st_mtime}
+
+
+def scan_sequence(pattern, stat_cache):
+    # Finds the frame files of a '#' padded (or UDIM) pattern on disk.
+    folder, filename = os.path.split(pattern)
+    token = FRAME_TOKEN.search(filename)
+    if token is None:
+        return scan_file(pattern, stat_cache)
+
+    digits = r"\d{4,}" if token.group(0) == "<UDIM>" else r"\d{%d,}" % len(token.group(0))
+    matcher = re.compile(re.escape(filename[:token.start()]) + f"({digits})" + re.escape(filename[token.end():]) + "$")
+
+    frames = {}
+    for name in stat_cache.listdir(folder):
+        match = matcher.match(name)
+        if match:
+            frames[int(match.group(1))] = os.path.join(folder, name)
+
+    size = 0
+    # frame -> [size, mtime], so a replaced frame or tile is caught and not only a changed count
+    files = {}
+    for frame, frame_path in sorted(frames.items()):
+        st = stat_cache.stat(frame_path)
+        if st is not None:
+            size += st.st_size
+            files[str(frame)] = [st.st_size, st.st_mtime]
+
+    return {
+        "path": pattern,
+        "exists": len(frames) > 0,
+        "size": size,
+        "sequence": {
+            "count": len(frames),
+            "frames": to_ranges(sorted(frames)),
+            "files": files
+        }
+    }
+
+
+def scan_texture(texture, stat_cache):
+    # texture: {"path": absolute path, "pattern": absolute '#' pattern or None}
+    if texture.get("pattern"):
+        return scan_sequence(texture["pattern"], stat_cache)
+    if "<UDIM>" in texture["path"]:
+        return scan_sequence(texture["path"], stat_cache)
+    return scan_file(texture["path"], stat_cache)
+
+
+def build_texture_manifest(textures:dict, jobs=None) -> dict:
+    # textures: image_id -> {"path", "pattern"}. File system calls release the GIL, so a thread pool
+    # keeps many stat calls in flight, which matters most on network storage.
+    stat_cache = StatCache()
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        scanned = dict(zip(textures.keys(), pool.map(lambda texture: scan_texture(texture, stat_cache), textures.values())))
+
+    return {
+        "version": TEXTURE_MANIFEST_VERSION,
+        "textures": scanned,
+        "missing": [image_id for image_id, entry in scanned.items() if not entry["exists"]]
+    }
+
+
+def write_texture_manifest(filepath, manifest:dict):
+    with open(filepath, "w") as f:
+        json.dump(manifest, f, indent=4)
@@ -7,34 +7,173 @@ import bpy
 
 from .Blender_Material_Crawler import MaterialExporter
 from .Blender_Hierarchy_Crawler import ScheneHierarchyExporter
+from .Blender_Gcyc_Writer import open_gcyc_writer
+from .Blender_Export_Stats import EXPORT_STATS_SUFFIX
+from .Blender_Texture_Manifest import TEXTURE_MANIFEST_SUFFIX
+
+
+# Settings of a full export, the names and defaults match the properties of the export operator.
+EXPORT_DEFAULTS = {
+    # General
+    "root_prim_path": "/root",
+    "selection_only": False,
+    "visible_only": True,
+    "export_animation": False,
+    "use_settings": "RENDER",
+    # Translation
+    "matlib_only": False,
+    "set_matindex": True,
+    "set_baked_texturespace": True,
+    "texspace_mode": "ATTRIBUTE",
+    "preserve_source_meshes": False,
+    "gcyc_encoding": "JSON",
+    # Off by default: the cache holds every network in memory until the export ends, without it the
+    # streamed export keeps a flat peak memory.
+    "use_export_cache": False,
+    "write_texture_manifest": True,
+    "resolve_cycles_names": False,
+    # Object Types
+    "export_meshes": True,
+    "export_lights": True,
+    "export_world": True,
+    "export_cameras": True,
+    "export_curves": True,
+    "export_pointclouds": True,
+    "export_volumes": True,
+    "export_hair": True,
+    # Geometry
+    "export_uvmaps": True,
+    "rename_uvmaps": True,
+    "export_normals": True,
+    "use_instancing": True,
+    # Rigging
+    "export_blendshapes": True,
+    "export_skins": True,
+    "export_bones": False,
+}
 
 
 class BlenderExporter(ScheneHierarchyExporter, MaterialExporter):
-    def __init__(self, root="/root", selected_only=False, set_mat_id=True, bake_TextureSpace=True):
-        ScheneHierarchyExporter.__init__(self, root, selected_only, set_mat_id, bake_TextureSpace)
-        MaterialExporter.__init__(self, selected_only)
-        self.data = {}
+    def __init__(self, root="/root", selected_only=False, set_mat_id=True, bake_TextureSpace=True, use_export_cache=False, preserve_source_meshes=False, texspace_mode="ATTRIBUTE", resolve_cycles_names=False, visible_only=False):
+        ScheneHierarchyExporter.__init__(self, root, selected_only, set_mat_id, bake_TextureSpace, preserve_source_meshes, texspace_mode, visible_only)
+        MaterialExporter.__init__(self, selected_only, use_export_cache, resolve_cycles_names)
         self.cycles_version = 4.4
 
-    def export_mat_only(self, filepath):
-        self.export_materials(filepath)
+    def export_mat_only(self, filepath, encoding="JSON"):
+        self.export_materials(filepath, encoding)
         
-    def export(self, filepath):
-        self.data = {
-            "materials":{},
-            "hierarchy":{}
-        }
-        material_dict:dict = self.get_serialized_mat_dict()
-        hierarchy_dict:dict = self.get_serialized_hierarchy_dict()
-        self.data["materials"].update(material_dict)
-        self.data["hierarchy"].update(hierarchy_dict)
-        
-        with open(filepath, "w") as f:
-            json.dump(self.data, f, indent=4)
+    def export(self, filepath, encoding="JSON"):
+        # Materials, groups and hierarchy records are written as they are produced.
+        self.begin_export_cache(filepath)
+        # The objects of the USD decide which materials are traced
+        self.export_objects = self.get_export_objects()
+        with open_gcyc_writer(filepath, encoding) as writer:
+            writer.write_section("settings", self.get_export_settings())
+            self.write_materials(writer)
+            with self.stats.phase("hierarchy"):
+                writer.begin_section("hierarchy")
+                for obj_name, entry in self.iter_serialized_hierarchy():
+                    writer.write_entry(obj_name, entry)
+                writer.end_section()
+        self.export_objects = None
+        self.end_export_cache()
 
         print(f"Exported scene + material data to {filepath}")
 
 
+def export_usd(usd_path, settings:dict):
+    bpy.ops.wm.usd_export(
+        filepath=usd_path,
+        root_prim_path=settings["root_prim_path"],
+        selected_objects_only=settings["selection_only"],
+        visible_objects_only=settings["visible_only"],
+        export_animation=settings["export_animation"],
+        evaluation_mode=settings["use_settings"],
+
+        export_meshes = settings["export_meshes"],
+        export_lights = settings["export_lights"],
+        export_cameras = settings["export_cameras"],
+        export_curves = settings["export_curves"],
+        export_points = settings["export_pointclouds"],
+        export_volumes = settings["export_volumes"],
+        export_hair = settings["export_hair"],
+        convert_world_material = settings["export_world"],
+
+        export_uvmaps=settings["export_uvmaps"],
+        rename_uvmaps =settings["rename_uvmaps"],
+        export_normals=settings["export_normals"],
+        export_materials=False,
+        use_instancing=settings["use_instancing"],
+        export_shapekeys =settings["export_blendshapes"],
+        export_armatures =settings["export_skins"],
+        only_deform_bones =settings["export_bones"],
+    )
+
+
+def run_export(filepath, settings:dict=None) -> dict:
+    # Full Blender to Gaffer export of the open .blend, used by the export operator and the batch export.
+    # Raises on failure, returns the written paths and the ExportStats.
+    settings = dict(EXPORT_DEFAULTS, **(settings or {}))
+    usd_path = filepath
+    json_path = os.path.splitext(usd_path)[0] + ".gcyc"
+
+    exporter = BlenderExporter(
+        root=settings["root_prim_path"],
+        selected_only=settings["selection_only"],
+        visible_only=settings["visible_only"],
+        set_mat_id=settings["set_matindex"],
+        bake_TextureSpace=settings["set_baked_texturespace"],
+        use_export_cache=settings["use_export_cache"],
+        preserve_source_meshes=settings["preserve_source_meshes"],
+        texspace_mode=settings["texspace_mode"],
+        resolve_cycles_names=settings["resolve_cycles_names"]
+    )
+
+    if settings["matlib_only"]:
+        # Export materials only
+        exporter.export_materials(json_path, settings["gcyc_encoding"])
+        usd_path = None
+    else:
+        # Export USD
+        if not os.path.splitext(usd_path)[1].lower() in (".usd", ".usdc", ".usda"):
+            usd_path = os.path.splitext(usd_path)[0] + ".usd"
+        try:
+            # Export Materials and Hierarchy and set mat_index property
+            exporter.export(json_path, settings["gcyc_encoding"])
+            # The baked copies of the preserved meshes are only swapped in while the USD is written
+            exporter.swap_in_baked_meshes()
+            with exporter.stats.phase("usd_export"):
+                export_usd(usd_path, settings)
+        finally:
+            exporter.restore_source_meshes()
+
+    manifest_path = None
+    if settings["write_texture_manifest"]:
+        manifest_path = json_path + TEXTURE_MANIFEST_SUFFIX
+        try:
+            exporter.export_texture_manifest(manifest_path)
+        except OSError as e:
+            print(f"Could not write the texture manifest {manifest_path}: {e}")
+            manifest_path = None
+
+    stats_path = json_path + EXPORT_STATS_SUFFIX
+    try:
+        exporter.stats.save(stats_path)
+    except OSError as e:
+        print(f"Could not write the export stats {stats_path}: {e}")
+        stats_path = None
+
+    return {
+        "usd_path": usd_path,
+        "json_path": json_path,
+        "manifest_path": manifest_path,
+        "stats_path": stats_path,
+        "stats": exporter.stats,
+        # "Resolve Cycles Names" was asked for but there is no usable schema
+        "cycles_schema_missing": settings["resolve_cycles_names"] and exporter.plug_resolver is None
+    }
+
+
 # Example usage
 if __name__ == "__main__":
     folder = "C:\\GitHub\\GafferShaderNetFromBlender\\InProgressScripts\\testFiles\\"
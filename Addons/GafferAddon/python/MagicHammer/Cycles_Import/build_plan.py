@@ -0,0 +1,723 @@
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from MagicHammer.Cycles_Import.cycles_names import (
+    PLUG_TYPE_MAP, LABEL_MAP,
+    safe_plug_name, normalize_name, sanitize_name, shader_safe_type, to_gaffer_path
+)
+
+
+#########################################
+#--------------BUILD PLAN---------------#
+#########################################
+# Turns a .gcyc into the list of Gaffer nodes, values, connections and assignments to build, without
+# touching Gaffer. import_Cycles_materials_to_Gaffer.py executes the plan. Plain python, so the plan
+# can be built, inspected and timed outside of a Gaffer session against a stand-in schema:
+#
+#     PYTHONPATH=GafferAddon/python python -m MagicHammer.Cycles_Import.build_plan scene.gcyc --schema cycles_schema.json
+#
+# Nodes of a plan:
+#   {"kind": "shader"|"curves_box"|"group", "name", "shader": cycles shader type, "box": bool, "values": [[plug, value]], ...}
+# Plug ends of the connections:
+#   {"node": node name, "io": "out"|"parameters"|None (plug directly on a Box), "plug": plug name}
+
+# Plugs of the Boxes built in place of a single shader, see build_curves_box.
+BOX_PLUGS = {
+    "rgb_curves": {
+        "parameters": {"color": "Gaffer::Color3fPlug", "fac": "Gaffer::FloatPlug"},
+        "out": {"value": "Gaffer::Color3fPlug"}
+    },
+    "vector_curves": {
+        "parameters": {"vector": "Gaffer::V3fPlug", "fac": "Gaffer::FloatPlug"},
+        "out": {"value": "Gaffer::V3fPlug"}
+    }
+}
+
+COLOR_SPACE_REMAP = {
+    'Non-Color'     :'data',
+    'Linear Rec.709':'Linear Rec.709 (sRGB)'
+}
+ALPHA_REMAP = {
+    'STRAIGHT'      : 'unassociated',
+    'PREMUL'        : 'associated',
+    'CHANNEL_PACKED': 'channel_packed',
+    'NONE'          : 'ignore'
+}
+EXTENSION_REMAP = {
+    'REPEAT'    : 'periodic',
+    'EXTEND'    : 'black',
+    'CLIP'      : 'clamp',
+    'MIRROR'    : 'mirror'
+}
+PROJECTION_REMAP = {
+    'FLAT'    : 'flat',
+    'BOX'     : 'box',
+    'SPHERE'  : 'sphere',
+    'TUBE'    : 'tube'
+}
+
+CONVERTER_COLOR = [0.234999999, 0.234999999, 0.314999998]
+
+# Blender order of the shader assignments of a material
+ASSIGNMENT_ORDER = ['ShaderAssign_Surface', 'ShaderAssign_Volume', 'ShaderAssign_Displacement']
+
+
+#########################################
+#----------------SCHEMA-----------------#
+#########################################
+class CyclesSchema:
+    # Plug names and types of the Cycles shaders, the only Gaffer knowledge the planner needs.
+    # Loaded from the file written by utils/generate_cycles_schema.py or built from a stand-in dict,
+    # inside Gaffer GafferCyclesSchema reads the shaders from GafferCycles instead.
+    def __init__(self, shaders=None, presets=None):
+        # shader type -> {"parameters": {plug: type name}, "out": {plug: type name}}, None for unknown shaders
+        self.shaders = shaders or {}
+        # shader type -> {plug: presetValues}
+        self.preset_values = presets or {}
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+        return cls(schema.get("shaders", {}), schema.get("presets", {}))
+
+    def shader(self, shader_type):
+        return self.shaders.get(shader_type)
+
+    def plugs(self, shader_type, io):
+        shader = self.shader(shader_type)
+        return shader.get(io, {}) if shader else {}
+
+    def presets(self, shader_type, plug):
+        # None when the presets of the plug are not known
+        return self.preset_values.get(shader_type, {}).get(plug)
+
+
+#########################################
+#---------------HELPERS-----------------#
+#########################################
+def shader_node(name, shader_type, values=None):
+    return {"kind": "shader", "name": name, "shader": shader_type, "box": False, "values": values or []}
+
+def plug_end(node, io, plug):
+    # Plugs of Boxes are direct children of the Box
+    return {"node": node["name"], "io": None if node["box"] else io, "plug": plug}
+
+def node_plugs(nodes, node_name, io):
+    # Plug names resolved by the exporter for one node, None for older .gcyc files and nodes built on import.
+    return nodes.get(node_name, {}).get("plugs", {}).get(io)
+
+def convert_ramp_interpolation(interpolation:str):
+    translatdict:dict = {
+        "ease":3,
+        "cardinal":1,
+        "linear":0,
+        "b_spline":2,
+        "constant":4
+    }
+    return translatdict[interpolation.lower()]
+
+def convert_curve_interpolation(curvelist:list):
+    interpolation = 1 # AUTO is translated to CatmullRom
+    if curvelist[0][2] == "VECTOR":
+        interpolation = 0
+    return interpolation
+
+def assignment_order(assignment):
+    for i, role in enumerate(ASSIGNMENT_ORDER):
+        if role in assignment["name"]:
+            return i
+    return len(ASSIGNMENT_ORDER)
+
+
+#########################################
+#---------------PLANNER-----------------#
+#########################################
+class BuildPlanner:
+    def __init__(self, data:dict, schema:CyclesSchema, process_image_seq=True):
+        self.schema = schema
+        self.process_image_seq = process_image_seq
+        # How the Blender "Generated" coordinates were exported, see plan_generated_coordinates.
+        self.texspace_mode = data.get("settings", {}).get("texspace_mode", "ATTRIBUTE")
+        # Shared node groups and image datablocks of the .gcyc
+        self.group_table = data.get("groups", {})
+        self.image_table = data.get("images", {})
+        # group_id -> network plan, shared by all the instances of the group
+        self.group_plans = {}
+        # image_id -> the image settings resolved for the image_texture plugs
+        self.resolved_images = {}
+        # (shader_type, io) -> name index of the plugs, see plug_index
+        self.plug_indices = {}
+        self.warnings = []
+
+    def warn(self, message):
+        self.warnings.append(message)
+
+    ############# NAMES & TYPES #############
+    def resolve_plug_name(self, socket_label, shader_type, io="parameters", is_box=False, resolved=None):
+        candidate = safe_plug_name(socket_label)
+        #BoxNodes
+        if is_box:
+            if shader_type in BOX_PLUGS:
+                if io == "out":
+                    return "value"
+                else:
+                    return candidate
+            elif shader_type == "group":
+                return candidate
+
+        # 0. Names resolved by the exporter ("plugs" of the node)
+        if resolved and socket_label in resolved:
+            return resolved[socket_label]
+
+        # Every label is only resolved once per shader type
+        index = self.plug_index(shader_type, io)
+        if socket_label not in index["resolved"]:
+            index["resolved"][socket_label] = self.resolve_indexed(index, candidate, socket_label, shader_type, io)
+        return index["resolved"][socket_label]
+
+    def plug_index(self, shader_type, io):
+        # Built the first time a shader type is seen: its plugs, the LABEL_MAP remaps that exist on it
+        # and the normalized plug names for the fuzzy match.
+        key = (shader_type, io)
+        if key not in self.plug_indices:
+            plugs = self.schema.plugs(shader_type, io)
+            normalized = {}
+            for name in plugs:
+                # first plug wins, like the linear scan it replaces
+                normalized.setdefault(normalize_name(name), name)
+            self.plug_indices[key] = {
+                "plugs": plugs,
+                "remap": {
+                    label: remap for label, remap in LABEL_MAP.get(shader_type, {}).items()
+                    if remap in plugs or remap == 'UNSUPPORTED'
+                },
+                "normalized": normalized,
+                # socket label -> plug name or None
+                "resolved": {}
+            }
+        return self.plug_indices[key]
+
+    def resolve_indexed(self, index, candidate, socket_label, shader_type, io):
+        # 1. Try safe plug name directly
+        if candidate in index["plugs"]:
+            return candidate
+
+        # 2. Try label map fallback
+        # special cases
+        if shader_type in ["mix_closure", "add_closure"] and io == "out":
+            return "closure"
+        # remapped or unsupported plugs
+        remap = index["remap"].get(socket_label.lower())
+        if remap:
+            return remap
+
+        # 3. Try fuzzy match
+        return index["normalized"].get(normalize_name(socket_label))
+
+    def plug_type(self, node, io, plug):
+        if node["kind"] == "group":
+            return node["network"]["inputs" if io == "parameters" else "outputs"].get(plug)
+        if node["kind"] == "curves_box":
+            return BOX_PLUGS[node["shader"]][io].get(plug)
+        return self.schema.plugs(node["shader"], io).get(plug)
+
+    ################ IMAGES #################
+    def get_image_params(self, params_dict):
+        # Image nodes reference the shared "images" table by id, older .gcyc files have the image data inline.
+        image_id = params_dict.get("image_id")
+        if image_id is None:
+            return params_dict
+        params = dict(self.image_table.get(image_id, {}))
+        params.update(params_dict)
+        return params
+
+    def resolve_image(self, params_dict):
+        # filename, colorspace, alpha_type and sequence handling only depend on the image datablock,
+        # so they are worked out once per image and reused by every node using it.
+        image_id = params_dict.get("image_id")
+        if image_id is not None and image_id in self.resolved_images:
+            return self.resolved_images[image_id]
+        image = self.get_image_params(params_dict)
+
+        is_sequence = image["Source"] in ["SEQUENCE", "MOVIE"]
+        # New .gcyc files keep the plain path and the '#' padded sequence path apart.
+        raw_path = image.get("sequence_pattern", image["image"]) if is_sequence else image["image"]
+
+        color_space = COLOR_SPACE_REMAP.get(image["image_color_space"])
+        presets = self.schema.presets("image_texture", "colorspace")
+        if color_space is None or (presets is not None and color_space not in presets):
+            # set to Auto
+            color_space = ''
+
+        resolved = {
+            "filename": Path(raw_path).as_posix(),
+            "is_sequence": is_sequence,
+            "colorspace": color_space,
+            "alpha_type": ALPHA_REMAP[image["alpha_mode"]]
+        }
+        if image_id is not None:
+            self.resolved_images[image_id] = resolved
+        return resolved
+
+    def plan_image_sequence(self, filename, params_dict):
+        # Values of the expression picking the frame file, see load_image_sequence.
+        m = re.search(r"(#+)", filename)
+        padding = len(m.group(1)) if m else 4
+        # Split extension first
+        prefix, ext = os.path.splitext(filename)
+        # Remove the frame token from prefix
+        if m:
+            prefix = prefix.replace(m.group(1), "")
+        return {
+            "prefix": prefix,
+            "ext": ext,
+            "padding": padding,
+            "frame_start": params_dict["frame_start"],
+            "frame_duration": params_dict["frame_duration"],
+            "frame_offset": params_dict["frame_offset"],
+            "use_cyclic": params_dict["use_cyclic"]
+        }
+
+    ################ NODES ##################
+    def plan_parameters(self, params_dict, shader_type, plugs=None):
+        values = []
+        for param_label, value in params_dict.items():
+            plug_name = self.resolve_plug_name(param_label, shader_type, io="parameters", resolved=plugs)
+            if plug_name == "UNSUPPORTED":
+                self.warn(f"😞 the parameter: '{param_label}' on shader: '{shader_type}', is unsupported by CyclesGaffer.")
+                continue
+            if not plug_name:
+                if param_label.lower() == 'weight':
+                    # ignore the weight parameter that comes in every node and is irrelevant for translation.
+                    continue
+                # Special Cases
+                specialcases = [
+                    'mix' in shader_type or "map_range" in shader_type and param_label.lower() in ['data_type'],
+                    shader_type in ["texture_coordinate", "uvmap"] and param_label.lower() in ['from_instancer'],
+                    shader_type == "attribute" and param_label.lower() == "attribute_type",
+                    shader_type == "ies_texture" and param_label.lower() == "mode"
+                ]
+                if True in specialcases:
+                    continue
+
+                self.warn(f"⚠️ Could not resolve param '{param_label}' for shader type '{shader_type}'")
+                continue
+
+            if shader_type == "vector_rotate" and value == "AXIS_ANGLE":
+                value = "axis"
+            elif value == "FBM":
+                value = "fBM"
+            elif isinstance(value, str) and not value in ["1D","2D","3D","4D"]:
+                # Upercase labels and strings produce invalid results.
+                value = value.lower()
+            values.append([plug_name, value])
+        return values
+
+    def plan_shader_node(self, name, shader_type, params_dict, plugs=None):
+        if shader_type in BOX_PLUGS:
+            return {"kind": "curves_box", "name": name, "shader": shader_type, "box": True, "values": [], "params": params_dict}
+
+        node = shader_node(name, shader_type)
+        if shader_type == "image_texture":
+            image = self.resolve_image(params_dict)
+            node["values"] = [
+                ["filename", image["filename"]],
+                ["colorspace", image["colorspace"]],
+                ["alpha_type", image["alpha_type"]],
+                ["extension", EXTENSION_REMAP[params_dict["extension"]]],
+                ["projection", PROJECTION_REMAP[params_dict["projection"]]],
+                ["interpolation", params_dict["interpolation"].lower()],
+                ["projection_blend", params_dict["projection_blend"]]
+            ]
+            if image["is_sequence"] and self.process_image_seq:
+                node["sequence"] = self.plan_image_sequence(image["filename"], params_dict)
+        # On Curves, interpolation is not 1:1 and takes the value of the first point on Blender.
+        elif shader_type == "float_curve":
+            node["values"] = [["fac", params_dict["Factor"]], ["value", params_dict["Value"]]]
+            node["curve"] = {
+                "plug": "curve",
+                "interpolation": convert_curve_interpolation(params_dict["curve"]),
+                "points": params_dict["curve"]
+            }
+        elif shader_type == "rgb_ramp":
+            node["values"] = [["fac", params_dict["Factor"]]]
+            node["ramp"] = {
+                "plug": "ramp",
+                "interpolation": convert_ramp_interpolation(params_dict["interpolation"]),
+                "elements": params_dict["ramp_elements"]
+            }
+        else:
+            if "image_id" in params_dict:
+                # nodes without special handling read the image data as regular parameters
+                params_dict = self.get_image_params(params_dict)
+                params_dict.pop("image_id")
+                params_dict.pop("sequence_pattern", None)
+            node["values"] = self.plan_parameters(params_dict, shader_type, plugs)
+        return node
+
+    # Groups are stored once in the "groups" table of the .gcyc, the network of a group is planned once
+    # and shared by all of its instances.
+    def plan_group_node(self, box_name, node_info):
+        group_id = node_info.get("group_id")
+        if group_id is None:
+            # Older .gcyc files embed the group network in the node itself.
+            group = next(iter((node_info.get("group") or {}).values()), None)
+            if group is None:
+                return None
+            network = self.plan_network(group, is_group=True)
+        else:
+            group = self.group_table.get(group_id)
+            if group is None:
+                self.warn(f"⚠️ Group '{group_id}' is missing from the groups table.")
+                return None
+            if group_id not in self.group_plans:
+                self.group_plans[group_id] = self.plan_network(group, is_group=True)
+            network = self.group_plans[group_id]
+
+        node = {
+            "kind": "group",
+            "name": box_name,
+            "shader": "group",
+            "box": True,
+            "group_id": group_id,
+            "network": network,
+            "socket_map": group.get("socket_map", {}),
+            "values": []
+        }
+        for param_label, value in node_info.get("params", {}).items():
+            grp_plug_name = safe_plug_name(param_label)
+            if grp_plug_name in network["inputs"]:
+                node["values"].append([grp_plug_name, value])
+            else:
+                self.warn(f"⚠️ Could not resolve param '{param_label}' for group type '{group.get('name', box_name)}'")
+        return node
+
+    # Blender's "Generated" coordinates are not in the USD, they are replaced by nodes reading the exported
+    # texture space. Planned once per texture_coordinate node, returns the node with the 'vector' output.
+    def plan_generated_coordinates(self, plan, texcoord, generated):
+        nm = texcoord["name"] + '_Generated'
+        if nm in generated:
+            return generated[nm]
+
+        if self.texspace_mode == "TRANSFORM":
+            # generated = object position * texspace_scale - texspace_offset
+            scale = shader_node(nm + '_Scale', 'attribute', [['attribute', 'texspace_scale']])
+            offset = shader_node(nm + '_Offset', 'attribute', [['attribute', 'texspace_offset']])
+            multiply = shader_node(nm + '_Multiply', 'vector_math', [['math_type', 'multiply']])
+            node = shader_node(nm, 'vector_math', [['math_type', 'subtract']])
+            plan["nodes"].extend([scale, offset, multiply, node])
+            self.connect(plan, texcoord, 'object', multiply, 'vector1')
+            self.connect(plan, scale, 'vector', multiply, 'vector2')
+            self.connect(plan, multiply, 'vector', node, 'vector1')
+            self.connect(plan, offset, 'vector', node, 'vector2')
+        else:
+            node = shader_node(nm, 'attribute', [['attribute', 'baked_texturespace']])
+            plan["nodes"].append(node)
+
+        generated[nm] = node
+        return node
+
+    ############## CONNECTIONS ##############
+    def connect(self, plan, src, src_plug, dst, dst_plug):
+        plan["connections"].append({"src": plug_end(src, "out", src_plug), "dst": plug_end(dst, "parameters", dst_plug)})
+
+    # --- plug connection with auto converter shader insertion ---
+    def plan_connection(self, plan, src, src_socket_label, dst, dst_socket_label, src_plugs=None, dst_plugs=None):
+        src_plug_name = self.resolve_plug_name(src_socket_label, src["shader"], io="out", is_box=src["box"], resolved=src_plugs)
+        dst_plug_name = self.resolve_plug_name(dst_socket_label, dst["shader"], io="parameters", is_box=dst["box"], resolved=dst_plugs)
+        if not src_plug_name or not dst_plug_name or 'UNSUPPORTED' in (src_plug_name, dst_plug_name):
+            self.warn(f"❌ Could not resolve {src['name']}.{src_socket_label} → {dst['name']}.{dst_socket_label}")
+            return
+
+        src_type = self.plug_type(src, "out", src_plug_name)
+        dst_type = self.plug_type(dst, "parameters", dst_plug_name)
+        if src_type == dst_type:
+            self.connect(plan, src, src_plug_name, dst, dst_plug_name)
+            return
+
+        from_type = PLUG_TYPE_MAP.get(src_type)
+        to_type = PLUG_TYPE_MAP.get(dst_type)
+        if not from_type or not to_type:
+            self.warn(f"❌ Unknown plug types: {src_type} → {dst_type}")
+            return
+
+        converter = shader_node(f"{src['name']}_to_{dst['name']}_converter", f"convert_{from_type}_to_{to_type}")
+        converter["converter"] = True
+        converter["color"] = CONVERTER_COLOR
+        plan["nodes"].append(converter)
+        self.connect(plan, src, src_plug_name, converter, f"value_{from_type}")
+        self.connect(plan, converter, f"value_{to_type}", dst, dst_plug_name)
+
+    def plan_assignment(self, plan, src, from_socket, to_socket, src_plugs=None):
+        # Gaffer has no output node, the material output becomes a ShaderAssignment
+        assignment = {"name": f"ShaderAssign_{to_socket}", "shader": src["name"]}
+        # check if displacement has a Displacement node before, if not set it to it
+        if to_socket.lower() == "displacement" and src["shader"] != "displacement":
+            displace_shader = shader_node("output_surface_displacement", "displacement")
+            plan["nodes"].append(displace_shader)
+            self.plan_connection(plan, src, from_socket, displace_shader, "height", src_plugs)
+            assignment["shader"] = displace_shader["name"]
+            assignment["plug"] = "displacement"
+        plan["assignments"].append(assignment)
+
+    ############### NETWORKS ################
+    # Plans a material or the shaders inside a group, groups are planned recursively.
+    def plan_network(self, material, is_group=False):
+        nodes = material["nodes"]
+        links = material.get("links", [])
+        plan = {
+            "empty": False,
+            "nodes": [],
+            "connections": [],
+            # promoted plugs of a group Box and their types
+            "group_inputs": [],
+            "group_outputs": [],
+            "inputs": {},
+            "outputs": {},
+            "assignments": [],
+            "socket_renames": []
+        }
+        if len(links) == 0:
+            plan["empty"] = True
+            return plan
+
+        created = {}
+        groups = []
+        output_node_name =          ""
+        group_output_node_name =    ""
+        group_input_node_name =     ""
+
+        ### NODE CREATION HANDLING ###
+        for node_name, node_info in nodes.items():
+            node_type = node_info.get("type", "")
+            if node_type == "ShaderNodeOutputMaterial":
+                output_node_name = node_name
+                continue
+            if node_type == "NodeGroupOutput":
+                group_output_node_name = node_name
+                continue
+            if node_type == "NodeGroupInput":
+                group_input_node_name = node_name
+                continue
+
+            if node_type == "ShaderNodeGroup":
+                node = self.plan_group_node(sanitize_name(node_name), node_info)
+                if node is None:
+                    continue
+                groups.append(node)
+            else:
+                shader_type = shader_safe_type(node_info.get("cycles_type", ""))
+                safe_name = re.sub(r'\W|^(?=\d)', '_', node_name)
+                node = self.plan_shader_node(safe_name, shader_type, node_info.get("params", {}), node_plugs(nodes, node_name, "parameters"))
+            created[node_name] = node
+            plan["nodes"].append(node)
+
+        ### LINKS HANDLING ###
+        generated = {}
+        for link in links:
+            if not isinstance(link, dict):
+                continue
+            from_node = link["from_node"]
+            to_node = link["to_node"]
+            from_socket = link["from_socket"]
+            to_socket = link["to_socket"]
+
+            # Safety
+            if from_node == output_node_name or from_node == group_output_node_name: # Gaffer has no Output Node.
+                continue
+
+            src = created.get(from_node)
+            src_plugs = node_plugs(nodes, from_node, "out")
+            # If From node is Texture Coordinates using the "Generated" Output rebuild it from the exported texture space.
+            if from_socket == "Generated" and src is not None and src["shader"] == 'texture_coordinate':
+                src = self.plan_generated_coordinates(plan, src, generated)
+                from_socket = 'vector'
+                src_plugs = None
+
+            # Group I/O
+            if from_node == group_input_node_name:
+                dst = created.get(to_node)
+                if dst is None:
+                    self.warn(f"❌ Could not promote group input {from_socket} → {to_node}.{to_socket}")
+                    continue
+                dst_plug_name = self.resolve_plug_name(to_socket, dst["shader"], io="parameters", is_box=dst["box"], resolved=node_plugs(nodes, to_node, "parameters"))
+                if not dst_plug_name or dst_plug_name == 'UNSUPPORTED':
+                    self.warn(f"❌ Could not resolve group input {from_socket} → {dst['name']}.{to_socket}")
+                    continue
+                name = safe_plug_name(from_socket)
+                plan["group_inputs"].append({"plug": plug_end(dst, "parameters", dst_plug_name), "name": name})
+                plan["inputs"].setdefault(name, self.plug_type(dst, "parameters", dst_plug_name))
+                continue
+            if src is None:
+                continue
+            if to_node == group_output_node_name:
+                src_plug_name = self.resolve_plug_name(from_socket, src["shader"], io="out", is_box=src["box"], resolved=src_plugs)
+                if not src_plug_name or src_plug_name == 'UNSUPPORTED':
+                    self.warn(f"❌ Could not resolve group output {src['name']}.{from_socket} → {to_socket}")
+                    continue
+                name = safe_plug_name(to_socket)
+                plan["group_outputs"].append({"plug": plug_end(src, "out", src_plug_name), "name": name})
+                plan["outputs"].setdefault(name, self.plug_type(src, "out", src_plug_name))
+                continue
+
+            # Material ShaderAssignments
+            if to_node == output_node_name:
+                self.plan_assignment(plan, src, from_socket, to_socket, src_plugs)
+                continue
+
+            # connect input and outputs for this node
+            dst = created.get(to_node)
+            if dst is not None:
+                self.plan_connection(plan, src, from_socket, dst, to_socket, src_plugs, node_plugs(nodes, to_node, "parameters"))
+
+        plan["assignments"].sort(key=assignment_order)
+
+        # rename group sockets from their unique identifiers after all has been connected in the tree containing the group.
+        if not is_group:
+            for group in groups:
+                for identifier, name in group["socket_map"].items():
+                    plan["socket_renames"].append({"node": group["name"], "plug": safe_plug_name(identifier), "name": sanitize_name(name)})
+        return plan
+
+    def plan_materials(self, material_data:dict):
+        return [
+            {"name": sanitize_name(mat_name), "network": self.plan_network(material)}
+            for mat_name, material in material_data.items()
+        ]
+
+    ############# ASSIGNMENTS ###############
+    def plan_split(self, obj_name, obj_path, mat_by_index):
+        # MeshSplit of a multi material mesh and the Renames of its children, see buildMatSplitNetwork.
+        values = list(mat_by_index.values())
+        duplicates = set([v for v in values if values.count(v) > 1])
+        children = []
+        for idx, mat_name in mat_by_index.items():
+            safe_mat_name = sanitize_name(mat_name)
+            new_name = obj_name + "_" + safe_mat_name
+            # If a Material Name appears more than once we mark a suffix for correct processing
+            if mat_name in duplicates:
+                new_name = new_name + "_duplMat_" + idx
+            children.append({
+                "index": idx,
+                "material": safe_mat_name,
+                # This assumes MeshSplit names children "0", "1", "2"...
+                "child_path": obj_path + "/" + idx,
+                "name": new_name,
+                "path": obj_path + "/" + new_name
+            })
+        return {"object": obj_name, "path": obj_path, "children": children}
+
+    def plan_assignments(self, assignment_data:dict, materials:list, split_geo=True):
+        # Only materials with a ShaderAssignment get a filter. Without the planned materials (import cache hit)
+        # the filters are not checked, the cached Materials box already has them.
+        filters = {} if materials is None else {material["name"]: [] for material in materials if material["network"]["assignments"]}
+        splits = []
+
+        def add_filter_path(material_name, path, obj_name):
+            if materials is None:
+                filters.setdefault(material_name, []).append(path)
+            elif material_name in filters:
+                filters[material_name].append(path)
+            else:
+                self.warn(f"💀 Failed to Assign {material_name} to {obj_name} on the path {path}")
+
+        for k, v in assignment_data.items():
+            obj_name = sanitize_name(k)
+            gaffer_path = to_gaffer_path(v["path"])
+            mat_by_index = v.get("mat_by_index", {})
+            if not mat_by_index:
+                self.warn(f"💀 Failed to Assign Material to {obj_name}: no material")
+                continue
+            if v.get("has_multiple_mat") and split_geo:
+                split = self.plan_split(obj_name, gaffer_path, mat_by_index)
+                splits.append(split)
+                for child in split["children"]:
+                    add_filter_path(child["material"], child["path"], obj_name)
+            else:
+                # get the first value no matter the key
+                add_filter_path(sanitize_name(next(iter(mat_by_index.values()))), gaffer_path, obj_name)
+
+        return {"filters": filters, "splits": splits}
+
+    def plan_texspace_variables(self, assignment_data:dict):
+        # TRANSFORM texture space mode: the texspace_scale and texspace_offset constant primvars read by
+        # the Generated coordinates network, paths grouped per unique texture space.
+        if self.texspace_mode != "TRANSFORM":
+            return []
+        paths_by_texspace = {}
+        for v in assignment_data.values():
+            texspace = v.get("texspace")
+            if texspace is None:
+                continue
+            key = (tuple(texspace["scale"]), tuple(texspace["offset"]))
+            paths_by_texspace.setdefault(key, []).append(to_gaffer_path(v["path"]))
+        return [
+            {"scale": list(scale), "offset": list(offset), "paths": paths}
+            for (scale, offset), paths in paths_by_texspace.items()
+        ]
+
+
+def plan_scene(data:dict, schema:CyclesSchema, process_image_seq=True, split_submeshes=True, plan_networks=True) -> dict:
+    # plan_networks=False only plans the splits, assignments and texture space variables, for a Materials box
+    # loaded from the import cache. No network is resolved and no shader is looked up in the schema.
+    planner = BuildPlanner(data, schema, process_image_seq)
+    assignment_data = data.get("hierarchy", {})
+    materials = planner.plan_materials(data["materials"]) if plan_networks else None
+    return {
+        "texspace_mode": planner.texspace_mode,
+        "materials": materials or [],
+        "texspace_variables": planner.plan_texspace_variables(assignment_data),
+        "assignments": planner.plan_assignments(assignment_data, materials, split_submeshes),
+        "warnings": planner.warnings
+    }
+
+
+def plan_stats(plan:dict) -> dict:
+    # Node and connection counts of a plan, group networks counted once.
+    stats = {"materials": len(plan["materials"]), "nodes": 0, "connections": 0, "converters": 0, "groups": 0,
+             "splits": len(plan["assignments"]["splits"]), "warnings": len(plan["warnings"])}
+    seen = set()
+
+    def count(network):
+        stats["nodes"] += len(network["nodes"])
+        stats["connections"] += len(network["connections"])
+        for node in network["nodes"]:
+            if node.get("converter"):
+                stats["converters"] += 1
+            if node["kind"] == "group" and id(node["network"]) not in seen:
+                seen.add(id(node["network"]))
+                stats["groups"] += 1
+                count(node["network"])
+
+    for material in plan["materials"]:
+        count(material["network"])
+    return stats
+
+
+if __name__ == "__main__":
+    from MagicHammer.Cycles_Import.gcyc_format import load_gcyc
+
+    parser = argparse.ArgumentParser(description="Build the Gaffer build plan of a .gcyc without Gaffer.")
+    parser.add_argument("gcyc")
+    parser.add_argument("--schema", required=True, help="schema written by utils/generate_cycles_schema.py")
+    parser.add_argument("--output", help="write the plan to this JSON file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = load_gcyc(args.gcyc)
+    loaded = time.perf_counter()
+    plan = plan_scene(data, CyclesSchema.load(args.schema))
+    planned = time.perf_counter()
+
+    for warning in plan["warnings"]:
+        print(warning)
+    print(json.dumps(plan_stats(plan)))
+    print(f"load {loaded - start:.3f}s, plan {planned - loaded:.3f}s")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(plan, f, indent=2)
@@ -0,0 +1,138 @@
+import json
+import struct
+import zlib
+
+
+#########################################
+#---------BINARY .gcyc DECODING---------#
+#########################################
+# Reader for the binary .gcyc written by GcycBinaryWriter (BlenderAddon/functions/Blender_Gcyc_Writer.py),
+# the tag layout is documented there. Plain python, no Gaffer import, so it can be used outside of Gaffer.
+GCYB_MAGIC = b"GCYB"
+GCYB_VERSION = 1
+GCYB_COMPRESSION_NONE = 0
+GCYB_COMPRESSION_ZLIB = 1
+
+T_END = 0
+T_NULL = 1
+T_FALSE = 2
+T_TRUE = 3
+T_INT = 4
+T_FLOAT = 5
+T_STR_NEW = 6
+T_STR_REF = 7
+T_PATH = 8
+T_LIST = 9
+T_DICT = 10
+T_LINKS = 11
+T_SHORT_REF = 16
+
+LINK_KEYS = ("from_node", "from_socket", "to_node", "to_socket")
+
+_F64 = struct.Struct("<d")
+
+
+class GcycBinaryReader:
+    def __init__(self, body):
+        self.body = body
+        self.pos = 0
+        self.strings = []
+
+    def varint(self):
+        body = self.body
+        pos = self.pos
+        byte = body[pos]
+        pos += 1
+        if byte < 0x80:
+            self.pos = pos
+            return byte
+        value = byte & 0x7f
+        shift = 7
+        while True:
+            byte = body[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return value
+            shift += 7
+
+    def string(self):
+        tag = self.body[self.pos]
+        self.pos += 1
+        if tag >= T_SHORT_REF:
+            return self.strings[tag - T_SHORT_REF]
+        if tag == T_STR_REF:
+            return self.strings[self.varint()]
+        if tag == T_STR_NEW:
+            size = self.varint()
+            value = self.body[self.pos:self.pos + size].decode("utf-8")
+            self.pos += size
+            self.strings.append(value)
+            return value
+        if tag == T_PATH:
+            return "/".join([self.string() for _ in range(self.varint())])
+        raise ValueError(f"Unexpected tag {tag} in .gcyc string at byte {self.pos - 1}")
+
+    def value(self):
+        tag = self.body[self.pos]
+        if tag >= T_SHORT_REF or tag in (T_STR_NEW, T_STR_REF, T_PATH):
+            return self.string()
+        self.pos += 1
+        if tag == T_DICT:
+            result = {}
+            while self.body[self.pos] != T_END:
+                key = self.string()
+                result[key] = self.value()
+            self.pos += 1
+            return result
+        if tag == T_LIST:
+            result = []
+            while self.body[self.pos] != T_END:
+                result.append(self.value())
+            self.pos += 1
+            return result
+        if tag == T_FLOAT:
+            value = _F64.unpack_from(self.body, self.pos)[0]
+            self.pos += 8
+            return value
+        if tag == T_INT:
+            value = self.varint()
+            return -((value + 1) >> 1) if value & 1 else value >> 1
+        if tag == T_LINKS:
+            count = self.varint()
+            columns = [[self.string() for _ in range(count)] for _ in LINK_KEYS]
+            return [dict(zip(LINK_KEYS, row)) for row in zip(*columns)]
+        if tag == T_NULL:
+            return None
+        if tag == T_TRUE:
+            return True
+        if tag == T_FALSE:
+            return False
+        raise ValueError(f"Unexpected tag {tag} in .gcyc at byte {self.pos - 1}")
+
+
+def decode_gcyc_binary(data):
+    if data[:4] != GCYB_MAGIC:
+        raise ValueError("Not a binary .gcyc file")
+    version = data[4]
+    compression = data[5]
+    if version != GCYB_VERSION:
+        raise ValueError(f"Binary .gcyc version {version} is not supported (expected {GCYB_VERSION}), update MagicHammer.")
+
+    body = data[6:]
+    if compression == GCYB_COMPRESSION_ZLIB:
+        body = zlib.decompress(body)
+    elif compression != GCYB_COMPRESSION_NONE:
+        raise ValueError(f"Unknown .gcyc compression {compression}")
+
+    return GcycBinaryReader(body).value()
+
+
+def load_gcyc(path):
+    # Reads both the JSON and the binary .gcyc, the binary one is recognised by its magic.
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] == GCYB_MAGIC:
+        return decode_gcyc_binary(data)
+    return json.loads(data)
@@ -4,417 +4,87 @@ import GafferCycles
 import GafferDispatch
 import IECore
 import imath
-import json
 import os
-import re
+import time
 
 from pathlib import Path
 
-# --- Type conversion map for plugs ---
-PLUG_TYPE_MAP = {
-    'Gaffer::FloatPlug': 'float',
-    'Gaffer::IntPlug': 'int',
-    'Gaffer::V3fPlug': 'vector',
-    'Gaffer::Color3fPlug': 'color',
-    'Gaffer::StringPlug': 'string',
-    'Gaffer::BoolPlug': 'int'
-}
-
-SPECIAL_CASES = [
-    "image_texture",
-    "float_curve",
-    "vector_curves",
-    "rgb_curves",
-    "rgb_ramp"
-]
-
-SHADER_TYPE_REMAP = {
-    "hue/saturation/value":'hsv',
-    "color_ramp":"rgb_ramp",
-    "add_shader":"add_closure",
-    "curves_info":"hair_info",
-    "camera_data":"camera_info",
-    "mix_shader":"mix_closure",
-    "volume_scatter":"scatter_volume",
-    "volume_absorption":"absorption_volume",
-    "ies_texture":"ies_light",
-    "point_density":"point_density_texture",
-    "uv_map":"uvmap",
-    "color_attribute":"vertex_color",
-
-}
-
-LABEL_MAP = {
-    "add_closure":{
-        "shader":"closure1",
-        "shader_001":"closure2"
-    },
-    "mix_closure":{
-        "shader":"closure1",
-        "shader_001":"closure2"
-    },
-    "principled_bsdf": {
-        "base color": "base_color",
-        "diffuse roughness":"roughness",
-        "ior": "thin_film_ior",
-        "method": "subsurface_method",
-        "weight": "sheen_weight",
-        "radius": "subsurface_radius",
-        "scale": "subsurface_scale",
-        "anisotropy": "subsurface_anisotropy",
-        "distribution": "distribution",
-        "ior level": "specular_ior_level",
-        "tint": "sheen_tint",
-        "anisotropic": "anisotropic",
-        "anisotropic rotation": "anisotropic_rotation",
-        "tangent": "tangent",
-        "roughness": "sheen_roughness",
-        "normal": "coat_normal",
-        "color": "emission_color",
-        "strength": "emission_strength",
-        "thickness": "thin_film_thickness"
-    },
-    "principled_hair_bsdf": {
-        "absorption coefficient": "absorption_coefficient",
-        "melanin redness": "melanin_redness",
-        "radial roughness": "radial_roughness",
-        "ior": "ior",
-        "random color": "random_color",
-        "random roughness": "random_roughness",
-        "aspect ratio": "aspect_ratio"
-    },
-    "principled_volume": {
-        "color attribute": "color_attribute",
-        "density attribute": "density_attribute",
-        "absorption color": "absorption_color",
-        "emission strength": "emission_strength",
-        "emission color": "emission_color",
-        "blackbody intensity": "blackbody_intensity",
-        "blackbody tint": "blackbody_tint",
-        "temperature attribute": "temperature_attribute"
-    },
-    "vector_map_range": {
-        "interpolation type": "range_type",
-        "from min": "from_min",
-        "from max": "from_max",
-        "to min": "to_min",
-        "to max": "to_max",
-        "steps": "steps",
-        "clamp": "use_clamp"
-    },
-    "map_range": {
-        "interpolation_type": "range_type",
-        "from min": "from_min",
-        "from max": "from_max",
-        "to min": "to_min",
-        "to max": "to_max",
-        "steps": "steps",
-        "clamp": "use_clamp"
-    },
-    "mix": {
-        "blending mode": "mix_type",
-        "factor":"fac",
-        "a": "color1",
-        "b": "color2",
-        "clamp": "use_clamp",
-        "result": "color"
-    },
-    "mix_color": {
-        "blending_mode": "blend_type",
-        "clamp_result": "use_clamp_result",
-        "clamp_factor": "use_clamp",
-        "factor_float":"fac",
-        "a_color": "a",
-        "b_color": "b",
-        "result_color":"result"
-        
-    },
-    "mix_float": {
-        "clamp_result": "use_clamp_result",
-        "clamp_factor": "use_clamp",
-        "factor_float":"fac",
-        "a_float": "a",
-        "b_float": "b",
-        "result_float":"result"
-        
-    },
-    "mix_vector": {
-        "clamp_result": "use_clamp_result",
-        "clamp_factor": "use_clamp",
-        "factor_float":"fac",
-        "a_vector": "a",
-        "b_vector": "b",
-        "result_vector":"result"    
-    },
-    "mix_vector_non_uniform": {
-        "clamp_result": "use_clamp_result",
-        "clamp_factor": "use_clamp",
-        "factor_vector":"fac",
-        "a_vector": "a",
-        "b_vector": "b",
-        "result_vector":"result"    
-    },
-    "float_curve": {
-        "min x": "min_x",
-        "max x": "max_x",
-        "factor":"fac"
-    },
-    "rgb_curves": {
-        "color":"value",
-        "factor":"fac",
-        "min x": "min_x",
-        "max x": "max_x"
-    },
-    "vector_curves": {
-        "vector":"value",
-        "factor":"fac",
-        "min x": "min_x",
-        "max x": "max_x"
-    },
-    "vector_transform": {
-        "vector_type": "transform_type",
-        "convert from": "convert_from",
-        "mconvert to": "convert_to"
-    },
-    "mapping": {
-        "vector_type": "mapping_type"
-    },
-    "vector_rotate": {
-        "rotation_type": "rotate_type"
-    },
-    "clamp": {
-        "clamp type": "clamp_type"
-
-    },
-    "brightness_contrast": {
-        "brightness": "bright"
-    },
-    "normal": {
-        "direction": "direction"
-    },
-    "bump": {
-        "sample center": "sample_center",
-        "sample x": "sample_x",
-        "sample y": "sample_y",
-        "use object space": "use_object_space"
-    },
-    "vertex_color": {
-        "layer name": "layer_name"
-    },
-    "vector_math": {
-        "operation": "math_type",
-        "vector":"vector1",
-        "vector_001":"vector2",
-        "vector_002":"vector3"
-    },
-    "texture_coordinate": {
-        "from dupli": "from_dupli",
-        "use transform": "use_transform",
-        "object transform": "ob_tfm"
-    },
-    "ambient_occlusion": {
-        "only local": "only_local"
-    },
-    "uvmap": {
-        "from dupli": "from_dupli",
-        "uv_map":"attribute"
-    },
-    "wireframe": {
-        "use pixel size": "use_pixel_size"
-    },
-    "tangent": {
-        "direction": "direction_type",
-        "uv_map":"attribute"
-    },
-    "point_density_texture": {
-        "transform": "tfm"
-    },
-    "image_texture": {
-        "image":"filename",
-        "image_color_space":"colorspace",
-        "alpha type": "alpha_type",
-        "projection blend": "projection_blend"
-    },
-    "environment_texture": {
-        "alpha type": "alpha_type"
-    },
-    "sky_texture": {
-        "type": "sky_type",
-        "sun direction": "sun_direction",
-        "sun disc": "sun_disc",
-        "sun size": "sun_size",
-        "sun intensity": "sun_intensity",
-        "sun elevation": "sun_elevation",
-        "sun rotation": "sun_rotation",
-        "ground albedo": "ground_albedo",
-        "air": "air_density",
-        "dust": "dust_density",
-        "ozone": "ozone_density"
-    },
-    "noise_texture": {
-        "normalize": "use_normalize",
-        "noise_dimensions":"dimensions",
-        "noise_type": "type"
-    },
-    "gradient_texture": {
-        "gradient type": "gradient_type"
-    },
-    "voronoi_texture": {
-        "normalize": "use_normalize",
-        "voronoi_dimensions": "dimensions",
-        "distance": "metric"
-    },
-    "ies_light": {
-        "ies": "ies",
-        "filepath":"filename"
-    },
-    "musgrave_texture": {
-        "musgrave type": "musgrave_type"
-    },
-    "checker_texture": {},
-    "magic_texture": {
-        "turbulence_depth":"depth"
-    },
-    "wave_texture": {
-        "wave type": "wave_type",
-        "bands direction": "bands_direction",
-        "rings direction": "rings_direction",
-        "detail scale": "detail_scale",
-        "detail roughness": "detail_roughness",
-        "phase offset":"phase",
-        "wave_profile":"profile"
-    },
-    "brick_texture": {
-        "offset frequency": "offset_frequency",
-        "squash frequency": "squash_frequency",
-        "mortar size": "mortar_size",
-        "mortar smooth": "mortar_smooth",
-        "brick width": "brick_width",
-        "row width": "brick_height"
-    },
-    "hair_bsdf": {
-        "roughness u": "roughness_u",
-        "roughness v": "roughness_v"
-    },
-    "subsurface_scattering": {
-        "ior": "subsurface_ior",
-        "roughness": "subsurface_roughness",
-        "anisotropy": "subsurface_anisotropy",
-        "falloff":"method"
-    },
-    "math": {
-        "operation": "math_type",
-        "clamp": "use_clamp",
-        "value": "value1",
-        "value_001": "value2",
-        "value_002": "value3"
-    },
-    "rgb_ramp": {
-        "ramp alpha": "ramp_alpha"
-    },
-    "color":{
-        "color":"value"
-    },
-    "separate_color":{
-        "red":"r",
-        "green":"g",
-        "blue":"b",
-        "mode":"color_type"
-    },
-    "combine_color":{
-        "red":"r",
-        "green":"g",
-        "blue":"b",
-        "mode":"color_type"
-    },
-    "fresnel":{
-        "normal":"UNSUPPORTED"
-    },
-    "layer_weight":{
-        "normal":"UNSUPPORTED"
-    },
-    "bevel":{
-        "normal":"bevel"
-    },
-    "combine_xyz":{},
-    "attribute":{
-        "attribute_name":"attribute"
-    },
-    "white_noise_texture":{
-        "noise_dimensions":"dimensions"
-    },
-    "normal_map": {
-        "uv_map":"attribute"
-    },
-    "gabor_texture":{
-        "gabor_type":"type"
-    },
-    "toon_bsdf": {},
-    "glossy_bsdf": {},
-    "refraction_bsdf": {},
-    "sheen_bsdf": {},
-    "diffuse_bsdf": {}
-}
-# label_map_path = os.path.join("C:\\GitHub\\GafferShaderNetFromBlender\\InProgressScripts", "cycles_label_map.json")
-# with open(label_map_path, "r", encoding="utf-8") as f:
-    # LABEL_MAP = json.load(f)
+from MagicHammer.Cycles_Import.gcyc_format import load_gcyc
+from MagicHammer.Cycles_Import.texture_manifest import manifest_path_for, load_texture_manifest, check_texture_manifest, report_texture_problems
+from MagicHammer.Cycles_Import.import_cache import ImportCache
+from MagicHammer.Cycles_Import.build_plan import CyclesSchema, plan_scene, convert_curve_interpolation
+
+# The .gcyc is first turned into a build plan by build_plan.py (no Gaffer involved), the functions
+# below only execute that plan.
 
 PROCESS_IMAGE_SEQ = True
 
-def safe_plug_name(plugname):
-    plugnamesafe = plugname.lower().replace(" ", "_")
-    return plugnamesafe
-
-def normalize_name(name):
-    return re.sub(r'[^a-z0-9]', '', name.lower())
-
-def resolve_plug_name(socket_label, gaffer_node, io="parameters", shader_type=None, isBox=False):
-    validIo = gaffer_node.getChild(io)
-    candidate = safe_plug_name(socket_label)
-    #BoxNodes
-    if isBox:
-        if shader_type in ["rgb_curves", "vector_curves"]:
-            if io == "out":
-                return "value"
+# group_id -> serialisation of the first Box built for that group.
+GROUP_SERIALISATIONS = {}
+
+
+#########################################
+#-----------SHADER PROTOTYPES-----------#
+#########################################
+# Every Cycles shader type is loaded once per Gaffer session. New shaders are copies of the plugs of
+# that prototype, and the plug layouts and presets read by the planner are kept with it.
+# shader type -> loaded CyclesShader, None when it could not be loaded
+SHADER_PROTOTYPES = {}
+# shader type -> {"parameters": {plug: type name}, "out": {plug: type name}}, None when unknown
+SHADER_LAYOUTS = {}
+# (shader type, plug) -> presetValues
+SHADER_PRESETS = {}
+
+def shader_prototype(shader_type):
+    if shader_type not in SHADER_PROTOTYPES:
+        shader = GafferCycles.CyclesShader(shader_type)
+        try:
+            shader.loadShader(shader_type)
+        except Exception as e:
+            print(f"❌ Could not load shader '{shader_type}': {e}")
+            shader = None
+        SHADER_PROTOTYPES[shader_type] = shader
+    return SHADER_PROTOTYPES[shader_type]
+
+def create_shader(name, shader_type):
+    # Same as CyclesShader(name).loadShader(shader_type), built from the cached prototype.
+    prototype = shader_prototype(shader_type)
+    if prototype is None:
+        return None
+    shader = GafferCycles.CyclesShader(name)
+    shader["name"].setValue(prototype["name"].getValue())
+    shader["type"].setValue(prototype["type"].getValue())
+    for plug in prototype["parameters"].children():
+        shader["parameters"].addChild(plug.createCounterpart(plug.getName(), Gaffer.Plug.Direction.In))
+    shader.setChild("out", prototype["out"].createCounterpart("out", Gaffer.Plug.Direction.Out))
+    return shader
+
+
+class GafferCyclesSchema(CyclesSchema):
+    # Plug names, types and presets read from the shader prototypes, shared by all the imports of the session.
+    def __init__(self):
+        super().__init__()
+        self.shaders = SHADER_LAYOUTS
+
+    def shader(self, shader_type):
+        if shader_type not in self.shaders:
+            shader = shader_prototype(shader_type)
+            self.shaders[shader_type] = None if shader is None else {
+                io: {plug.getName(): plug.typeName() for plug in shader[io].children()}
+                for io in ("parameters", "out")
+            }
+        return self.shaders[shader_type]
+
+    def presets(self, shader_type, plug):
+        key = (shader_type, plug)
+        if key not in SHADER_PRESETS:
+            shader = shader_prototype(shader_type)
+            if shader is None or plug not in shader["parameters"]:
+                SHADER_PRESETS[key] = None
             else:
-                return candidate
-        elif shader_type == "group":
-            return candidate
+                SHADER_PRESETS[key] = list(Gaffer.Metadata.value(shader["parameters"][plug], "presetValues") or [])
+        return SHADER_PRESETS[key]
 
-    # 1. Try safe plug name directly
-    if validIo and io in gaffer_node and candidate in gaffer_node[io]:
-        return candidate
-    
-    # 2. Try label map fallback
-    if shader_type:
-        remap = LABEL_MAP.get(shader_type, {}).get(socket_label.lower())
-        # special cases
-        if shader_type in ["mix_closure", "add_closure"]:
-            if io == "out":
-                return "closure"
-        if validIo and remap and remap in gaffer_node[io]:
-            return remap
-        
-        # unsupported plugs
-        elif remap == 'UNSUPPORTED':
-            return 'UNSUPPORTED'
-
-    # 3. Try fuzzy match
-    norm_target = normalize_name(socket_label)
-    if validIo:
-        for name in gaffer_node[io].keys():
-            if normalize_name(name) == norm_target:
-                return name
-
-    return None
-
-def shader_safe_type(shadertype:str):
-    if SHADER_TYPE_REMAP.get(shadertype):
-        shadertype = SHADER_TYPE_REMAP.get(shadertype)
-    safeShadertype = re.sub(r'\W|^(?=\d)', '_', shadertype)
-    
-    return safeShadertype
-    
 
 def process_values(value):
     if isinstance(value, list) and all(isinstance(x, float) for x in value):
@@ -459,37 +129,18 @@ def process_ramp(ramp, rampdict):
         ramp[ptnm].addChild( Gaffer.FloatPlug( "x", defaultValue = x, flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic, ) )
         ramp[ptnm].addChild( Gaffer.Color3fPlug( "y", defaultValue = y, flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic, ) )
                 
-def convert_ramp_interpolation(interpolation:str):
-    translatdict:dict = {
-        "ease":3,
-        "cardinal":1,
-        "linear":0,
-        "b_spline":2,
-        "constant":4
-    }
-    return translatdict[interpolation.lower()]
-
-def convert_curve_interpolation(curvelist:list):
-    interpolation = 1 # AUTO is translated to CatmullRom
-    if curvelist[0][2] == "VECTOR":
-        interpolation = 0
-    return interpolation
-
-def build_curves_box(shader_node, params_dict, mode="rgb"):
+
+def build_curves_box(parent, name, params_dict, mode="rgb"):
     # Builds a curves box in Gaffer for either rgb_curves or vector_curves.
     # mode: "rgb" or "vector"
-
-    oldNodeName = shader_node.getName()
-    parent = shader_node.parent()
-
-    box = Gaffer.Box("Box1")
+    box = Gaffer.Box(name)
     parent.addChild(box)
 
-    # Safe_connect plug
+    # Shader type plug, like the "name" plug of the shaders
     string_plug = Gaffer.StringPlug(
         "name",
         Gaffer.Plug.Direction.In,
-        shader_node['name'].getValue(),
+        "rgb_curves" if mode == "rgb" else "vector_curves",
         Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic
     )
     box.addChild(string_plug)
@@ -497,28 +148,23 @@ def build_curves_box(shader_node, params_dict, mode="rgb"):
 
     if mode == "rgb":
         # RGB curves: has a special shader node
-        cshdr = GafferCycles.CyclesShader("c")
-        cshdr.loadShader("rgb_curves")
+        cshdr = create_shader("c", "rgb_curves")
         box.addChild(cshdr)
 
-        splitshader = GafferCycles.CyclesShader("split")
-        splitshader.loadShader("separate_rgb")
+        splitshader = create_shader("split", "separate_rgb")
         box.addChild(splitshader)
 
-        combineshader = GafferCycles.CyclesShader("join")
-        combineshader.loadShader("combine_rgb")
+        combineshader = create_shader("join", "combine_rgb")
         box.addChild(combineshader)
 
         channels = [("r", "r"), ("g", "g"), ("b", "b")]
         paramKey = "Color"
 
     else:  # mode == "vector"
-        splitshader = GafferCycles.CyclesShader("split")
-        splitshader.loadShader("separate_xyz")
+        splitshader = create_shader("split", "separate_xyz")
         box.addChild(splitshader)
 
-        combineshader = GafferCycles.CyclesShader("join")
-        combineshader.loadShader("combine_xyz")
+        combineshader = create_shader("join", "combine_xyz")
         box.addChild(combineshader)
 
         channels = [("x", "x"), ("y", "y"), ("z", "z")]
@@ -527,8 +173,7 @@ def build_curves_box(shader_node, params_dict, mode="rgb"):
     # Build float curves for each channel
     curve_nodes = {}
     for chName, splitOut in channels:
-        n = GafferCycles.CyclesShader(chName)
-        n.loadShader("float_curve")
+        n = create_shader(chName, "float_curve")
         box.addChild(n)
 
         n["parameters"]["value"].setInput(splitshader["out"][splitOut])
@@ -559,21 +204,9 @@ def build_curves_box(shader_node, params_dict, mode="rgb"):
     for n in curve_nodes.values():
         n["parameters"]["fac"].setInput(boxInNodeB["out"])
 
-    # Reconnect old inputs
-    colorinput = shader_node['parameters']['value'].getInput()
-    factorinput = shader_node["parameters"]["fac"].getInput()
-
     box["fac"].setValue(params_dict["Factor"])
     box[paramKey.lower()].setValue(process_values(params_dict[paramKey]))
 
-    if colorinput:
-        box['value'].setInput(colorinput)
-    if factorinput:
-        box['fac'].setInput(factorinput)
-
-    parent.removeChild(shader_node)
-    box.setName(oldNodeName)
-
     # Curves
     for chName in curve_nodes.keys():
         process_curve(curve_nodes[chName]['parameters']['curve'], params_dict[chName])
@@ -589,36 +222,19 @@ def build_curves_box(shader_node, params_dict, mode="rgb"):
 
     return box
 
-def load_image_sequence(image_node, params_dict:dict):
+def load_image_sequence(image_node, sequence:dict):
+    # sequence: prefix, ext, padding and the image_user frame settings, see BuildPlanner.plan_image_sequence
     expression_node = Gaffer.Expression( image_node.getName()+"_Expression" )
     image_node.parent().addChild(expression_node)
     expression_node["__engine"].setValue( 'python' )
-    
-    # === Parameters imported from Blender ===
-    sequence_path  = params_dict["image"]
-    frame_start    = params_dict["frame_start"]
-    frame_duration = params_dict["frame_duration"]
-    frame_offset   = params_dict["frame_offset"]
-    use_cyclic     = params_dict["use_cyclic"]
-
-    m = re.search(r"(#+)", sequence_path)
-    if m:
-        padding = len(m.group(1))
-    else:
-        padding = 4  # default
-    # Split extension first
-    prefix, ext = os.path.splitext(sequence_path)
-
-    # Remove the frame token from prefix
-    prefix = prefix.replace(m.group(1), "")
 
     expression = f"""
-prefix = r"{prefix}"
-ext = "{ext}"
-cyc = {use_cyclic}
-fs = {frame_start}
-fd = {frame_duration}
-fo = {frame_offset}
+prefix = r"{sequence['prefix']}"
+ext = "{sequence['ext']}"
+cyc = {sequence['use_cyclic']}
+fs = {sequence['frame_start']}
+fd = {sequence['frame_duration']}
+fo = {sequence['frame_offset']}
 fr = int(context.getFrame())
 
 # Clamp/cycle frame
@@ -636,190 +252,166 @@ if not cyc and fr >= fs + fd:
 if (fr - framestart) < 0:
     formula = fo
 
-frame = str(formula).zfill({padding})
+frame = str(formula).zfill({sequence['padding']})
 parent["{image_node.getName()}"]["parameters"]["filename"] = prefix + frame + ext
 """
     
     expression_node.setExpression(expression)
 
 
-def set_shader_specialCases(shader_node, params_dict, shader_type):
-    if shader_type == "image_texture":
-        raw_path = params_dict["image"] 
-        p = Path(raw_path)
-        filepath = p.as_posix()
-        shader_node["parameters"]["filename"].setValue(filepath)#(params_dict["image"].replace("\\", "/")))
-        if params_dict["Source"] in ["SEQUENCE", "MOVIE"] and PROCESS_IMAGE_SEQ:
-            load_image_sequence(shader_node, params_dict)
-
-        # Color Space
-        color_space_remap = {
-            'Non-Color'     :'data',
-            'Linear Rec.709':'Linear Rec.709 (sRGB)'
-        }
-        color_space = params_dict["image_color_space"]
-        plug = shader_node['parameters']['colorspace']
-        presets = list(Gaffer.Metadata.value(plug, "presetValues"))
-        color_space = color_space_remap.get(color_space)
-        if color_space in presets:
-            shader_node['parameters']['colorspace'].setValue(color_space)
+#########################################
+#-------------PLAN EXECUTION------------#
+#########################################
+def set_plan_values(node, plugs, values):
+    for plug_name, value in values:
+        try:
+            plugs[plug_name].setValue(process_values(value))
+            print(f"🔧 Set {node.getName()}.{plug_name} = {value} => {value}")
+        except Exception as e:
+            print(f"❌ Failed to set {node.getName()}.{plug_name}, value={value}:\n {e}")
+
+def create_plan_node(parent, node_plan):
+    # Creates one shader (or curves Box) of a network plan, group Boxes are made by instance_group_network.
+    if node_plan["kind"] == "curves_box":
+        return build_curves_box(parent, node_plan["name"], node_plan["params"], mode="rgb" if node_plan["shader"] == "rgb_curves" else "vector")
+
+    shader = create_shader(node_plan["name"], node_plan["shader"])
+    if shader is None:
+        print(f"❌ Could not create {node_plan['name']}, shader '{node_plan['shader']}' is unknown")
+        return None
+    parent.addChild(shader)
+    set_plan_values(shader, shader["parameters"], node_plan["values"])
+
+    if "curve" in node_plan:
+        curve = shader["parameters"][node_plan["curve"]["plug"]]
+        curve["interpolation"].setValue(node_plan["curve"]["interpolation"])
+        process_curve(curve, node_plan["curve"]["points"])
+    if "ramp" in node_plan:
+        ramp = shader["parameters"][node_plan["ramp"]["plug"]]
+        ramp["interpolation"].setValue(node_plan["ramp"]["interpolation"])
+        process_ramp(ramp, node_plan["ramp"]["elements"])
+    if "sequence" in node_plan:
+        load_image_sequence(shader, node_plan["sequence"])
+    if "color" in node_plan:
+        Gaffer.Metadata.registerValue( shader, 'nodeGadget:color', imath.Color3f( *node_plan["color"] ) )
+    return shader
+
+def plan_plug(created, end):
+    # The Gaffer plug of a plan plug end, None when its node could not be created.
+    node = created.get(end["node"])
+    if node is None:
+        return None
+    if end["io"] is None:
+        return node[end["plug"]]
+    return node[end["io"]][end["plug"]]
+
+# This executes the plan of a material or of the shaders inside a group, groups recurse through instance_group_network.
+def apply_network(box, network):
+    created = {}
+    for node_plan in network["nodes"]:
+        if node_plan["kind"] == "group":
+            node = instance_group_network(box, node_plan)
         else:
-            # set to Auto
-            color_space = shader_node['parameters']['colorspace'].setValue('')
-        # Alpha
-        alpha_remap = {
-            'STRAIGHT'      : 'unassociated',
-            'PREMUL'        : 'associated',
-            'CHANNEL_PACKED': 'channel_packed',
-            'NONE'          : 'ignore'
-        }
-        alpha_type = alpha_remap[params_dict["alpha_mode"]]
-        shader_node['parameters']['alpha_type'].setValue(alpha_type)
-        # Extension
-        Extension_remap = {
-            'REPEAT'    : 'periodic',
-            'EXTEND'    : 'black',
-            'CLIP'      : 'clamp',
-            'MIRROR'    : 'mirror'
-        }
-        Extension_type = Extension_remap[params_dict["extension"]]
-        shader_node['parameters']['extension'].setValue(Extension_type)
-        # # Projection
-        projection_remap = {
-            'FLAT'    : 'flat',
-            'BOX'     : 'box',
-            'SPHERE'  : 'sphere',
-            'TUBE'    : 'tube'
-        }
-        projection_type = projection_remap[params_dict["projection"]]
-        shader_node['parameters']['projection'].setValue(projection_type)
-        # # Other
-        shader_node['parameters']['interpolation'].setValue(params_dict["interpolation"].lower())
-        shader_node['parameters']['projection_blend'].setValue(params_dict["projection_blend"])
-
-    # On Curves, interpolation is not 1:1 and takes the value of the first point on Blender.
-    elif shader_type == "float_curve":
-        shader_node["parameters"]["fac"].setValue(params_dict["Factor"])
-        shader_node["parameters"]["value"].setValue(params_dict["Value"])
-        shader_node['parameters']['curve']["interpolation"].setValue(convert_curve_interpolation(params_dict["curve"]))
-        process_curve(shader_node['parameters']['curve'], params_dict["curve"])
-    elif shader_type == "rgb_curves":
-        build_curves_box(shader_node, params_dict, mode="rgb")
-    elif shader_type == "vector_curves":
-        build_curves_box(shader_node, params_dict, mode="vector")
-    elif shader_type == "rgb_ramp":
-        shader_node["parameters"]["fac"].setValue(params_dict["Factor"])
-        shader_node['parameters']['ramp']["interpolation"].setValue(convert_ramp_interpolation(params_dict["interpolation"]))
-        process_ramp(shader_node['parameters']['ramp'], params_dict["ramp_elements"])
-    
-
-def set_shader_parameters(shader_node, params_dict, shader_type):
-    print(f"!!!! 🎱 ShaderType: {shader_type} !!!!!")
-    if shader_type in SPECIAL_CASES:
-        set_shader_specialCases(shader_node, params_dict, shader_type)
-        return 
-    
-    for param_label, value in params_dict.items():
-        plug_name = resolve_plug_name(param_label, shader_node, io="parameters", shader_type=shader_type)
-        if plug_name == "UNSUPPORTED":
-            print( f"😞 the parameter: '{param_label}' on shader: '{shader_type}', is unsupported by CyclesGaffer.")
-            continue
-        if not plug_name:
-            if param_label.lower() == 'weight':
-                # ignore the weight parameter that comes in every node and is irrelevant for translation.
-                continue                
-            # Special Cases
-            specialcases = [
-                'mix' in shader_type or "map_range" in shader_type and param_label.lower() in ['data_type'],
-                shader_type in ["texture_coordinate", "uvmap"] and param_label.lower() in ['from_instancer'],
-                shader_type == "attribute" and param_label.lower() == "attribute_type",
-                shader_type == "ies_texture" and param_label.lower() == "mode"
-            ]
-            if True in specialcases:
-                continue
-
-            print(f"⚠️ Could not resolve param '{param_label}' for shader type '{shader_type}'")
-            continue
+            node = create_plan_node(box, node_plan)
+        if node is not None:
+            created[node_plan["name"]] = node
 
+    for connection in network["connections"]:
         try:
-            if shader_type == "vector_rotate" and value == "AXIS_ANGLE":
-                value = "axis"
-            elif value == "FBM":
-                value = "fBM"
-            elif isinstance(value, str) and not value in ["1D","2D","3D","4D"]:
-                # Upercase labels and strings produce invalid results.
-                value = value.lower()
-            plug = shader_node["parameters"][plug_name]
-            plug.setValue(process_values(value))
-            print(f"🔧 Set {shader_node.getName()}.{plug_name} = {value} => {value}")
+            src_plug = plan_plug(created, connection["src"])
+            dst_plug = plan_plug(created, connection["dst"])
+            if src_plug is not None and dst_plug is not None:
+                dst_plug.setInput(src_plug)
         except Exception as e:
-            print(f"❌ Failed to set {shader_node.getName()}.{plug_name}, value={value}:\n {e}")
-
-
-# --- Safe plug connection with auto converter shader insertion ---
-def safe_connect(parent, src_node_name, src_socket_label, dst_node_name, dst_socket_label):
-    try:
-        src_node = parent[src_node_name]
-        dst_node = parent[dst_node_name]
-        isSrcBox:bool = src_node.typeName() == "Gaffer::Box"
-        isDstBox:bool = dst_node.typeName() == "Gaffer::Box"
-        # Try to guess shader types from node names
-        src_shader_type = src_node['name'].getValue()
-        dst_shader_type = dst_node['name'].getValue()
-        src_plug_name = resolve_plug_name(src_socket_label, src_node, io="out", shader_type=src_shader_type, isBox=isSrcBox)
-        dst_plug_name = resolve_plug_name(dst_socket_label, dst_node, io="parameters", shader_type=dst_shader_type, isBox=isDstBox)
-        if not src_plug_name or not dst_plug_name:
-            print(f"❌ Could not resolve {src_node_name}.{src_socket_label} → {dst_node_name}.{dst_socket_label}")
-            return
-        
-        # Handle Box Nodes that replace Imported nodes
-        if isSrcBox:
-            src_plug = src_node[src_plug_name]
+            src, dst = connection["src"], connection["dst"]
+            print(f"❌ Failed to connect {src['node']}.{src['plug']} → {dst['node']}.{dst['plug']}: {e}")
+
+    # Group I/O
+    for promotion in network["group_inputs"]:
+        dst_plug = plan_plug(created, promotion["plug"])
+        if dst_plug is not None:
+            Gaffer.BoxIO.promote(dst_plug)
+            dst_plug.getInput().node()["name"].setValue(promotion["name"])
+    for promotion in network["group_outputs"]:
+        src_plug = plan_plug(created, promotion["plug"])
+        if src_plug is not None:
+            boxOutPlug = Gaffer.BoxIO.promote(src_plug)
+            boxOutPlug.getInput().parent()["name"].setValue(promotion["name"])
+
+    # Material ShaderAssignments
+    shaderAssignments:list = []
+    for assignment in network["assignments"]:
+        final_shader = created.get(assignment["shader"])
+        if final_shader is None:
+            continue
+        sh_assign = GafferScene.ShaderAssignment(assignment["name"])
+        box.addChild(sh_assign)
+        if "plug" in assignment:
+            sh_assign["shader"].setInput(final_shader["out"][assignment["plug"]])
         else:
-            src_plug = src_node["out"][src_plug_name]
-
-        if isDstBox:
-            dst_plug = dst_node[dst_plug_name]
-        else:     
-            dst_plug = dst_node["parameters"][dst_plug_name]
+            sh_assign["shader"].setInput(final_shader["out"])
 
-
-        if dst_plug.typeName() == src_plug.typeName():
-            dst_plug.setInput(src_plug)
+        # Expose filter
+        if not box.getChild('filter_in'):
+            boxFilterPlug = Gaffer.BoxIO.promote(sh_assign["filter"])
+            boxFilterPlug.outputs()[0].parent().setName("filter_in")
         else:
-            from_type = PLUG_TYPE_MAP.get(src_plug.typeName())
-            to_type = PLUG_TYPE_MAP.get(dst_plug.typeName())
+            sh_assign['filter'].setInput(box['filter_in']['out'])
+        # Collect Assignemt to have surface, displacement and volume in one collection to parse, order and connect later
+        shaderAssignments.append(sh_assign)
+        print(f"🎯 Created ShaderAssignment and connected final shader {final_shader.getName()}")
 
-            if not from_type or not to_type:
-                print(f"❌ Unknown plug types: {src_plug.typeName()} → {dst_plug.typeName()}")
-                return
+    # rename group sockets from their unique identifiers after all has been connected in the tree containing the group.
+    for rename in network["socket_renames"]:
+        group_box = created.get(rename["node"])
+        if group_box is not None and group_box.getChild(rename["plug"]):
+            group_box[rename["plug"]].setName(rename["name"])
 
-            converter_name = f"convert_{from_type}_to_{to_type}"
-            converter = GafferCycles.CyclesShader(f"{src_node_name}_to_{dst_node_name}_converter")
-            converter.loadShader(converter_name)
-            parent.addChild(converter)
+    return shaderAssignments
 
-            inplugname = f"value_{from_type}"
-            outplugname = f"value_{to_type}"
+def build_group_box(mat_box, box_name, network):
+    group_box = Gaffer.Box(box_name)
+    mat_box.addChild(group_box)
+
+    # Shader type plug, like the "name" plug of the shaders
+    string_plug = Gaffer.StringPlug( "name", Gaffer.Plug.Direction.In, "group", Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+    group_box.addChild(string_plug)
+    Gaffer.Metadata.registerValue(group_box["name"], 'plugValueWidget:type', '')
+
+    # process group
+    apply_network(group_box, network)
+    return group_box
+
+# Groups are stored once in the "groups" table of the .gcyc, the first instance builds the network and
+# keeps a serialisation of it, every other instance of the same group is pasted from that serialisation.
+def instance_group_network(mat_box, node_plan):
+    group_id = node_plan["group_id"]
+    box_name = node_plan["name"]
+    script = mat_box.scriptNode()
+    serialisation = GROUP_SERIALISATIONS.get(group_id) if group_id is not None else None
+    if serialisation is None or script is None:
+        group_box = build_group_box(mat_box, box_name, node_plan["network"])
+        if group_id is not None and script is not None:
+            GROUP_SERIALISATIONS[group_id] = script.serialise(mat_box, Gaffer.StandardSet([group_box]))
+    else:
+        existing = set(mat_box.keys())
+        script.execute(serialisation, mat_box)
+        group_box = next(mat_box[name] for name in mat_box.keys() if name not in existing)
+        group_box.setName(box_name)
 
-            converter["parameters"][inplugname].setInput(src_plug)
-            dst_plug.setInput(converter["out"][outplugname])
-            Gaffer.Metadata.registerValue( converter, 'nodeGadget:color', imath.Color3f( 0.234999999, 0.234999999, 0.314999998 ) )
+    set_plan_values(group_box, group_box, node_plan["values"])
+    return group_box
 
-    except Exception as e:
-        print(f"❌ Failed to connect {src_node_name}.{src_socket_label} → {dst_node_name}.{dst_socket_label}: {e}")
 
 def create_basecheck_shader(mainShaderbox):
     shassignnode = GafferScene.ShaderAssignment("CheckShader")
     mainShaderbox.addChild(shassignnode)
 
-    checkMat = GafferCycles.CyclesShader("CheckMaterial")
-    checkMat.loadShader("emission")
+    checkMat = create_shader("CheckMaterial", "emission")
     mainShaderbox.addChild(checkMat)
     checkMat["parameters"]["color"].setValue(imath.Color3f(1, 0, 1))  # Magenta
     #Gaffer.Metadata.registerValue(checkMat, 'nodeGadget:color', imath.Color3f(1, 0, 1))
-    lightPath = GafferCycles.CyclesShader("light_path")
-    lightPath.loadShader("light_path")
+    lightPath = create_shader("light_path", "light_path")
     mainShaderbox.addChild(lightPath)
     checkMat['parameters']['strength'].setInput(lightPath['out']['is_camera_ray'])    
 
@@ -848,193 +440,8 @@ def boxInOutHandling(innode, outnode=None):
     boxInNode = boxInPlug.outputs()[0].node()
     boxOutNode["passThrough"].setInput( boxInNode["out"] )
 
-def sanitize_name(name: str) -> str:
-    # Replace any non-alphanumeric or underscore with "_"
-    safe = re.sub(r'[^0-9a-zA-Z_]', '_', name)
-    # Optionally, avoid names starting with a digit
-    if safe and safe[0].isdigit():
-        safe = "_" + safe
-    return safe
-
-
-            ####################
-            #### MAIN LOGIC ####
-            ####################
-# This is a recursive function that creates a network of shaders, could be a material or the shaders inside a group
-def create_material_network(mat_box, material, isGroup=False):
-    nodes = material["nodes"]
-    links = material.get("links", [])
-    created_nodes = {}
-    groups = []
-    
-    output_node_name =          ""
-    group_output_node_name =    ""
-    group_input_node_name =     ""
-
-    if len(links) == 0:
-        return "NOLINKS"
-    
-    ### NODE CREATION HANDLING ###
-    for node_name, node_info in nodes.items():
-        node_type = node_info.get("type", "")
-        shader_type = shader_safe_type(node_info.get("cycles_type", ""))
-        params = node_info.get("params", {})
-        if node_type == "ShaderNodeOutputMaterial":
-            output_node_name = node_name
-            continue        
-        if node_type == "NodeGroupOutput":
-            group_output_node_name = node_name
-            continue      
-        if node_type == "NodeGroupInput":
-            group_input_node_name = node_name
-            continue
-
-
-        safe_name = re.sub(r'\W|^(?=\d)', '_', node_name)
-        
-        # HANDLE GROUP NODES
-        if node_type == "ShaderNodeGroup":
-            group_box = Gaffer.Box(safe_name)
-            mat_box.addChild(group_box)
-            created_nodes[node_name] = safe_name
-            
-            group_data = node_info.get("group",{})
-            for group_name, group in group_data.items(): # Only 1 group but we iterate to get the data
-                group_box.setName(sanitize_name(group_name))
-
-                 # Safe_connect plug
-                string_plug = Gaffer.StringPlug( "name", Gaffer.Plug.Direction.In, "group", Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
-                group_box.addChild(string_plug)
-                Gaffer.Metadata.registerValue(group_box["name"], 'plugValueWidget:type', '')
-                #
-                # process group
-                groupAssignment = load_group_network(group_box, group) # returns a dict with the group and the map to rename sockets
-                for param_label, value in params.items():
-                    grp_plug_name = safe_plug_name(param_label)
-                    if group_box.getChild(grp_plug_name):
-                        grp_plug = group_box[grp_plug_name]
-                        try:
-                            grp_plug.setValue(process_values(value))
-                            print(f"🔧 Set {group_box.getName()}.{grp_plug_name} = {value} => {value}")
-                        except Exception as e:
-                            print(f"❌ Failed to set {group_box.getName()}.{grp_plug_name}, value={value}:\n {e}")
-                    else:
-                        print(f"⚠️ Could not resolve param '{param_label}' for group type '{group_name}'")
-                        continue
-                    
-                groups.append(groupAssignment)
-            
-            
-        else:
-            shader = GafferCycles.CyclesShader(safe_name)
-            shader.loadShader(shader_type)
-            shader.shaderType = shader_type
-            mat_box.addChild(shader)
-            created_nodes[node_name] = safe_name
-            set_shader_parameters(shader, params, shader_type)
-
-    ### LINKS HANDLING ###
-    shaderAssignments:list = []
-    for link in links:
-        #print("📦 Raw link:", link)
-        if not isinstance(link, dict):
-            continue
-
-        from_node = link["from_node"]
-        to_node = link["to_node"]
-        from_socket = link["from_socket"]
-        to_socket = link["to_socket"]
-        
-
-        # Safety
-        if from_node == output_node_name or from_node == group_output_node_name: # Gaffer has no Output Node.
-            continue
-
-        # Group I/O
-        if from_node == group_input_node_name:
-            dst_node = mat_box[created_nodes[to_node]]
-            dst_shader_type = dst_node['name'].getValue()
-            dst_plug_name = resolve_plug_name(to_socket, dst_node, io="parameters", shader_type=dst_shader_type, isBox=False)            
-            boxInPlug = Gaffer.BoxIO.promote( dst_node["parameters"][dst_plug_name] )
-            groupInput = dst_node["parameters"][dst_plug_name].getInput().node()
-            groupInput["name"].setValue(safe_plug_name(from_socket))
-        if to_node == group_output_node_name:
-            src_node = mat_box[created_nodes[from_node]]
-            src_shader_type = src_node['name'].getValue()            
-            src_plug_name = resolve_plug_name(from_socket, src_node, io="out", shader_type=src_shader_type, isBox=False)
-            boxOutPlug = Gaffer.BoxIO.promote(src_node['out'][src_plug_name])
-            # Change plug name
-            boxOutPlug.getInput().parent()["name"].setValue(safe_plug_name(to_socket))
-
-        # If From node is Texture Coordinates using the "Generated" Output use the baked attribute instead.
-        if mat_box.getChild(created_nodes[from_node]):
-            src_node = mat_box.getChild(created_nodes[from_node])
-            src_shader_type = src_node['name'].getValue()
-            if src_shader_type == 'texture_coordinate':
-                nm = created_nodes[from_node]+'_Generated'
-                shader = GafferCycles.CyclesShader(nm)
-                shader.loadShader('attribute')
-                mat_box.addChild(shader)
-                created_nodes[nm] = nm
-                shader['parameters']['attribute'].setValue('baked_texturespace')
-
-                from_node = nm
-                from_socket = 'vector'
-
-
-        # Material ShaderAssignments
-        if to_node == output_node_name:   # We replace the output node with a Shader Assignment.
-            final_shader = created_nodes.get(from_node)
-            if final_shader:
-                sh_assign = GafferScene.ShaderAssignment(f"ShaderAssign_{to_socket}")
-                mat_box.addChild(sh_assign)
-                # check if displacement has a Displacement node before, if not set it to it
-                sh_assign["shader"].setInput(mat_box[final_shader]["out"])
-                if to_socket.lower() == "displacement":
-                    if not mat_box[final_shader]['name'].getValue() == "displacement":
-                        displace_shader = GafferCycles.CyclesShader("output_surface_displacement")
-                        displace_shader.loadShader("displacement")
-                        mat_box.addChild(displace_shader)
-                        sh_assign["shader"].setInput(displace_shader['out']['displacement'])
-                        safe_connect(mat_box, created_nodes[from_node], from_socket, "output_surface_displacement", "height")
-
-                # Expose filter
-                if not mat_box.getChild('filter_in'):
-                    boxFilterPlug = Gaffer.BoxIO.promote(sh_assign["filter"])
-                    boxFilterPlug.outputs()[0].parent().setName("filter_in")
-                else:
-                    sh_assign['filter'].setInput(mat_box['filter_in']['out'])
-                # Collect Assignemt to have surface, displacement and volume in one collection to parse, order and connect later
-                shaderAssignments.append(sh_assign)
-                print(f"🎯 Created ShaderAssignment and connected final shader {final_shader}")
-            continue
-        
-        # connect input and outputs for this node
-        if from_node in created_nodes and to_node in created_nodes:
-            safe_connect(mat_box, created_nodes[from_node], from_socket, created_nodes[to_node], to_socket)
-        
-    # return remap data
-    if isGroup:
-        groupAssignment = {
-            "group":mat_box.getName(),
-            "socketmap": material["socket_map"]
-        }
-        return groupAssignment
-    else:        
-        # rename group sockets from their unique identifiers after all has been connected in the tree containing the group.
-        if len(groups)>0:
-            for grp in groups:
-                for identifier, name in grp["socketmap"].items():              
-                    mat_box[grp["group"]][safe_plug_name(identifier)].setName(sanitize_name(name))
-    
-    return shaderAssignments
-
-def load_group_network(group_box, group):
-    groupAssignment = create_material_network(group_box, group, isGroup=True) # Create the Network
-    return groupAssignment
-
 #### GET THE MATERIALS INTO THE GAFFER SCENE ####
-def process_materials(material_data:dict, parent):
+def process_materials(plan_materials:list, parent):
     #Add Master Box
     materials_box = Gaffer.Box("Materials")
     parent.addChild(materials_box)
@@ -1049,59 +456,48 @@ def process_materials(material_data:dict, parent):
     # Assign a start value to last_mat_box
     last_mat_box = fallback_box
 
-    for mat_name, material in material_data.items():
-        mat_name = sanitize_name(mat_name)
+    for material in plan_materials:
+        mat_name = material["name"]
+        network = material["network"]
         print(f"\n🧱 Loading material: {mat_name}")
         mat_box = Gaffer.Box(mat_name)
         materials_box.addChild(mat_box)
-        
-        shaderAssignments = create_material_network(mat_box, material) # Create the Network
 
-        if isinstance(shaderAssignments,str) and shaderAssignments=="NOLINKS":
+        if network["empty"]:
             print(f"Material {mat_name} does not have a valid Network, probably has 0 connections.")
             Gaffer.Metadata.registerValue( mat_box, 'annotation:user:text', 'EMPTY MATERIAL\n' )
             Gaffer.Metadata.registerValue( mat_box, 'nodeGadget:color', imath.Color3f( 1, 0, 0 ) )
             continue
 
-        if isinstance(shaderAssignments,list):
+        # The assignments come sorted in the Blender order (surface, volume, displacement)
+        shaderAssignments = apply_network(mat_box, network) # Create the Network
+
         # Promote boxIn/out to connect the material output shaders internally with the box flow
-            def sort_by_role(nodes):
-                order = ['ShaderAssign_Surface', 'ShaderAssign_Volume', 'ShaderAssign_Displacement']
-                order_map = {k: i for i, k in enumerate(order)}
-                def sort_key(node):
-                    name = node.getName()
-                    for k in order:
-                        if k in name:
-                            return order_map[k]
-                    return len(order)  # fallback if no keyword matches
-                return sorted(nodes, key=sort_key)
-            
-            shaderAssignments = sort_by_role(shaderAssignments) # Reorder the list to have the Blender order
-            if len(shaderAssignments)==1:
-                boxInOutHandling(shaderAssignments[0])        
-            elif len(shaderAssignments)==2:
-                shaderAssignments[1]['in'].setInput(shaderAssignments[0]['out'])
-                boxInOutHandling(shaderAssignments[0],shaderAssignments[1])
-            else:
-                shaderAssignments[1]['in'].setInput(shaderAssignments[0]['out'])
-                shaderAssignments[2]['in'].setInput(shaderAssignments[1]['out'])
-                boxInOutHandling(shaderAssignments[0],shaderAssignments[2])
+        if len(shaderAssignments)==1:
+            boxInOutHandling(shaderAssignments[0])
+        elif len(shaderAssignments)==2:
+            shaderAssignments[1]['in'].setInput(shaderAssignments[0]['out'])
+            boxInOutHandling(shaderAssignments[0],shaderAssignments[1])
+        elif len(shaderAssignments)>2:
+            shaderAssignments[1]['in'].setInput(shaderAssignments[0]['out'])
+            shaderAssignments[2]['in'].setInput(shaderAssignments[1]['out'])
+            boxInOutHandling(shaderAssignments[0],shaderAssignments[2])
+
+        if not mat_box.getChild("out"):
+            print(f"Material {mat_name} has no output shader.")
+            continue
 
         # Connect in/out for box chaining
         mat_box["in"].setInput(last_out)
         last_out = mat_box["out"]
+        last_mat_box = mat_box
         # Connect the filter node
         mat_filter = GafferScene.PathFilter("PF_"+mat_name)
         materials_box.addChild( mat_filter )
         mat_box['filter'].setInput(mat_filter['out'])
 
-    
-    #Handle InOut for master box
-    if mat_box.getChild("out"):
-        boxInOutHandling(fallback_box, mat_box)
-        last_mat_box = mat_box
-    else:
-        boxInOutHandling(fallback_box, last_mat_box)
+    #Handle InOut for master box, the chain ends at the last material with an output
+    boxInOutHandling(fallback_box, last_mat_box)
     
     return materials_box
 
@@ -1144,17 +540,47 @@ def insertPrimitiveVariables(materials_box, varName="uniqueobj"):
 
     return pv
 
-def buildMatSplitNetwork(parentBox, objName, data_dict:dict, existingInput):
-    lastOutput = None
-    firstInput = None
-    new_paths = {}
 
-    objPath = data_dict["path"]
-    matByIndex = data_dict["mat_by_index"]
-    # Handle Mat Duplication.
-    values = list(matByIndex.values())        
-    duplicates = set([v for v in values if values.count(v) > 1]) # Using a set to find duplicates
-    
+def insertTexSpaceVariables(materials_box, texspace_plan:list):
+    # TRANSFORM texture space mode: add the texspace_scale and texspace_offset constant primvars read by
+    # the Generated coordinates network. One PrimitiveVariables node per unique texture space.
+    texspace_box = Gaffer.Box("TexSpaceVariables")
+    materials_box.parent().addChild(texspace_box)
+    first_input = None
+    last_output = None
+    for i, texspace in enumerate(texspace_plan):
+        pf = GafferScene.PathFilter(f"TexSpace_Filter{i}")
+        pf["paths"].setValue(IECore.StringVectorData(texspace["paths"]))
+        texspace_box.addChild(pf)
+
+        pv = GafferScene.PrimitiveVariables(f"TexSpace{i}")
+        texspace_box.addChild(pv)
+        for varName, value in (("texspace_scale", texspace["scale"]), ("texspace_offset", texspace["offset"])):
+            pv["primitiveVariables"].addChild(
+                Gaffer.NameValuePlug(varName, Gaffer.V3fPlug("value", Gaffer.Plug.Direction.In, imath.V3f(*value)), True, varName + "Plug")
+            )
+        pv["filter"].setInput(pf["out"])
+
+        if last_output:
+            pv["in"].setInput(last_output)
+        else:
+            first_input = pv["in"]
+        last_output = pv["out"]
+
+    boxInOutHandling(first_input.parent(), last_output.parent())
+
+    # insert the box in front of the materials
+    existingInput = materials_box["in"].getInput()
+    if existingInput is not None:
+        texspace_box["in"].setInput(existingInput)
+    materials_box["in"].setInput(texspace_box["out"])
+
+    return texspace_box
+
+def buildMatSplitNetwork(parentBox, split:dict):
+    objName = split["object"]
+    objPath = split["path"]
+
     # Make a Box to contain the split network
     objBox = Gaffer.Box()
     objBox.setName(objName + "_MatSplitBox")
@@ -1169,10 +595,7 @@ def buildMatSplitNetwork(parentBox, objName, data_dict:dict, existingInput):
     # MeshSplit
     ms = GafferScene.MeshSplit()
     ms.setName(objName + "_MeshSplit")
-    if firstInput and lastOutput:
-        ms["in"].setInput(lastOutput)
-    else:
-        firstInput = ms["in"]
+    firstInput = ms["in"]
     ms["filter"].setInput(pf["out"])
     ms["segment"].setValue("mat_index")
     objBox.addChild(ms)
@@ -1181,12 +604,8 @@ def buildMatSplitNetwork(parentBox, objName, data_dict:dict, existingInput):
 
     # After the split, we’ll get new children per material index.
     # To rename them, use a SceneRename node with expressions.
-    # If a Material Name appears more than once we mark a suffix for correct processing
-    for idx, matName in matByIndex.items():
-        hasdupl = False
-        if matName in duplicates:
-            hasdupl = True
-        matName = sanitize_name(matName)
+    for child in split["children"]:
+        matName = child["material"]
         rn = GafferScene.Rename()
         rn.setName(f"{objName}_{matName}_Rename")
         rn["in"].setInput(lastOutput)
@@ -1195,50 +614,22 @@ def buildMatSplitNetwork(parentBox, objName, data_dict:dict, existingInput):
         # PathFilter for the split child
         childFilter = GafferScene.PathFilter()
         childFilter.setName(f"{objName}_{matName}_Filter")
-        # This assumes MeshSplit names children "0", "1", "2"...
-        childPath = objPath + "/" + idx
-        childFilter["paths"].setValue(IECore.StringVectorData([childPath]))
+        childFilter["paths"].setValue(IECore.StringVectorData([child["child_path"]]))
         objBox.addChild(childFilter)
         rn["filter"].setInput(childFilter["out"])
 
         # RENAME
-        new_name = objName + "_" + matName
-        if hasdupl:
-            new_name = new_name + "_duplMat_" + idx
-        new_path = objPath + "/" + new_name
-        rn["name"].setValue(new_name)
-
-        # Save the Data.
-        new_paths.update({new_path : matName})
+        rn["name"].setValue(child["name"])
 
         lastOutput = rn["out"]
 
     # Finally connect last rename out to the Box out
     boxInOutHandling(firstInput.parent(), lastOutput.parent())
 
-    returndict:dict = {
-        "object_box" : objBox,
-        "data" : new_paths
-    }
-
-    return returndict
-
-def assign_material(materials_box, materialname, hierarchy_path, objName):
-    try:
-        print(f"Path: {hierarchy_path} ::: Material: {materialname}")
-        material_node = materials_box[materialname]
-        filter_node = material_node['filter'].getInput().parent()
-        filter_paths = filter_node["paths"].getValue()
-        new_filter_paths = IECore.StringVectorData( filter_paths )
-        new_filter_paths.append( hierarchy_path )
-        filter_node["paths"].setValue( new_filter_paths )
-
-    except Exception as e:
-        print(f"💀 Failed to Assign {materialname} to {objName} on the path {hierarchy_path}:\n {e}")
-
+    return objBox
 
 #### ASSIGN THE CREATED MATERIALS TO MESHES ####
-def assign_materials(materials_box, assignment_data:dict, split_geo=True):
+def assign_materials(materials_box, assignments_plan:dict, set_filters=True):
     matbox_input = materials_box['in'].getInput()
     # setup meshSplits
     splits_box = Gaffer.Box()
@@ -1248,39 +639,27 @@ def assign_materials(materials_box, assignment_data:dict, split_geo=True):
     last_output = None
     processedSceneNode = None
 
-    for k, v in assignment_data.items():
-        objName = sanitize_name(k)
-        path = v["path"]
-        # Split into components and sanitise each
-        components = path.split("/")
-        sanitised = [sanitize_name(c) for c in components if c]
-        # Rebuild into a valid Gaffer-style path
-        gafferPath = "/" + "/".join(sanitised)
+    for split in assignments_plan["splits"]:
         try:
-            materialname = sanitize_name(next(iter(v["mat_by_index"].values()), None)) # get the first value no matter the key
-            # materialname = sanitize_name(v["mat_by_index"]["0"])
-            multimat = v["has_multiple_mat"]
-            v["path"] = gafferPath
-            if multimat and split_geo:
-                # split geometry
-                try:
-                    splitter_data = buildMatSplitNetwork(splits_box, objName, v, matbox_input)
-                    split_box = splitter_data["object_box"]
-                    if last_output:
-                        split_box['in'].setInput(last_output)
-                    last_output = split_box['out']
-                    if not first_input:
-                        first_input = split_box['in']
-                    for new_child_path, material_name in splitter_data["data"].items():
-                        assign_material(materials_box, material_name, new_child_path, objName)
-                except Exception as e:
-                    print(f"👻 Failed to Split {objName}:\n {e}")
-
-            else:
-                assign_material(materials_box, materialname, gafferPath, objName)
+            split_box = buildMatSplitNetwork(splits_box, split)
+            if last_output:
+                split_box['in'].setInput(last_output)
+            last_output = split_box['out']
+            if not first_input:
+                first_input = split_box['in']
         except Exception as e:
-            print(f"💀 Failed to Assign Material to {objName}:\n {e}")
+            print(f"👻 Failed to Split {split['object']}:\n {e}")
 
+    # The paths of every material are set at once
+    for materialname, paths in assignments_plan["filters"].items():
+        if not paths or not set_filters:
+            continue
+        try:
+            print(f"Paths: {len(paths)} ::: Material: {materialname}")
+            filter_node = materials_box[materialname]['filter'].getInput().parent()
+            filter_node["paths"].setValue( IECore.StringVectorData( paths ) )
+        except Exception as e:
+            print(f"💀 Failed to Assign {materialname} to {len(paths)} paths:\n {e}")
 
     if first_input:
         boxInOutHandling(first_input.parent(), last_output.parent())
@@ -1326,25 +705,93 @@ def create_CachedMesh(materials_box:Gaffer.Node, inputNode:Gaffer.Node):
     switch['index'].setValue(1)
 
 
-# --- Main material loader ---
-def load_materials_from_json(json_path, parent, usd_reader_node, split_submeshes=True, cache_meshes=True):
-    with open(json_path, "r") as f:
-        data = json.load(f)
-
-    material_data = data["materials"]
-    assignment_data = data["hierarchy"]
-    # paths = [f"/{mat}" for mat in material_data.keys()]
-    materials_box = process_materials(material_data, parent)
-    if materials_box:
-        if usd_reader_node:
-            materials_box["in"].setInput(usd_reader_node["out"])
-            pv:Gaffer.Node = insertPrimitiveVariables(materials_box)
-            processedSceneNode:Gaffer.Node|None = assign_materials(materials_box, assignment_data, split_submeshes)
-            if processedSceneNode and cache_meshes:
-               create_CachedMesh(materials_box, processedSceneNode) 
+def store_materials_reference(materials_box, import_cache, cache_key):
+    # Exports the built Materials box to the import cache, a failed export only costs the next import a rebuild.
+    temp_path = None
+    try:
+        temp_path = import_cache.temp_path(cache_key)
+        materials_box.exportForReference(temp_path)
+        print(f"📦 Cached materials: {import_cache.store(cache_key, temp_path)}")
+    except Exception as e:
+        print(f"⚠️ Could not cache the materials: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
 
+def load_cached_materials(cached_reference, staging):
+    # The cached file is executed into a regular Box, the same editable Materials box a fresh import builds.
+    # Nothing in the script points at the cache, so evicting the file never breaks a saved script.
+    materials_box = Gaffer.Box("Materials")
+    staging.addChild(materials_box)
+    staging.executeFile(cached_reference, parent=materials_box, continueOnError=False)
     return materials_box
 
+# --- Main material loader ---
+def load_materials_from_json(json_path, parent, usd_reader_node, split_submeshes=True, cache_meshes=True, use_import_cache=True):
+    global GROUP_SERIALISATIONS
+    data = load_gcyc(json_path)
+
+    # Report missing or changed textures before any network is built
+    manifest = load_texture_manifest(manifest_path_for(json_path))
+    if manifest is not None:
+        report_texture_problems(manifest, check_texture_manifest(manifest))
+
+    # A Materials box already built from the same .gcyc and options is loaded from the import cache
+    import_cache = ImportCache() if use_import_cache else None
+    cache_key = None
+    cached_reference = None
+    if import_cache is not None:
+        cache_key = import_cache.key(json_path, {
+            "split_submeshes": split_submeshes,
+            "process_image_seq": PROCESS_IMAGE_SEQ,
+            "assigned": usd_reader_node is not None,
+            "gaffer": Gaffer.About.versionString()
+        })
+        cached_reference = import_cache.get(cache_key)
+
+    # Everything that does not need Gaffer is decided by the planner, the rest of this file only executes the plan.
+    # On a cache hit the networks are in the cached file, only the splits and assignments are planned.
+    start = time.perf_counter()
+    loaded_prototypes = len(SHADER_PROTOTYPES)
+    plan = plan_scene(data, GafferCyclesSchema(), PROCESS_IMAGE_SEQ, split_submeshes, plan_networks=not cached_reference)
+    planned = time.perf_counter()
+    for warning in plan["warnings"]:
+        print(warning)
+
+    GROUP_SERIALISATIONS = {}
+    # The networks are built in a staging script no editor is watching, so adding, connecting and setting
+    # thousands of plugs does not signal the open GraphEditor/NodeEditor. They are moved into the Blender box
+    # at once when done, the scene reader is only connected after the move.
+    staging = Gaffer.ScriptNode("CyclesImportStaging")
+
+    if cached_reference:
+        print(f"📦 Loading cached materials: {cached_reference}")
+        materials_box = load_cached_materials(cached_reference, staging)
+    else:
+        materials_box = process_materials(plan["materials"], staging)
+    processedSceneNode:Gaffer.Node|None = None
+    pv:Gaffer.Node|None = None
+    if usd_reader_node:
+        pv = insertPrimitiveVariables(materials_box)
+        if plan["texspace_variables"]:
+            insertTexSpaceVariables(materials_box, plan["texspace_variables"])
+        # the filters of a cached box already have their paths
+        processedSceneNode = assign_materials(materials_box, plan["assignments"], set_filters=not cached_reference)
+    if import_cache is not None and not cached_reference:
+        store_materials_reference(materials_box, import_cache, cache_key)
+    built = time.perf_counter()
+
+    with Gaffer.DirtyPropagationScope():
+        for node in list(staging.children(Gaffer.Node)):
+            parent.addChild(node)
+        if pv is not None:
+            pv["in"].setInput(usd_reader_node["out"])
+    print(f"⏱️ {len(plan['materials'])} materials planned in {planned - start:.2f}s, built in {built - planned:.2f}s, "
+          f"added in {time.perf_counter() - built:.2f}s ({len(SHADER_PROTOTYPES) - loaded_prototypes} shader types loaded, {len(SHADER_PROTOTYPES)} cached)")
+
+    if processedSceneNode and cache_meshes:
+        create_CachedMesh(materials_box, processedSceneNode)
+
+    return materials_box
 
 
 
@@ -1353,11 +800,19 @@ def load_materials_from_json(json_path, parent, usd_reader_node, split_submeshes
 ##############################
 # This is called from the box node
 def create_networks(blenderScene_box):
+    # The whole import is a single undo entry
+    start = time.perf_counter()
+    with Gaffer.UndoScope(blenderScene_box.scriptNode()):
+        import_cycles_scene(blenderScene_box)
+    print(f"⏱️ Cycles scene imported in {time.perf_counter() - start:.2f}s")
+
+def import_cycles_scene(blenderScene_box):
     global PROCESS_IMAGE_SEQ
     file_reader = None
     materials_box = None
     split_submeshes = blenderScene_box['splitSubMeshes'].getValue()
     cache_meshes = blenderScene_box['cacheSubmeshes'].getValue()
+    use_import_cache = blenderScene_box['useImportCache'].getValue() if blenderScene_box.getChild('useImportCache') else True
     PROCESS_IMAGE_SEQ = blenderScene_box['processImgSequences'].getValue()
     filepath:Path = Path(blenderScene_box['fileName'].getValue())
     usd_path:Path = filepath
@@ -1377,7 +832,7 @@ def create_networks(blenderScene_box):
     
     json_path = usd_path.with_suffix(".gcyc")
     if json_path.exists():
-        materials_box = load_materials_from_json(json_path, blenderScene_box, file_reader, split_submeshes, cache_meshes)        
+        materials_box = load_materials_from_json(json_path, blenderScene_box, file_reader, split_submeshes, cache_meshes, use_import_cache)        
 
 
     if materials_box:
@@ -1392,6 +847,8 @@ def create_networks(blenderScene_box):
         blenderScene_box.removeChild(blenderScene_box['splitSubMeshes'])
         blenderScene_box.removeChild(blenderScene_box['cacheSubmeshes'])
         blenderScene_box.removeChild(blenderScene_box['processImgSequences'])
+        if blenderScene_box.getChild('useImportCache'):
+            blenderScene_box.removeChild(blenderScene_box['useImportCache'])
 
         ## Add Cache Control
         if blenderScene_box.getChild("MeshSplits") and cache_meshes:
@@ -1483,4 +940,4 @@ find_loc_material( blenderBox )
 
 
 # TO DO
-# handle xform in texture coordinates input node on object mode
\ No newline at end of file
+# handle xform in texture coordinates input node on object mode
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+
+
+#########################################
+#-------------IMPORT CACHE--------------#
+#########################################
+# Materials boxes already built from a .gcyc, exported as Gaffer reference files and keyed on the
+# content of the .gcyc, the importer version and the import options. Plain python, the Gaffer side
+# (exportForReference / executeFile into a new Box) lives in import_Cycles_materials_to_Gaffer.py.
+# The files are only a build speed-up: they are copied into the script on import, never referenced,
+# so they can be evicted at any time.
+
+# Bump when the importer builds different networks so old references are ignored.
+IMPORT_CACHE_VERSION = 1
+IMPORT_CACHE_SUFFIX = ".grf"
+
+# Overridable per site or per user
+DEFAULT_CACHE_DIR = os.environ.get(
+    "MH_CYCLES_IMPORT_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "MagicHammer", "cycles_import")
+)
+DEFAULT_CACHE_MB = int(os.environ.get("MH_CYCLES_IMPORT_CACHE_MB", 2048))
+
+
+def version_prefix():
+    return f"v{IMPORT_CACHE_VERSION}-"
+
+
+class ImportCache:
+    # Size bounded LRU of reference files, the modification time of a file is its last use.
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_CACHE_MB * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, gcyc_path, options:dict):
+        # "v<IMPORT_CACHE_VERSION>-" + sha1 of the .gcyc content, the importer version and the options the
+        # networks depend on. The version prefix lets evict drop the references of other versions.
+        digest = hashlib.sha1()
+        digest.update(json.dumps({"version": IMPORT_CACHE_VERSION, "options": options}, sort_keys=True).encode("utf-8"))
+        with open(gcyc_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return version_prefix() + digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + IMPORT_CACHE_SUFFIX)
+
+    def get(self, key):
+        # Path of the cached reference or None, a hit marks the file as the most recently used.
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def temp_path(self, key):
+        # Where to write a new reference before it is stored, so an interrupted export is never loaded.
+        os.makedirs(self.directory, exist_ok=True)
+        return self.path(key) + f".{os.getpid()}.tmp"
+
+    def store(self, key, temp_path):
+        path = self.path(key)
+        os.replace(temp_path, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        # Removes the references of other cache versions, then the least recently used ones until the
+        # cache fits in max_bytes.
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(IMPORT_CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            if not name.startswith(version_prefix()):
+                try:
+                    os.remove(path)
+                    print(f"🧹 Evicted outdated cached import {name}")
+                except OSError:
+                    pass
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                print(f"🧹 Evicted cached import {os.path.basename(path)}")
+            except OSError:
+                pass
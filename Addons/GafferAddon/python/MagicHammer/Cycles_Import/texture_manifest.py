@@ -0,0 +1,147 @@
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+#########################################
+#-----------TEXTURE MANIFEST------------#
+#########################################
+# Checks the texture manifest written next to the .gcyc by the Blender exporter
+# (BlenderAddon/functions/Blender_Texture_Manifest.py) against the files on disk.
+# Plain python, no Gaffer import, it can also run as a farm pre-flight:
+#     python texture_manifest.py scene.gcyc.textures.json
+TEXTURE_MANIFEST_VERSION = 2
+TEXTURE_MANIFEST_SUFFIX = ".textures.json"
+
+FRAME_TOKEN = re.compile(r"#+|<UDIM>")
+
+
+def manifest_path_for(gcyc_path):
+    return str(gcyc_path) + TEXTURE_MANIFEST_SUFFIX
+
+
+def load_texture_manifest(path):
+    # None when there is no manifest or it was written by another version
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != TEXTURE_MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def find_frames(pattern, listings):
+    # frame -> path of the files on disk matching a '#' padded (or UDIM) pattern, folder listings shared between textures.
+    folder, filename = os.path.split(pattern)
+    token = FRAME_TOKEN.search(filename)
+    if token is None:
+        return {}
+    if folder not in listings:
+        try:
+            listings[folder] = os.listdir(folder)
+        except OSError:
+            listings[folder] = []
+    digits = r"\d{4,}" if token.group(0) == "<UDIM>" else r"\d{%d,}" % len(token.group(0))
+    matcher = re.compile(re.escape(filename[:token.start()]) + f"({digits})" + re.escape(filename[token.end():]) + "$")
+    frames = {}
+    for name in listings[folder]:
+        match = matcher.match(name)
+        if match:
+            frames[int(match.group(1))] = os.path.join(folder, name)
+    return frames
+
+
+def from_ranges(ranges):
+    # [[1, 3], [7, 8]] -> {1, 2, 3, 7, 8}
+    return {frame for first, last in ranges for frame in range(first, last + 1)}
+
+
+def describe_frames(frames, limit=5):
+    # 1, 2, 3, 7 -> "1-3, 7"
+    ranges = []
+    for frame in sorted(frames):
+        if ranges and frame == ranges[-1][1] + 1:
+            ranges[-1][1] = frame
+        else:
+            ranges.append([frame, frame])
+    text = ", ".join(str(first) if first == last else f"{first}-{last}" for first, last in ranges[:limit])
+    return text + (", ..." if len(ranges) > limit else "")
+
+
+def check_sequence(entry, listings):
+    sequence = entry["sequence"]
+    found = find_frames(entry["path"], listings)
+    if not found:
+        return "missing"
+
+    problems = []
+    recorded = from_ranges(sequence["frames"])
+    missing = recorded - found.keys()
+    added = found.keys() - recorded
+    if missing:
+        problems.append(f"{len(missing)} frames missing ({describe_frames(missing)})")
+    if added:
+        problems.append(f"{len(added)} frames added ({describe_frames(added)})")
+
+    changed = []
+    for frame, (size, mtime) in sequence.get("files", {}).items():
+        frame = int(frame)
+        if frame not in found:
+            continue
+        try:
+            st = os.stat(found[frame])
+        except OSError:
+            # removed since the listing
+            changed.append(frame)
+            continue
+        if st.st_size != size or st.st_mtime != mtime:
+            changed.append(frame)
+    if changed:
+        problems.append(f"{len(changed)} frames changed since export ({describe_frames(changed)})")
+    return ", ".join(problems) or None
+
+
+def check_texture(entry, listings):
+    # Returns None when the texture is still as exported, otherwise the problem.
+    if not entry["exists"]:
+        return "missing at export"
+    if "sequence" in entry:
+        return check_sequence(entry, listings)
+    try:
+        st = os.stat(entry["path"])
+    except OSError:
+        return "missing"
+    if st.st_size != entry["size"] or st.st_mtime != entry["mtime"]:
+        return "changed since export"
+    return None
+
+
+def check_texture_manifest(manifest, jobs=None):
+    # image_id -> problem for every texture that is missing or changed since the export.
+    # Stats run in a thread pool, which keeps it fast on network storage.
+    textures = manifest["textures"]
+    listings = {}
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        problems = pool.map(lambda entry: check_texture(entry, listings), textures.values())
+        return {image_id: problem for image_id, problem in zip(textures.keys(), problems) if problem is not None}
+
+
+def report_texture_problems(manifest, problems):
+    for image_id, problem in problems.items():
+        print(f"⚠️ Texture {image_id} ({manifest['textures'][image_id]['path']}): {problem}")
+    if problems:
+        print(f"⚠️ {len(problems)} of {len(manifest['textures'])} textures missing or changed")
+
+
+if __name__ == "__main__":
+    manifest = load_texture_manifest(sys.argv[1])
+    if manifest is None:
+        print(f"No valid texture manifest at {sys.argv[1]}")
+        sys.exit(2)
+    problems = check_texture_manifest(manifest)
+    report_texture_problems(manifest, problems)
+    sys.exit(1 if problems else 0)
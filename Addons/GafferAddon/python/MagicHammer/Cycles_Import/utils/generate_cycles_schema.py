@@ -0,0 +1,72 @@
+# generate_cycles_schema.py
+# Writes the Cycles schema bundled with the Blender addon, used by the exporter to write
+# already resolved plug names (see BlenderAddon/functions/Blender_Cycles_Schema.py).
+# The same file can be passed to build_plan.py to plan an import outside of Gaffer.
+# Run it again after changing LABEL_MAP / SHADER_TYPE_REMAP or updating Gaffer:
+#
+#     gaffer python generate_cycles_schema.py [output.json]
+
+import os
+import sys
+import json
+import Gaffer
+import GafferCycles
+
+from MagicHammer.Cycles_Import.cycles_names import LABEL_MAP, SHADER_TYPE_REMAP
+
+CYCLES_SCHEMA_VERSION = 1
+
+# Next to the Blender exporter in this repository
+DEFAULT_OUTPUT = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "..", "BlenderAddon", "functions", "cycles_schema.json"
+))
+
+
+def plug_types(plug):
+    return {child.getName(): child.typeName() for child in plug.children()}
+
+
+def plug_presets(plug):
+    # presetValues of the plugs that have them, the image colorspaces for instance
+    presets = {}
+    for child in plug.children():
+        values = Gaffer.Metadata.value(child, "presetValues")
+        if values:
+            presets[child.getName()] = list(values)
+    return presets
+
+
+def build_schema():
+    shaders = {}
+    presets = {}
+    for shader_name in sorted(GafferCycles.shaders.keys()):
+        shader = GafferCycles.CyclesShader(shader_name)
+        try:
+            shader.loadShader(shader_name)
+        except Exception as e:
+            print(f"⚠️ Could not load shader {shader_name}: {e}")
+            continue
+        shaders[shader_name] = {
+            "parameters": plug_types(shader["parameters"]),
+            "out": plug_types(shader["out"])
+        }
+        shader_presets = plug_presets(shader["parameters"])
+        if shader_presets:
+            presets[shader_name] = shader_presets
+
+    return {
+        "version": CYCLES_SCHEMA_VERSION,
+        "shaders": shaders,
+        "presets": presets,
+        "label_map": LABEL_MAP,
+        "shader_type_remap": SHADER_TYPE_REMAP
+    }
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT
+    schema = build_schema()
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2, sort_keys=True)
+
+    print(f"✅ Saved schema of {len(schema['shaders'])} shaders to: {output_path}")
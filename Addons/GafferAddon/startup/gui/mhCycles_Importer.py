@@ -30,6 +30,9 @@ def setup_box(node, code, code2):
 	mainShaderbox.addChild(
 		Gaffer.BoolPlug( "processImgSequences", defaultValue = True, flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
 	)
+	mainShaderbox.addChild(
+		Gaffer.BoolPlug( "useImportCache", defaultValue = True, flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+	)
 
 	# ---------- Metadata ----------
 	Gaffer.Metadata.registerValue( mainShaderbox, 'uiEditor:emptySections', IECore.StringVectorData( [  ] ) )
@@ -73,6 +76,14 @@ def setup_box(node, code, code2):
 	"an expresion is set to deal with image sequences options like, frame_start, offset, duration and cyclic, otherwise sequences will load the frame playhead is currently at." )
 	Gaffer.Metadata.registerValue( mainShaderbox["processImgSequences"], "layout:index", 3 )
 
+	## Import Cache checkbox
+	Gaffer.Metadata.registerValue( mainShaderbox["useImportCache"], "nodule:type", "" )
+	Gaffer.Metadata.registerValue( mainShaderbox["useImportCache"], "layout:section", "Settings" )
+	Gaffer.Metadata.registerValue( mainShaderbox["useImportCache"], "label", "Use Import Cache" )
+	Gaffer.Metadata.registerValue( mainShaderbox["useImportCache"], "description", "If enabled, " \
+	"the built materials are saved in the import cache ($MH_CYCLES_IMPORT_CACHE), importing the same .gcyc with the same options again copies them from there instead of rebuilding. The script never depends on the cache." )
+	Gaffer.Metadata.registerValue( mainShaderbox["useImportCache"], "layout:index", 4 )
+
 	## Button ##
 	Gaffer.Metadata.registerValue( mainShaderbox["updateList"], 'nodule:type', '' )
 	Gaffer.Metadata.registerValue( mainShaderbox["updateList"], 'layout:section', 'Settings' )
@@ -87,7 +98,7 @@ def setup_box(node, code, code2):
 		'It can also import only the materials by importing a .gcyc file thah has no .usd file with the same name in the same folder.'
 		)
 	Gaffer.Metadata.registerValue( mainShaderbox["updateList"], 'label', 'Import Cycles Scene' )
-	Gaffer.Metadata.registerValue( mainShaderbox["updateList"], 'layout:index', 4 )
+	Gaffer.Metadata.registerValue( mainShaderbox["updateList"], 'layout:index', 5 )
 	Gaffer.Metadata.registerValue( mainShaderbox["updateList"], 'layout:divider', True )
 
 
@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blender_stand_in import install
+from cycles_schema_stand_in import stand_in_schema, write_schema
+
+install()
+from MagicHammer.Cycles_Import.build_plan import plan_scene, plan_stats
+
+
+#########################################
+#---------BUILD PLAN BENCHMARK----------#
+#########################################
+# Plans a synthetic .gcyc against the stand-in schema, no Gaffer needed:
+#     python tests/benchmarks/bench_build_plan.py
+# and writes the scene and the schema for the build_plan command line with --write <directory>.
+MATERIAL_COUNT = 1000
+OBJECT_COUNT = 5000
+
+
+def link(from_node, from_socket, to_node, to_socket):
+    return {"from_node": from_node, "from_socket": from_socket, "to_node": to_node, "to_socket": to_socket}
+
+
+def build_material(index):
+    # Noise -> Principled base color (converter free), noise fac -> roughness through a math node,
+    # Generated coordinates -> noise vector and a float into the displacement output (displacement node added)
+    return {
+        "nodes": {
+            "Material Output": {"type": "ShaderNodeOutputMaterial"},
+            "Texture Coordinate": {"type": "ShaderNodeTexCoord", "cycles_type": "texture_coordinate", "params": {}},
+            "Noise Texture": {"type": "ShaderNodeTexNoise", "cycles_type": "noise_texture",
+                              "params": {"Scale": 5.0 + index, "Detail": 2.0, "noise_dimensions": "3D"}},
+            "Math": {"type": "ShaderNodeMath", "cycles_type": "math",
+                     "params": {"operation": "MULTIPLY", "Value_001": 0.5}},
+            "Principled BSDF": {"type": "ShaderNodeBsdfPrincipled", "cycles_type": "principled_bsdf",
+                                "params": {"Metallic": 0.0, "Weight": 1.0}}
+        },
+        "links": [
+            link("Texture Coordinate", "Generated", "Noise Texture", "Vector"),
+            link("Noise Texture", "Color", "Principled BSDF", "Base Color"),
+            link("Noise Texture", "Fac", "Math", "Value"),
+            link("Math", "Value", "Principled BSDF", "Roughness"),
+            link("Principled BSDF", "BSDF", "Material Output", "Surface"),
+            link("Math", "Value", "Material Output", "Displacement")
+        ]
+    }
+
+
+def build_scene(material_count=MATERIAL_COUNT, object_count=OBJECT_COUNT):
+    materials = {f"Material_{i:05d}": build_material(i) for i in range(material_count)}
+    hierarchy = {}
+    for i in range(object_count):
+        first, second = f"Material_{i % material_count:05d}", f"Material_{(i + 1) % material_count:05d}"
+        multiple = i % 4 == 0
+        hierarchy[f"Object_{i:06d}"] = {
+            "path": f"/root/Object_{i:06d}/Mesh_{i:06d}",
+            "mat_by_index": {"0": first, "1": second} if multiple else {"0": first},
+            "has_multiple_mat": multiple
+        }
+    return {"settings": {"texspace_mode": "ATTRIBUTE"}, "materials": materials, "groups": {}, "images": {}, "hierarchy": hierarchy}
+
+
+def run():
+    scene = build_scene()
+    schema = stand_in_schema()
+    start = time.perf_counter()
+    plan = plan_scene(scene, schema)
+    stats = plan_stats(plan)
+    stats["plan_s"] = round(time.perf_counter() - start, 4)
+    # import cache hit: only the splits, assignments and texture space variables
+    start = time.perf_counter()
+    plan_scene(scene, schema, plan_networks=False)
+    stats["cache_hit_plan_s"] = round(time.perf_counter() - start, 4)
+    return stats
+
+
+def write(directory):
+    # scene.gcyc and cycles_schema.json for python -m MagicHammer.Cycles_Import.build_plan
+    os.makedirs(directory, exist_ok=True)
+    gcyc_path = os.path.join(directory, "scene.gcyc")
+    schema_path = os.path.join(directory, "cycles_schema.json")
+    with open(gcyc_path, "w", encoding="utf-8") as f:
+        json.dump(build_scene(), f)
+    write_schema(schema_path)
+    return gcyc_path, schema_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--write":
+        print(*write(sys.argv[2]))
+    else:
+        print(run())
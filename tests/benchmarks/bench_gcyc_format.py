@@ -0,0 +1,106 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blender_stand_in import install
+
+install()
+from functions.Blender_Gcyc_Writer import open_gcyc_writer
+from MagicHammer.Cycles_Import.gcyc_format import load_gcyc
+
+
+#########################################
+#----------.gcyc FORMAT BENCHMARK-------#
+#########################################
+# File size and parse time of the three .gcyc encodings on a synthetic scene:
+#     python tests/benchmarks/bench_gcyc_format.py
+ENCODINGS = ("JSON", "JSON_COMPACT", "BINARY")
+MATERIAL_COUNT = 500
+NODES_PER_MATERIAL = 20
+OBJECT_COUNT = 5000
+
+
+def build_scene(seed=0, material_count=MATERIAL_COUNT, nodes_per_material=NODES_PER_MATERIAL, object_count=OBJECT_COUNT):
+    # Same sections and record shapes as the exporters write, names repeat like they do in a real scene.
+    rng = random.Random(seed)
+    materials = {}
+    for m in range(material_count):
+        nodes = {}
+        for n in range(nodes_per_material):
+            nodes[f"Math.{n:03d}"] = {
+                "type": "MATH",
+                "bl_idname": "ShaderNodeMath",
+                "location": [rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)],
+                "properties": {"operation": rng.choice(("ADD", "MULTIPLY", "POWER")), "use_clamp": rng.random() < 0.5},
+                "inputs": {"Value": rng.random(), "Value_001": rng.randint(-10, 10)}
+            }
+        links = [
+            {"from_node": f"Math.{n + 1:03d}", "from_socket": "Value", "to_node": f"Math.{n:03d}", "to_socket": "Value"}
+            for n in range(nodes_per_material - 1)
+        ]
+        materials[f"Material_{m:05d}"] = {"nodes": nodes, "links": links}
+
+    hierarchy = {}
+    for o in range(object_count):
+        name = f"Object_{o:06d}"
+        hierarchy[name] = {
+            "path": f"/root/set/building_{o % 50:02d}/{name}",
+            "type": "MESH",
+            "materials": [f"Material_{rng.randrange(material_count):05d}" for _ in range(rng.randint(1, 3))],
+            "mat_by_index": {0: f"Material_{rng.randrange(material_count):05d}"},
+            "visible": rng.random() < 0.9,
+            "parent": None
+        }
+
+    return {
+        "settings": {"version": 1, "scene": "Synthetic"},
+        "hierarchy": hierarchy,
+        "materials": materials,
+        "groups": {},
+        "images": {}
+    }
+
+
+def write_scene(filepath, scene, encoding):
+    with open_gcyc_writer(filepath, encoding) as writer:
+        for name, entries in scene.items():
+            writer.write_section(name, entries)
+
+
+def timed(function, *args, repeat=3):
+    # best of `repeat` runs
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run(scene=None):
+    scene = scene or build_scene()
+    expected = json.loads(json.dumps(scene))
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for encoding in ENCODINGS:
+            filepath = os.path.join(directory, f"scene_{encoding.lower()}.gcyc")
+            _, write_time = timed(write_scene, filepath, scene, encoding)
+            data, parse_time = timed(load_gcyc, filepath)
+            if data != expected:
+                raise AssertionError(f"{encoding} .gcyc does not read back the written scene")
+            results[encoding] = {
+                "bytes": os.path.getsize(filepath),
+                "write_s": round(write_time, 4),
+                "parse_s": round(parse_time, 4)
+            }
+    return results
+
+
+if __name__ == "__main__":
+    for encoding, result in run().items():
+        print(encoding, result)
@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blender_stand_in import install, build_chain, build_fan_in, Material, material_output
+
+install()
+from functions.Blender_Material_Crawler import MaterialExporter
+
+
+#########################################
+#------------WALK BENCHMARK-------------#
+#########################################
+# Stress benchmark of MaterialExporter.walk on the bpy stand-in, against the recursive walk it replaced:
+#     python tests/benchmarks/bench_material_walk.py
+CHAIN_DEPTH = 5000
+FAN_IN_WIDTH = 10000
+
+
+def recursive_walk(exporter, socket, material, visited, node_info, links):
+    # The walk before the explicit stack, one python frame per node of the chain.
+    for link in socket.links:
+        from_node = link.from_node
+        if from_node.name not in visited:
+            visited.add(from_node.name)
+            if not exporter.serialize_node(from_node, material, node_info):
+                return None
+            for input_socket in from_node.inputs:
+                if input_socket.is_linked:
+                    recursive_walk(exporter, input_socket, material, visited, node_info, links)
+        exporter.record_link(link, visited, links)
+    return "SUCCESS"
+
+
+class RecursiveMaterialExporter(MaterialExporter):
+    def walk(self, socket, material, visited, node_info, links):
+        return recursive_walk(self, socket, material, visited, node_info, links)
+
+
+def trace(material, exporter_class=MaterialExporter):
+    return exporter_class().trace_shader_network(material)[material.name]
+
+
+def build_random_graph(seed, node_count=60, link_count=150):
+    # Random DAG, links only go from higher to lower node indices so there are no cycles
+    rng = random.Random(seed)
+    material = Material(f"Random{seed}")
+    tree = material.node_tree
+    output = material_output(tree)
+    nodes = [tree.new_node(f"n{i}", inputs=[f"In{j}" for j in range(4)], outputs=("A", "B")) for i in range(node_count)]
+    tree.link(nodes[0].outputs[0], output.inputs[0])
+    tree.link(nodes[1].outputs[1], output.inputs[2])
+    for _ in range(link_count):
+        a, b = sorted(rng.sample(range(node_count), 2))
+        tree.link(rng.choice(nodes[b].outputs), rng.choice(nodes[a].inputs))
+    return material
+
+
+def timed(function, *args, repeat=3):
+    # best of `repeat` runs, None when the walk hit the recursion limit
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = function(*args)
+        except RecursionError:
+            return None, time.perf_counter() - start
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run():
+    results = {}
+    for label, material in (("chain", build_chain(CHAIN_DEPTH)), ("fan_in", build_fan_in(FAN_IN_WIDTH))):
+        network, stack_time = timed(trace, material)
+        recursive, recursive_time = timed(trace, material, RecursiveMaterialExporter)
+        results[label] = {
+            "nodes": len(network["nodes"]),
+            "links": len(network["links"]),
+            "stack_s": round(stack_time, 4),
+            "recursive_s": "RecursionError" if recursive is None else round(recursive_time, 4)
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for label, result in run().items():
+        print(label, result)
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blender_stand_in import install, build_grid_mesh, MeshObject
+
+install()
+from functions.Blender_Hierarchy_Crawler import ScheneHierarchyExporter
+
+
+#########################################
+#----------MESH BAKE BENCHMARK----------#
+#########################################
+# foreach_get/foreach_set bakes of ScheneHierarchyExporter against the per vertex and per face loops
+# they replaced, on the bpy stand-in:
+#     python tests/benchmarks/bench_mesh_bake.py
+# The stand-in foreach_get/foreach_set are python loops where Blender copies the buffer in C, so the
+# numpy timings here include a per element cost they do not have in Blender.
+GRID_SIZE = 300
+MATERIAL_COUNT = 4
+
+
+class PerVertexHierarchyExporter(ScheneHierarchyExporter):
+    # The bakes before numpy, one attribute element at a time
+    def generated_to_vector_attribute(self, mesh, attr_name="baked_texturespace"):
+        if attr_name not in mesh.attributes:
+            mesh.attributes.new(name=attr_name, type='FLOAT_VECTOR', domain='POINT')
+        attr = mesh.attributes[attr_name].data
+
+        scale, offset = self.mesh_texspace_transform(mesh)
+        # v.co * scale - offset, mathutils does the math in single precision
+        scale = [np.float32(s) for s in scale]
+        offset = [np.float32(o) for o in offset]
+        for i, v in enumerate(mesh.vertices):
+            attr[i].vector = tuple(np.float32(c) * s - o for c, s, o in zip(v.co, scale, offset))
+
+    def get_face_mat_indices(self, obj):
+        last_slot = len(obj.material_slots) - 1
+        mat_ids = [min(max(poly.material_index, 0), last_slot) for poly in obj.data.polygons]
+        return mat_ids, sorted(set(mat_ids)) or [0]
+
+
+def baked_texturespace(mesh):
+    return np.array([value.vector for value in mesh.attributes["baked_texturespace"].data], dtype=np.float32)
+
+
+def bake(exporter_class, size=GRID_SIZE, material_count=MATERIAL_COUNT, seed=0):
+    # Returns the baked texture space and the face material indices of one grid mesh
+    mesh = build_grid_mesh("Grid", size, material_count, seed)
+    obj = MeshObject("Grid", mesh, materials=[f"Material_{i}" for i in range(material_count)])
+    exporter = exporter_class()
+    exporter.generated_to_vector_attribute(mesh)
+    mat_ids, used_indices = exporter.get_face_mat_indices(obj)
+    return baked_texturespace(mesh), np.asarray(mat_ids, dtype=np.int32), used_indices
+
+
+def timed(function, *args, repeat=3):
+    # best of `repeat` runs
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def time_bakes(exporter_class, mesh, obj):
+    exporter = exporter_class()
+    start = time.perf_counter()
+    exporter.generated_to_vector_attribute(mesh)
+    texspace_time = time.perf_counter() - start
+    start = time.perf_counter()
+    exporter.get_face_mat_indices(obj)
+    return texspace_time, time.perf_counter() - start
+
+
+def run():
+    mesh = build_grid_mesh("Grid", GRID_SIZE, MATERIAL_COUNT)
+    obj = MeshObject("Grid", mesh, materials=[f"Material_{i}" for i in range(MATERIAL_COUNT)])
+    results = {"vertices": len(mesh.vertices), "faces": len(mesh.polygons)}
+    for label, exporter_class in (("numpy", ScheneHierarchyExporter), ("per_vertex", PerVertexHierarchyExporter)):
+        (texspace_time, mat_index_time), _ = timed(time_bakes, exporter_class, mesh, obj)
+        results[label] = {"texspace_s": round(texspace_time, 4), "mat_index_s": round(mat_index_time, 4)}
+    return results
+
+
+if __name__ == "__main__":
+    for label, result in run().items():
+        print(label, result)
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blender_stand_in import install, build_multi_link
+
+install()
+from functions.Blender_Material_Crawler import MaterialExporter
+
+
+#########################################
+#---------RECORD_LINK BENCHMARK---------#
+#########################################
+# Many links fanned into one socket, de-duplicated by MaterialExporter.record_link, against the list
+# scan it replaced:
+#     python tests/benchmarks/bench_record_link.py
+LINK_COUNT = 5000
+DUPLICATES = 2
+
+
+class ListScanMaterialExporter(MaterialExporter):
+    # record_link before the keyed dict: every new link is compared against all the recorded ones
+    def record_link(self, link, visited, links):
+        to_node = link.to_socket.node
+        if to_node.name in visited:
+            linkdict = {
+                "from_node": link.from_node.name,
+                "from_socket": link.from_socket.identifier,
+                "to_node": to_node.name,
+                "to_socket": link.to_socket.identifier
+            }
+            if linkdict not in links.values():
+                links[len(links)] = linkdict
+
+
+def trace(material, exporter_class=MaterialExporter):
+    return exporter_class().trace_shader_network(material)[material.name]
+
+
+def timed(function, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run(count=LINK_COUNT, duplicates=DUPLICATES):
+    material = build_multi_link(count, duplicates)
+    network, keyed_time = timed(trace, material)
+    _, list_time = timed(trace, material, ListScanMaterialExporter)
+    return {"links": len(network["links"]), "keyed_dict_s": round(keyed_time, 4), "list_scan_s": round(list_time, 4)}
+
+
+if __name__ == "__main__":
+    print(run())
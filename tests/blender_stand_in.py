@@ -0,0 +1,331 @@
+import copy
+import os
+import sys
+import types
+
+import numpy as np
+
+
+#########################################
+#-------------BPY STAND-IN--------------#
+#########################################
+# Just enough of bpy and mathutils to import the Blender addon functions outside of Blender and drive
+# the parts that are plain python over RNA data: the shader graph walker, the export cache, the writers
+# and the numpy bakes. Nodes, sockets and meshes are built with the classes below.
+ADDONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Addons")
+BLENDER_ADDON_DIR = os.path.join(ADDONS_DIR, "BlenderAddon")
+GAFFER_PYTHON_DIR = os.path.join(ADDONS_DIR, "GafferAddon", "python")
+
+
+class Vector(tuple):
+    # only what the crawlers use
+    def __new__(cls, values):
+        return super().__new__(cls, (float(v) for v in values))
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+    z = property(lambda self: self[2])
+
+    def __mul__(self, other):
+        return Vector(a * b for a, b in zip(self, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self, other))
+
+
+class Euler(Vector):
+    pass
+
+
+class Color(Vector):
+    pass
+
+
+def install():
+    # Registers the stand-in modules, real ones win when running inside Blender.
+    if "bpy" not in sys.modules:
+        bpy = types.ModuleType("bpy")
+        bpy.types = types.SimpleNamespace(Image=object, Object=object, Mesh=object, Material=object)
+        bpy.path = types.SimpleNamespace(abspath=lambda path, library=None: path)
+        bpy.data = types.SimpleNamespace(materials=[], images=[], meshes=[], objects=[])
+        bpy.context = types.SimpleNamespace(selected_objects=[], view_layer=None)
+        sys.modules["bpy"] = bpy
+    if "mathutils" not in sys.modules:
+        mathutils = types.ModuleType("mathutils")
+        mathutils.Vector = Vector
+        mathutils.Euler = Euler
+        mathutils.Color = Color
+        sys.modules["mathutils"] = mathutils
+    for path in (BLENDER_ADDON_DIR, GAFFER_PYTHON_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+#########################################
+#-------------SHADER GRAPHS-------------#
+#########################################
+class Socket:
+    def __init__(self, node, name, identifier=None, default_value=0.0):
+        self.node = node
+        self.name = name
+        self.identifier = identifier or name
+        self.default_value = default_value
+        self.links = []
+
+    @property
+    def is_linked(self):
+        return len(self.links) > 0
+
+
+class SocketCollection(list):
+    # Blender socket collections are indexed by position or by name
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next(socket for socket in self if socket.name == key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(socket.name == key for socket in self)
+        return super().__contains__(key)
+
+
+class Link:
+    def __init__(self, from_socket, to_socket):
+        self.from_node = from_socket.node
+        self.from_socket = from_socket
+        self.to_node = to_socket.node
+        self.to_socket = to_socket
+
+
+class Node:
+    # A ShaderNodeMath by default, the other node types only need another bl_idname/type.
+    # No RNA properties besides the sockets, so the node property schema is empty.
+    bl_rna = types.SimpleNamespace(properties=())
+
+    def __init__(self, name, bl_idname="ShaderNodeMath", node_type="MATH", inputs=("Value", "Value_001"), outputs=("Value",)):
+        self.name = name
+        self.bl_idname = bl_idname
+        self.type = node_type
+        self.location = (0.0, 0.0)
+        self.operation = "ADD"
+        self.use_clamp = False
+        self.is_active_output = True
+        self.inputs = SocketCollection(Socket(self, socket_name) for socket_name in inputs)
+        self.outputs = SocketCollection(Socket(self, socket_name) for socket_name in outputs)
+
+
+class NodeTree:
+    def __init__(self, name="Tree"):
+        self.name = name
+        self.name_full = name
+        self.nodes = []
+        self.links = []
+
+    def new_node(self, *args, **kwargs):
+        node = Node(*args, **kwargs)
+        self.nodes.append(node)
+        return node
+
+    def link(self, from_socket, to_socket):
+        link = Link(from_socket, to_socket)
+        # the same link is seen from both of its ends, like in Blender
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        self.links.append(link)
+        return link
+
+
+class Material:
+    def __init__(self, name, tree=None, library=None):
+        self.name = name
+        # linked datablocks get the library in their full name, like Blender
+        self.name_full = name if library is None else f"{name} [{library}]"
+        self.use_nodes = True
+        self.node_tree = tree or NodeTree(name)
+        self.node_tree.name_full = self.name_full
+
+
+def material_output(tree):
+    return tree.new_node("Material Output", "ShaderNodeOutputMaterial", "OUTPUT_MATERIAL",
+                         inputs=("Surface", "Volume", "Displacement"), outputs=())
+
+
+def build_chain(depth, name="Chain", library=None):
+    # Material Output <- math_0 <- math_1 <- ... <- math_{depth-1}
+    material = Material(name, library=library)
+    tree = material.node_tree
+    downstream = material_output(tree).inputs[0]
+    for i in range(depth):
+        node = tree.new_node(f"math_{i}")
+        tree.link(node.outputs[0], downstream)
+        downstream = node.inputs[0]
+    return material
+
+
+def build_fan_in(width, name="FanIn"):
+    # Material Output <- hub with `width` inputs, each fed by its own node, all of them fed by one root node
+    material = Material(name)
+    tree = material.node_tree
+    hub = tree.new_node("hub", inputs=[f"Value_{i:05d}" for i in range(width)])
+    tree.link(hub.outputs[0], material_output(tree).inputs[0])
+    root = tree.new_node("root")
+    for i, hub_input in enumerate(hub.inputs):
+        node = tree.new_node(f"branch_{i}")
+        tree.link(node.outputs[0], hub_input)
+        tree.link(root.outputs[0], node.inputs[0])
+    return material
+
+
+def build_multi_link(count, duplicates=1, name="MultiLink"):
+    # `count` nodes linked into one (multi input) socket, every link repeated `duplicates` times
+    material = Material(name)
+    tree = material.node_tree
+    sink = tree.new_node("sink")
+    tree.link(sink.outputs[0], material_output(tree).inputs[0])
+    for i in range(count):
+        node = tree.new_node(f"source_{i}")
+        for _ in range(duplicates):
+            tree.link(node.outputs[0], sink.inputs[0])
+    return material
+
+
+#########################################
+#----------------MESHES-----------------#
+#########################################
+class PropertyCollection(list):
+    # bpy_prop_collection with foreach_get/foreach_set over a flat buffer, like Blender
+    def foreach_get(self, attr, buffer):
+        i = 0
+        for item in self:
+            value = getattr(item, attr)
+            values = value if isinstance(value, tuple) else (value,)
+            buffer[i:i + len(values)] = values
+            i += len(values)
+
+    def foreach_set(self, attr, buffer):
+        i = 0
+        for item in self:
+            size = len(getattr(item, attr)) if isinstance(getattr(item, attr), tuple) else 1
+            values = tuple(buffer[i:i + size])
+            setattr(item, attr, type(getattr(item, attr))(values) if size > 1 else values[0])
+            i += size
+
+
+class MeshVertex:
+    def __init__(self, co):
+        # mesh data is single precision
+        self.co = Vector(float(c) for c in np.asarray(co, dtype=np.float32))
+
+
+class MeshPolygon:
+    def __init__(self, material_index=0):
+        self.material_index = material_index
+
+
+class AttributeValue:
+    def __init__(self, data_type):
+        if data_type == "FLOAT_VECTOR":
+            self.vector = Vector((0.0, 0.0, 0.0))
+        else:
+            self.value = 0
+
+
+class Attribute:
+    def __init__(self, name, data_type, domain, size):
+        self.name = name
+        self.data_type = data_type
+        self.domain = domain
+        self.data = PropertyCollection(AttributeValue(data_type) for _ in range(size))
+
+
+class AttributeCollection(dict):
+    def __init__(self, mesh):
+        super().__init__()
+        self.mesh = mesh
+
+    def new(self, name, type, domain):
+        size = len(self.mesh.vertices) if domain == "POINT" else len(self.mesh.polygons)
+        self[name] = Attribute(name, type, domain, size)
+        return self[name]
+
+
+class Mesh:
+    def __init__(self, name, vertices=(), material_indices=(), library=None, override_library=None):
+        self._name = name
+        self.library = library
+        self.override_library = override_library
+        self.vertices = PropertyCollection(MeshVertex(co) for co in vertices)
+        self.polygons = PropertyCollection(MeshPolygon(index) for index in material_indices)
+        self.attributes = AttributeCollection(self)
+        self.use_auto_texspace = True
+        self.texspace_location = Vector((0.0, 0.0, 0.0))
+        self.texspace_size = Vector((1.0, 1.0, 1.0))
+        # custom properties
+        self.properties = {}
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        # read-only on linked meshes and system overrides, like Blender
+        if self.library is not None or (self.override_library is not None and self.override_library.is_system_override):
+            raise AttributeError('bpy_struct: attribute "name" from "Mesh" is read-only')
+        self._name = value
+
+    @property
+    def name_full(self):
+        return self.name if self.library is None else f"{self.name} [{self.library}]"
+
+    def update(self):
+        # auto texture space: the bounding box of the vertices
+        if self.use_auto_texspace and self.vertices:
+            co = np.array([v.co for v in self.vertices], dtype=np.float32)
+            low, high = co.min(axis=0), co.max(axis=0)
+            self.texspace_location = Vector((low + high) / 2)
+            self.texspace_size = Vector(np.maximum((high - low) / 2, 1e-4))
+
+    def copy(self):
+        mesh = Mesh(self.name + ".001")
+        mesh.vertices = PropertyCollection(MeshVertex(v.co) for v in self.vertices)
+        mesh.polygons = PropertyCollection(MeshPolygon(p.material_index) for p in self.polygons)
+        for name, attribute in self.attributes.items():
+            mesh.attributes.new(name, attribute.data_type, attribute.domain)
+        mesh.use_auto_texspace = self.use_auto_texspace
+        mesh.texspace_location = self.texspace_location
+        mesh.texspace_size = self.texspace_size
+        mesh.properties = copy.deepcopy(self.properties)
+        sys.modules["bpy"].data.meshes.append(mesh)
+        return mesh
+
+    def get(self, key, default=None):
+        return self.properties.get(key, default)
+
+    def __contains__(self, key):
+        return key in self.properties
+
+    def __getitem__(self, key):
+        return self.properties[key]
+
+    def __setitem__(self, key, value):
+        self.properties[key] = value
+
+
+class MeshObject:
+    def __init__(self, name, mesh, materials=(), parent=None):
+        self.name = name
+        self.name_full = name
+        self.type = "MESH"
+        self.data = mesh
+        self.parent = parent
+        self.material_slots = [types.SimpleNamespace(material=material) for material in materials]
+
+
+def build_grid_mesh(name, size, material_count=1, seed=0, library=None):
+    # size x size random vertices and faces, some faces use material indices past the last slot
+    rng = np.random.default_rng(seed)
+    vertices = rng.uniform(-50.0, 50.0, (size * size, 3))
+    material_indices = rng.integers(-1, material_count + 2, size * size)
+    return Mesh(name, vertices, material_indices.tolist(), library=library)
@@ -0,0 +1,4 @@
+from blender_stand_in import install
+
+# bpy/mathutils stand-ins and the addon import paths, before any test module imports the addons
+install()
@@ -0,0 +1,75 @@
+import json
+
+
+#########################################
+#--------CYCLES SCHEMA STAND-IN---------#
+#########################################
+# The few Cycles shaders the planner tests use, in the layout written by
+# GafferAddon/python/MagicHammer/Cycles_Import/utils/generate_cycles_schema.py.
+FLOAT = "Gaffer::FloatPlug"
+INT = "Gaffer::IntPlug"
+BOOL = "Gaffer::BoolPlug"
+STRING = "Gaffer::StringPlug"
+VECTOR = "Gaffer::V3fPlug"
+COLOR = "Gaffer::Color3fPlug"
+CLOSURE = "Gaffer::Plug"
+
+SHADERS = {
+    "principled_bsdf": {
+        "parameters": {"base_color": COLOR, "roughness": FLOAT, "metallic": FLOAT, "normal": VECTOR,
+                       "emission_color": COLOR, "emission_strength": FLOAT, "coat_normal": VECTOR},
+        "out": {"bsdf": CLOSURE}
+    },
+    "mix_closure": {
+        "parameters": {"fac": FLOAT, "closure1": CLOSURE, "closure2": CLOSURE},
+        "out": {"closure": CLOSURE}
+    },
+    "noise_texture": {
+        "parameters": {"vector": VECTOR, "scale": FLOAT, "detail": FLOAT, "dimensions": STRING, "use_normalize": BOOL},
+        "out": {"fac": FLOAT, "color": COLOR}
+    },
+    "math": {
+        "parameters": {"value1": FLOAT, "value2": FLOAT, "value3": FLOAT, "math_type": STRING, "use_clamp": BOOL},
+        "out": {"value": FLOAT}
+    },
+    "vector_math": {
+        "parameters": {"vector1": VECTOR, "vector2": VECTOR, "vector3": VECTOR, "math_type": STRING},
+        "out": {"vector": VECTOR, "value": FLOAT}
+    },
+    "texture_coordinate": {
+        "parameters": {"from_dupli": BOOL},
+        "out": {"generated": VECTOR, "normal": VECTOR, "uv": VECTOR, "object": VECTOR}
+    },
+    "attribute": {
+        "parameters": {"attribute": STRING},
+        "out": {"color": COLOR, "vector": VECTOR, "fac": FLOAT}
+    },
+    "fresnel": {
+        # no normal plug, LABEL_MAP marks it UNSUPPORTED
+        "parameters": {"ior": FLOAT},
+        "out": {"fac": FLOAT}
+    },
+    "displacement": {
+        "parameters": {"height": FLOAT, "midlevel": FLOAT, "scale": FLOAT, "normal": VECTOR},
+        "out": {"displacement": VECTOR}
+    },
+    "image_texture": {
+        "parameters": {"filename": STRING, "colorspace": STRING, "alpha_type": STRING, "interpolation": STRING,
+                       "extension": STRING, "projection": STRING, "projection_blend": FLOAT, "vector": VECTOR},
+        "out": {"color": COLOR, "alpha": FLOAT}
+    }
+}
+
+PRESETS = {
+    "image_texture": {"colorspace": ["", "sRGB", "data", "Linear Rec.709 (sRGB)"]}
+}
+
+
+def stand_in_schema():
+    from MagicHammer.Cycles_Import.build_plan import CyclesSchema
+    return CyclesSchema(SHADERS, PRESETS)
+
+
+def write_schema(filepath):
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "shaders": SHADERS, "presets": PRESETS}, f, indent=2)
@@ -0,0 +1,130 @@
+import importlib.util
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+from blender_stand_in import BLENDER_ADDON_DIR
+
+
+# batch_export.py runs with a regular python, loaded on its own so the addon package (bpy) is not imported
+spec = importlib.util.spec_from_file_location("batch_export", os.path.join(BLENDER_ADDON_DIR, "batch_export.py"))
+batch_export = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(batch_export)
+
+
+# Stands in for `blender -b file.blend --python-exit-code 1 --python-expr ... -- --output --result --settings`,
+# the name of the .blend picks what happens.
+FAKE_BLENDER = """#!{python}
+import json, os, sys, time
+blend = sys.argv[sys.argv.index("-b") + 1]
+assert "--python-expr" in sys.argv
+args = sys.argv[sys.argv.index("--") + 1:]
+output, result, settings = (args[args.index(flag) + 1] for flag in ("--output", "--result", "--settings"))
+name = os.path.basename(blend)
+print("Blender stand-in exporting", blend)
+if name.startswith("hang"):
+    time.sleep(30)
+if name.startswith("crash"):
+    print("Segmentation fault")
+    sys.exit(3)
+if name.startswith("fail"):
+    data = {{"ok": False, "error": "RuntimeError: export failed"}}
+else:
+    json_path = os.path.splitext(output)[0] + ".gcyc"
+    with open(json_path, "w") as f:
+        f.write("{{}}")
+    data = {{"ok": True, "usd_path": output, "json_path": json_path, "settings": json.loads(settings)}}
+with open(result, "w") as f:
+    json.dump(data, f)
+"""
+
+
+@pytest.fixture
+def blender(tmp_path):
+    path = tmp_path / "blender"
+    path.write_text(FAKE_BLENDER.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def blend_files(root, *names):
+    paths = []
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"BLENDER")
+        paths.append(str(path))
+    return paths
+
+
+def by_name(results):
+    return {os.path.basename(result["blend"]): result for result in results}
+
+
+def test_collect_blend_files(tmp_path):
+    blend_files(tmp_path, "a.blend", "sub/b.blend", "sub/deeper/C.BLEND", "sub/notes.txt", "a.blend1")
+    pattern = str(tmp_path / "**" / "*")
+    files = batch_export.collect_blend_files([pattern, str(tmp_path / "a.blend")])
+    # sorted, no duplicates, only .blend files
+    assert files == [str(tmp_path / name) for name in ("a.blend", "sub/b.blend", "sub/deeper/C.BLEND")]
+    # plain paths are kept even before they exist, the export reports them
+    assert batch_export.collect_blend_files(["missing.blend"]) == [os.path.abspath("missing.blend")]
+    assert batch_export.collect_blend_files([str(tmp_path / "*.txt")]) == []
+
+
+def test_run_batch(tmp_path, blender):
+    files = blend_files(tmp_path, "ok.blend", "fail.blend", "crash.blend")
+    output_dir = tmp_path / "export"
+    results = by_name(batch_export.run_batch(files, blender, str(output_dir), {"gcyc_encoding": "BINARY"}, jobs=3))
+
+    ok = results["ok.blend"]
+    assert ok["ok"] and ok["usd_path"] == str(output_dir / "ok.usd")
+    assert ok["settings"] == {"gcyc_encoding": "BINARY"}
+    assert os.path.exists(ok["json_path"])
+    assert "log" not in ok
+
+    assert results["fail.blend"]["error"] == "RuntimeError: export failed"
+    crash = results["crash.blend"]
+    assert crash["error"] == "Blender exited with code 3 without a result"
+    # the end of the Blender output is kept for the failures
+    assert "Segmentation fault" in crash["log"]
+
+
+def test_duplicate_outputs_are_rejected(tmp_path, blender):
+    files = blend_files(tmp_path, "a/shot.blend", "b/shot.blend")
+    results = batch_export.run_batch(files, blender, str(tmp_path / "export"), jobs=2)
+    assert len(results) == 2
+    rejected = next(result for result in results if not result["ok"])
+    assert rejected["blend"] == files[1]
+    assert rejected["error"].startswith(f"same output as {files[0]}")
+    # next to every .blend there is no clash
+    assert all(result["ok"] for result in batch_export.run_batch(files, blender, None, jobs=2))
+
+
+def test_timeout(tmp_path, blender):
+    files = blend_files(tmp_path, "hang.blend", "ok.blend")
+    results = by_name(batch_export.run_batch(files, blender, str(tmp_path / "export"), jobs=2, timeout=1))
+    assert results["hang.blend"]["error"] == "timed out after 1s"
+    assert results["hang.blend"]["time"] < 20
+    assert results["ok.blend"]["ok"]
+
+
+def test_report_and_exit_code(tmp_path, blender, capsys):
+    blend_files(tmp_path, "ok.blend", "other.blend")
+    report = tmp_path / "report.json"
+    argv = [str(tmp_path / "*.blend"), "--blender", blender, "--output-dir", str(tmp_path / "export"), "--report", str(report)]
+    assert batch_export.main(argv) == 0
+    assert sorted(os.path.basename(result["blend"]) for result in json.loads(report.read_text())) == ["ok.blend", "other.blend"]
+    assert "Exported 2/2 files" in capsys.readouterr().out
+
+    blend_files(tmp_path, "fail.blend")
+    assert batch_export.main(argv) == 1
+    failed = [result for result in json.loads(report.read_text()) if not result["ok"]]
+    assert [os.path.basename(result["blend"]) for result in failed] == ["fail.blend"]
+    out = capsys.readouterr().out
+    assert "Exported 2/3 files" in out and "1 failed:" in out
+
+    assert batch_export.main([str(tmp_path / "nothing" / "*.blend"), "--blender", blender]) == 1
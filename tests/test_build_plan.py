@@ -0,0 +1,273 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from blender_stand_in import GAFFER_PYTHON_DIR
+from cycles_schema_stand_in import stand_in_schema
+from benchmarks.bench_build_plan import build_material, build_scene, link, write
+from MagicHammer.Cycles_Import.build_plan import BuildPlanner, CONVERTER_COLOR, plan_scene, plan_stats, shader_node
+
+
+@pytest.fixture
+def planner():
+    return BuildPlanner({}, stand_in_schema())
+
+
+def connections(plan):
+    return [(c["src"]["node"], c["src"]["plug"], c["dst"]["node"], c["dst"]["plug"]) for c in plan["connections"]]
+
+
+#########################################
+#--------------PLUG NAMES---------------#
+#########################################
+@pytest.mark.parametrize("label, shader_type, io, expected", [
+    # safe plug name
+    ("Base Color", "principled_bsdf", "parameters", "base_color"),
+    ("BSDF", "principled_bsdf", "out", "bsdf"),
+    # label map
+    ("Value_001", "math", "parameters", "value2"),
+    ("operation", "math", "parameters", "math_type"),
+    ("Strength", "principled_bsdf", "parameters", "emission_strength"),
+    ("Shader", "mix_closure", "out", "closure"),
+    ("Normal", "fresnel", "parameters", "UNSUPPORTED"),
+    # fuzzy match
+    ("Use-Normalize", "noise_texture", "parameters", "use_normalize"),
+    # nothing
+    ("Nope", "math", "parameters", None),
+    ("Value", "unknown_shader", "parameters", None),
+])
+def test_resolve_plug_name(planner, label, shader_type, io, expected):
+    assert planner.resolve_plug_name(label, shader_type, io) == expected
+    # second lookup comes from the index
+    assert planner.resolve_plug_name(label, shader_type, io) == expected
+
+
+def test_resolve_plug_name_prefers_exporter_names(planner):
+    assert planner.resolve_plug_name("Value", "math", resolved={"Value": "value3"}) == "value3"
+
+
+def test_resolve_plug_name_on_boxes(planner):
+    assert planner.resolve_plug_name("Color", "rgb_curves", "out", is_box=True) == "value"
+    assert planner.resolve_plug_name("Fac", "rgb_curves", "parameters", is_box=True) == "fac"
+    assert planner.resolve_plug_name("My Input", "group", "parameters", is_box=True) == "my_input"
+
+
+#########################################
+#-------------CONNECTIONS---------------#
+#########################################
+def test_same_types_connect_directly(planner):
+    plan = {"nodes": [], "connections": []}
+    noise = shader_node("Noise", "noise_texture")
+    bsdf = shader_node("BSDF", "principled_bsdf")
+    planner.plan_connection(plan, noise, "Color", bsdf, "Base Color")
+    assert plan["nodes"] == []
+    assert connections(plan) == [("Noise", "color", "BSDF", "base_color")]
+
+
+def test_converter_is_inserted(planner):
+    plan = {"nodes": [], "connections": []}
+    noise = shader_node("Noise", "noise_texture")
+    bsdf = shader_node("BSDF", "principled_bsdf")
+    planner.plan_connection(plan, noise, "Fac", bsdf, "Base Color")
+
+    [converter] = plan["nodes"]
+    assert converter["shader"] == "convert_float_to_color"
+    assert converter["converter"] is True and converter["color"] == CONVERTER_COLOR
+    assert connections(plan) == [
+        ("Noise", "fac", converter["name"], "value_float"),
+        (converter["name"], "value_color", "BSDF", "base_color")
+    ]
+
+
+def test_unresolved_connection_warns(planner):
+    plan = {"nodes": [], "connections": []}
+    planner.plan_connection(plan, shader_node("Math", "math"), "Value", shader_node("Fresnel", "fresnel"), "Normal")
+    assert plan["connections"] == [] and len(planner.warnings) == 1
+
+
+def test_material_network():
+    plan = plan_scene({"materials": {"Mat": build_material(0)}}, stand_in_schema())
+    network = plan["materials"][0]["network"]
+    assert plan["warnings"] == []
+    assert [a["name"] for a in network["assignments"]] == ["ShaderAssign_Surface", "ShaderAssign_Displacement"]
+    displacement = network["assignments"][1]
+    assert displacement["shader"] == "output_surface_displacement" and displacement["plug"] == "displacement"
+    # the Generated output is read from the baked texture space
+    generated = next(node for node in network["nodes"] if node["name"] == "Texture_Coordinate_Generated")
+    assert generated["values"] == [["attribute", "baked_texturespace"]]
+    assert ("Texture_Coordinate_Generated", "vector", "Noise_Texture", "vector") in connections(network)
+
+
+#########################################
+#----------------GROUPS-----------------#
+#########################################
+def group_scene(group_links):
+    group = {
+        "name": "MyGroup",
+        "socket_map": {"Socket_0": "Strength", "Socket_1": "Result"},
+        "nodes": {
+            "Group Input": {"type": "NodeGroupInput"},
+            "Group Output": {"type": "NodeGroupOutput"},
+            "Math": {"type": "ShaderNodeMath", "cycles_type": "math", "params": {"operation": "ADD"}}
+        },
+        "links": group_links
+    }
+    material = {
+        "nodes": {
+            "Material Output": {"type": "ShaderNodeOutputMaterial"},
+            "Group": {"type": "ShaderNodeGroup", "group_id": "MyGroup", "params": {"Socket_0": 2.0, "Missing": 1.0}},
+            "Group.001": {"type": "ShaderNodeGroup", "group_id": "MyGroup", "params": {}},
+            "Principled BSDF": {"type": "ShaderNodeBsdfPrincipled", "cycles_type": "principled_bsdf", "params": {}}
+        },
+        "links": [
+            link("Group", "Socket_1", "Principled BSDF", "Roughness"),
+            link("Principled BSDF", "BSDF", "Material Output", "Surface")
+        ]
+    }
+    return {"materials": {"Mat": material}, "groups": {"MyGroup": group}}
+
+
+def test_group_box_plan():
+    plan = plan_scene(group_scene([
+        link("Group Input", "Socket_0", "Math", "Value"),
+        link("Math", "Value", "Group Output", "Socket_1")
+    ]), stand_in_schema())
+    network = plan["materials"][0]["network"]
+    group, instance = [node for node in network["nodes"] if node["kind"] == "group"]
+
+    # planned once, shared by the instances
+    assert group["network"] is instance["network"]
+    assert plan_stats(plan)["groups"] == 1
+    group_network = group["network"]
+    assert group_network["inputs"] == {"socket_0": "Gaffer::FloatPlug"}
+    assert group_network["outputs"] == {"socket_1": "Gaffer::FloatPlug"}
+    assert group_network["group_inputs"] == [{"plug": {"node": "Math", "io": "parameters", "plug": "value1"}, "name": "socket_0"}]
+    assert group_network["group_outputs"] == [{"plug": {"node": "Math", "io": "out", "plug": "value"}, "name": "socket_1"}]
+
+    # plugs of the Box are its direct children
+    assert ("Group", "socket_1", "Principled_BSDF", "roughness") in connections(network)
+    assert network["connections"][0]["src"]["io"] is None
+    assert group["values"] == [["socket_0", 2.0]]
+    assert "⚠️ Could not resolve param 'Missing' for group type 'MyGroup'" in plan["warnings"]
+    assert {"node": "Group", "plug": "socket_0", "name": "Strength"} in network["socket_renames"]
+
+
+def test_missing_group_warns():
+    scene = group_scene([])
+    scene["groups"] = {}
+    plan = plan_scene(scene, stand_in_schema())
+    assert "⚠️ Group 'MyGroup' is missing from the groups table." in plan["warnings"]
+
+
+@pytest.mark.parametrize("group_links, warning", [
+    # Group Input straight into the Group Output, the destination is not a node of the plan.
+    # The importer used to raise a KeyError on it.
+    ([link("Group Input", "Socket_0", "Group Output", "Socket_1")], "❌ Could not promote group input Socket_0 → Group Output.Socket_1"),
+    # destination plug that does not resolve
+    ([link("Group Input", "Socket_0", "Math", "Nope")], "❌ Could not resolve group input Socket_0 → Math.Nope"),
+])
+def test_unresolved_group_input_is_skipped(group_links, warning):
+    plan = plan_scene(group_scene(group_links + [link("Math", "Value", "Group Output", "Socket_1")]), stand_in_schema())
+    group_network = plan["materials"][0]["network"]["nodes"][0]["network"]
+    assert warning in plan["warnings"]
+    assert group_network["group_inputs"] == []
+    # the rest of the group is still planned
+    assert group_network["outputs"] == {"socket_1": "Gaffer::FloatPlug"}
+
+
+#########################################
+#--------------ASSIGNMENTS--------------#
+#########################################
+def test_plan_split_marks_duplicate_materials(planner):
+    split = planner.plan_split("Obj", "/root/Obj/Mesh", {"0": "Red", "1": "Blue.001", "2": "Red"})
+    assert [(c["index"], c["material"], c["name"], c["child_path"]) for c in split["children"]] == [
+        ("0", "Red", "Obj_Red_duplMat_0", "/root/Obj/Mesh/0"),
+        ("1", "Blue_001", "Obj_Blue_001", "/root/Obj/Mesh/1"),
+        ("2", "Red", "Obj_Red_duplMat_2", "/root/Obj/Mesh/2"),
+    ]
+    assert split["children"][0]["path"] == "/root/Obj/Mesh/Obj_Red_duplMat_0"
+
+
+def test_plan_assignments(planner):
+    materials = [
+        {"name": "Red", "network": {"assignments": [{"name": "ShaderAssign_Surface"}]}},
+        {"name": "Blue", "network": {"assignments": [{"name": "ShaderAssign_Surface"}]}},
+        # no ShaderAssignment, no filter
+        {"name": "Empty", "network": {"assignments": []}}
+    ]
+    hierarchy = {
+        "Single": {"path": "/root/Single/Mesh", "mat_by_index": {"0": "Red"}, "has_multiple_mat": False},
+        "Multi": {"path": "/root/Multi/Mesh", "mat_by_index": {"0": "Red", "1": "Blue"}, "has_multiple_mat": True},
+        "NoMaterial": {"path": "/root/NoMaterial/Mesh", "mat_by_index": {}},
+        "EmptyMat": {"path": "/root/Empty.Mesh", "mat_by_index": {"0": "Empty"}}
+    }
+    result = planner.plan_assignments(hierarchy, materials)
+    assert result["filters"] == {
+        "Red": ["/root/Single/Mesh", "/root/Multi/Mesh/Multi_Red"],
+        "Blue": ["/root/Multi/Mesh/Multi_Blue"]
+    }
+    assert [split["object"] for split in result["splits"]] == ["Multi"]
+    assert "💀 Failed to Assign Material to NoMaterial: no material" in planner.warnings
+    assert "💀 Failed to Assign Empty to EmptyMat on the path /root/Empty_Mesh" in planner.warnings
+
+    # without splits the first material gets the whole mesh
+    unsplit = BuildPlanner({}, stand_in_schema()).plan_assignments(hierarchy, materials, split_geo=False)
+    assert unsplit["filters"]["Red"] == ["/root/Single/Mesh", "/root/Multi/Mesh"]
+    assert unsplit["splits"] == []
+
+
+def test_plan_texspace_variables():
+    hierarchy = {
+        "A": {"path": "/root/A", "texspace": {"scale": [1, 1, 1], "offset": [0, 0, 0]}},
+        "B": {"path": "/root/B", "texspace": {"scale": [1, 1, 1], "offset": [0, 0, 0]}},
+        "C": {"path": "/root/C", "texspace": {"scale": [2, 2, 2], "offset": [0, 0, 0]}}
+    }
+    planner = BuildPlanner({"settings": {"texspace_mode": "TRANSFORM"}}, stand_in_schema())
+    assert planner.plan_texspace_variables(hierarchy) == [
+        {"scale": [1, 1, 1], "offset": [0, 0, 0], "paths": ["/root/A", "/root/B"]},
+        {"scale": [2, 2, 2], "offset": [0, 0, 0], "paths": ["/root/C"]}
+    ]
+    assert BuildPlanner({}, stand_in_schema()).plan_texspace_variables(hierarchy) == []
+
+
+#########################################
+#-------------COMMAND LINE--------------#
+#########################################
+def test_command_line(tmp_path):
+    gcyc_path, schema_path = write(str(tmp_path))
+    output_path = str(tmp_path / "plan.json")
+    env = dict(os.environ, PYTHONPATH=GAFFER_PYTHON_DIR)
+    result = subprocess.run(
+        [sys.executable, "-m", "MagicHammer.Cycles_Import.build_plan", gcyc_path, "--schema", schema_path, "--output", output_path],
+        env=env, capture_output=True, text=True, check=True
+    )
+    stats = json.loads(result.stdout.splitlines()[0])
+    assert stats == plan_stats(plan_scene(build_scene(), stand_in_schema()))
+    with open(output_path) as f:
+        assert len(json.load(f)["materials"]) == stats["materials"]
+
+
+class NoShaderSchema:
+    # fails on any shader lookup, a cache hit must not resolve networks
+    def shader(self, shader_type):
+        raise AssertionError(f"looked up {shader_type}")
+
+    plugs = presets = shader
+
+
+def test_cache_hit_plans_only_assignments():
+    scene = build_scene(material_count=10, object_count=40)
+    scene["settings"]["texspace_mode"] = "TRANSFORM"
+    for i, entry in enumerate(scene["hierarchy"].values()):
+        entry["texspace"] = {"scale": [1, 1, i % 3], "offset": [0, 0, 0]}
+    full = plan_scene(scene, stand_in_schema())
+    cached = plan_scene(scene, NoShaderSchema(), plan_networks=False)
+
+    assert cached["materials"] == []
+    assert cached["assignments"]["splits"] == full["assignments"]["splits"]
+    assert cached["assignments"]["filters"] == full["assignments"]["filters"]
+    assert cached["texspace_variables"] == full["texspace_variables"]
+    assert cached["warnings"] == []
@@ -0,0 +1,21 @@
+import json
+
+from functions import Blender_Cycles_Schema
+from functions.Blender_Cycles_Schema import CYCLES_SCHEMA_VERSION, CyclesPlugResolver
+from functions.Blender_Material_Crawler import MaterialExporter
+
+
+def test_missing_schema_warns(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(Blender_Cycles_Schema, "CYCLES_SCHEMA_PATH", str(tmp_path / "cycles_schema.json"))
+    exporter = MaterialExporter(resolve_cycles_names=True)
+    assert exporter.plug_resolver is None
+    assert "No usable Cycles schema" in capsys.readouterr().out
+
+
+def test_outdated_schema_is_ignored(tmp_path):
+    path = tmp_path / "cycles_schema.json"
+    path.write_text(json.dumps({"version": CYCLES_SCHEMA_VERSION + 1, "shaders": {}}))
+    assert CyclesPlugResolver.load(str(path)) is None
+
+    path.write_text(json.dumps({"version": CYCLES_SCHEMA_VERSION, "shaders": {}}))
+    assert CyclesPlugResolver.load(str(path)) is not None
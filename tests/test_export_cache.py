@@ -0,0 +1,34 @@
+from blender_stand_in import build_chain
+from functions.Blender_Material_Crawler import MaterialExporter
+
+
+def export_networks(cache_path, materials):
+    exporter = MaterialExporter(use_export_cache=True)
+    exporter.begin_export_cache(cache_path)
+    networks = [exporter.get_material_network(material)[material.name] for material in materials]
+    cache = exporter.export_cache
+    exporter.end_export_cache()
+    return networks, cache
+
+
+def test_linked_and_local_material_with_the_same_name(tmp_path):
+    cache_path = str(tmp_path / "scene.gcyc")
+    local = build_chain(1, name="Shared")
+    linked = build_chain(3, name="Shared", library="lib.blend")
+    assert local.name == linked.name and local.name_full != linked.name_full
+
+    traced, cache = export_networks(cache_path, [local, linked])
+    assert cache.misses == 2
+
+    reused, cache = export_networks(cache_path, [local, linked])
+    assert cache.hits == 2 and cache.misses == 0
+    assert reused == traced
+    assert len(reused[0]["nodes"]) == 2 and len(reused[1]["nodes"]) == 4
+
+
+def test_changed_material_is_traced_again(tmp_path):
+    cache_path = str(tmp_path / "scene.gcyc")
+    export_networks(cache_path, [build_chain(2, name="Mat")])
+    networks, cache = export_networks(cache_path, [build_chain(4, name="Mat")])
+    assert cache.misses == 1
+    assert len(networks[0]["nodes"]) == 5
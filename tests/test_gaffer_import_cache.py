@@ -0,0 +1,64 @@
+import os
+import unittest
+
+try:
+    import Gaffer
+    import GafferTest
+except ImportError:
+    Gaffer = None
+
+
+#########################################
+#-----------CACHED MATERIALS------------#
+#########################################
+# A cache hit has to give the same editable Materials Box as a fresh import, with nothing in the script
+# pointing at the cache file. Runs inside Gaffer:
+#     gaffer python -m pytest tests/test_gaffer_import_cache.py
+# and is skipped everywhere else.
+@unittest.skipIf(Gaffer is None, "Gaffer is not available")
+class CachedMaterialsTest(GafferTest.TestCase if Gaffer is not None else unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        from MagicHammer.Cycles_Import import import_Cycles_materials_to_Gaffer as importer
+        from MagicHammer.Cycles_Import.import_cache import ImportCache
+        self.importer = importer
+        self.cache = ImportCache(os.path.join(self.temporaryDirectory(), "cache"))
+
+    def built_materials(self):
+        script = Gaffer.ScriptNode()
+        box = Gaffer.Box("Materials")
+        script.addChild(box)
+        box.addChild(GafferTest.AddNode("Add"))
+        box["Add"]["op1"].setValue(3)
+        Gaffer.PlugAlgo.promote(box["Add"]["op2"])
+        return script, box
+
+    def testCacheHitIsAnEditableBox(self):
+        _, box = self.built_materials()
+        self.importer.store_materials_reference(box, self.cache, "v1-key")
+        cached_reference = self.cache.get("v1-key")
+        self.assertIsNotNone(cached_reference)
+
+        staging = Gaffer.ScriptNode()
+        loaded = self.importer.load_cached_materials(cached_reference, staging)
+        self.assertIs(type(loaded), Gaffer.Box)
+        self.assertEqual(loaded.getName(), "Materials")
+        self.assertEqual(loaded["Add"]["op1"].getValue(), 3)
+        self.assertIn("op2", loaded)
+        # editable like a fresh import
+        loaded["Add"]["op1"].setValue(5)
+        loaded.addChild(GafferTest.AddNode("Extra"))
+
+        # the script does not depend on the cache file
+        os.remove(cached_reference)
+        serialisation = staging.serialise()
+        self.assertNotIn(cached_reference, serialisation)
+        self.assertNotIn("Reference", serialisation)
+        copy = Gaffer.ScriptNode()
+        copy.execute(serialisation)
+        self.assertEqual(copy["Materials"]["Add"]["op1"].getValue(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
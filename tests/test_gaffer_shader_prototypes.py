@@ -0,0 +1,123 @@
+import json
+import os
+import time
+import unittest
+
+from blender_stand_in import BLENDER_ADDON_DIR
+
+try:
+    import Gaffer
+    import GafferCycles
+    import GafferTest
+except ImportError:
+    Gaffer = None
+
+
+#########################################
+#-----------SHADER PROTOTYPES-----------#
+#########################################
+# create_shader builds shaders from a cached prototype with createCounterpart, they have to be the
+# same as the shaders loadShader builds. Runs inside Gaffer:
+#     gaffer python -m pytest tests/test_gaffer_shader_prototypes.py
+# and is skipped everywhere else.
+SHADER_MAP_PATH = os.path.join(BLENDER_ADDON_DIR, "functions", "blender_shader_class_to_cycles_name.json")
+TIMING_REPEAT = 20
+
+
+def mapped_shader_types():
+    # Cycles shader types the exporter maps Blender nodes to, as the importer names them
+    from MagicHammer.Cycles_Import.cycles_names import shader_safe_type
+    with open(SHADER_MAP_PATH, "r") as f:
+        shader_map = json.load(f)
+    return sorted({shader_safe_type(cycles_name) for cycles_name in shader_map.values()} & set(GafferCycles.shaders.keys()))
+
+
+def plug_tree(plug):
+    # Everything of a plug that createCounterpart has to keep
+    tree = {
+        "type": plug.typeName(),
+        "direction": plug.direction(),
+        "flags": plug.getFlags(),
+        "dynamic": bool(plug.getFlags() & Gaffer.Plug.Flags.Dynamic),
+        "children": {child.getName(): plug_tree(child) for child in plug.children()}
+    }
+    if hasattr(plug, "defaultValue"):
+        tree["default"] = plug.defaultValue()
+        tree["value"] = plug.getValue()
+    for limit in ("minValue", "maxValue"):
+        if hasattr(plug, limit):
+            tree[limit] = getattr(plug, limit)()
+    return tree
+
+
+@unittest.skipIf(Gaffer is None, "Gaffer is not available")
+class ShaderPrototypeTest(GafferTest.TestCase if Gaffer is not None else unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        from MagicHammer.Cycles_Import import import_Cycles_materials_to_Gaffer as importer
+        self.importer = importer
+        self.shader_types = mapped_shader_types()
+        self.assertTrue(self.shader_types)
+
+    def loaded_shader(self, name, shader_type):
+        shader = GafferCycles.CyclesShader(name)
+        shader.loadShader(shader_type)
+        return shader
+
+    def testPlugTreesMatchLoadShader(self):
+        for shader_type in self.shader_types:
+            with self.subTest(shader_type=shader_type):
+                loaded = self.loaded_shader("loaded", shader_type)
+                created = self.importer.create_shader("created", shader_type)
+                self.assertIsNotNone(created)
+                self.assertEqual(created["name"].getValue(), loaded["name"].getValue())
+                self.assertEqual(created["type"].getValue(), loaded["type"].getValue())
+                self.assertEqual(created["parameters"].keys(), loaded["parameters"].keys())
+                self.assertEqual(plug_tree(created["parameters"]), plug_tree(loaded["parameters"]))
+                self.assertEqual(plug_tree(created["out"]), plug_tree(loaded["out"]))
+                self.assertEqual(created["out"].direction(), Gaffer.Plug.Direction.Out)
+
+    def testCreatedShadersAreIndependent(self):
+        # counterparts, not the prototype plugs themselves
+        shader_type = self.shader_types[0]
+        first = self.importer.create_shader("first", shader_type)
+        second = self.importer.create_shader("second", shader_type)
+        for plug in first["parameters"].children():
+            self.assertFalse(plug.isSame(second["parameters"][plug.getName()]))
+            self.assertIsNone(plug.getInput())
+
+    def testSchemaMatchesPrototypes(self):
+        schema = self.importer.GafferCyclesSchema()
+        for shader_type in self.shader_types:
+            with self.subTest(shader_type=shader_type):
+                loaded = self.loaded_shader("loaded", shader_type)
+                for io in ("parameters", "out"):
+                    self.assertEqual(
+                        schema.plugs(shader_type, io),
+                        {plug.getName(): plug.typeName() for plug in loaded[io].children()}
+                    )
+
+    def testTiming(self):
+        # create_shader against loadShader for every mapped shader type, prototypes already loaded
+        for shader_type in self.shader_types:
+            self.importer.shader_prototype(shader_type)
+
+        start = time.perf_counter()
+        for _ in range(TIMING_REPEAT):
+            for shader_type in self.shader_types:
+                self.loaded_shader("loaded", shader_type)
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(TIMING_REPEAT):
+            for shader_type in self.shader_types:
+                self.importer.create_shader("created", shader_type)
+        create_time = time.perf_counter() - start
+
+        count = TIMING_REPEAT * len(self.shader_types)
+        print(f"{count} shaders: loadShader {load_time:.3f}s, create_shader {create_time:.3f}s")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import os
+
+import pytest
+
+from functions.Blender_Gcyc_Writer import GcycBinaryWriter, open_gcyc_writer
+from MagicHammer.Cycles_Import.gcyc_format import decode_gcyc_binary, load_gcyc
+from benchmarks.bench_gcyc_format import ENCODINGS, build_scene, write_scene
+
+
+def mixed_payload():
+    # Everything the binary encoding special cases, compared against what json reads back
+    links = [
+        {"from_node": f"Node.{i:03d}", "from_socket": "BSDF", "to_node": "Material Output", "to_socket": "Surface"}
+        for i in range(300)
+    ]
+    return {
+        "ints": [0, 1, -1, 63, -64, 2 ** 31, -(2 ** 31) - 1, 2 ** 64 + 7, -(2 ** 70)],
+        "floats": [0.0, -0.5, 1e-300, 3.141592653589793],
+        "flags": [None, True, False],
+        "unicode": ["Matériau", "シェーダー", "😀 emoji", ""],
+        # the same paths over and over, past the 240 short string references
+        "paths": [f"/root/set/prop_{i % 300}/mesh" for i in range(900)],
+        "links": links,
+        # not link records, written as a plain list
+        "almost_links": [{"from_node": "a", "from_socket": "b", "to_node": "c"}],
+        "nested": {"empty_dict": {}, "empty_list": [], "deep": [[[{"key": "value"}]]]},
+        "mat_by_index": {0: "Material", 12: "Other"}
+    }
+
+
+def write_binary(filepath, payload, compress=True):
+    with GcycBinaryWriter(str(filepath), compress=compress) as writer:
+        for name, entries in payload.items():
+            if isinstance(entries, dict):
+                writer.write_section(name, entries)
+            else:
+                writer.write_section(name, {"values": entries})
+
+
+@pytest.mark.parametrize("compress", (True, False))
+def test_binary_round_trip(tmp_path, compress):
+    payload = mixed_payload()
+    filepath = tmp_path / "mixed.gcyc"
+    write_binary(filepath, payload, compress)
+
+    expected = {name: entries if isinstance(entries, dict) else {"values": entries} for name, entries in payload.items()}
+    decoded = decode_gcyc_binary(filepath.read_bytes())
+    assert decoded == json.loads(json.dumps(expected))
+    assert load_gcyc(str(filepath)) == decoded
+
+
+def test_link_columns_and_interned_paths(tmp_path):
+    payload = mixed_payload()
+    filepath = tmp_path / "mixed.gcyc"
+    write_binary(filepath, payload, compress=False)
+    body = filepath.read_bytes()
+    # every string is stored once however many times it is used
+    assert body.count("Material Output".encode("utf-8")) == 1
+    assert body.count(b"prop_299") == 1
+    assert body.count("シェーダー".encode("utf-8")) == 1
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_encodings_read_back_the_same(tmp_path, encoding):
+    scene = build_scene(seed=3, material_count=20, nodes_per_material=5, object_count=200)
+    filepath = tmp_path / "scene.gcyc"
+    write_scene(str(filepath), scene, encoding)
+    assert load_gcyc(str(filepath)) == json.loads(json.dumps(scene))
+
+
+def test_rejects_other_versions(tmp_path):
+    filepath = tmp_path / "scene.gcyc"
+    write_binary(filepath, {"settings": {}})
+    data = bytearray(filepath.read_bytes())
+    data[4] += 1
+    with pytest.raises(ValueError):
+        decode_gcyc_binary(bytes(data))
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_non_string_entry_keys(tmp_path, encoding):
+    # entry keys are converted like json converts dict keys
+    filepath = tmp_path / "scene.gcyc"
+    write_scene(str(filepath), {"mat_by_index": {0: "Material", 1.5: None, True: 1}}, encoding)
+    assert load_gcyc(str(filepath)) == {"mat_by_index": {"0": "Material", "1.5": None, "true": 1}}
+
+
+class ExportFailed(Exception):
+    pass
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_failed_export_keeps_the_last_good_file(tmp_path, encoding):
+    filepath = tmp_path / "scene.gcyc"
+    write_scene(str(filepath), {"settings": {"version": 1}}, encoding)
+    good = filepath.read_bytes()
+
+    with pytest.raises(ExportFailed):
+        with open_gcyc_writer(str(filepath), encoding) as writer:
+            writer.write_section("settings", {"version": 2})
+            # fails between two sections, where a closed file would still parse
+            raise ExportFailed()
+
+    assert filepath.read_bytes() == good
+    assert os.listdir(tmp_path) == ["scene.gcyc"]
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_file_is_replaced_on_close(tmp_path, encoding):
+    filepath = tmp_path / "scene.gcyc"
+    write_scene(str(filepath), {"settings": {"version": 1}}, encoding)
+    with open_gcyc_writer(str(filepath), encoding) as writer:
+        writer.write_section("settings", {"version": 2})
+        # nothing replaced until the document is complete
+        assert load_gcyc(str(filepath)) == {"settings": {"version": 1}}
+    assert load_gcyc(str(filepath)) == {"settings": {"version": 2}}
+    assert os.listdir(tmp_path) == ["scene.gcyc"]
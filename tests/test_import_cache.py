@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from MagicHammer.Cycles_Import import import_cache
+from MagicHammer.Cycles_Import.import_cache import IMPORT_CACHE_SUFFIX, ImportCache
+
+
+OPTIONS = {"split_submeshes": True, "process_image_seq": True, "assigned": True, "gaffer": "1.5.0.0"}
+
+
+@pytest.fixture
+def gcyc(tmp_path):
+    path = tmp_path / "scene.gcyc"
+    path.write_text('{"materials": {}}')
+    return str(path)
+
+
+def store(cache, key, content=b"reference"):
+    temp_path = cache.temp_path(key)
+    with open(temp_path, "wb") as f:
+        f.write(content)
+    return cache.store(key, temp_path)
+
+
+def test_key_depends_on_content_and_options(tmp_path, gcyc):
+    cache = ImportCache(str(tmp_path / "cache"))
+    key = cache.key(gcyc, OPTIONS)
+    assert key.startswith(f"v{import_cache.IMPORT_CACHE_VERSION}-")
+    assert cache.key(gcyc, dict(OPTIONS)) == key
+    assert cache.key(gcyc, dict(OPTIONS, split_submeshes=False)) != key
+    with open(gcyc, "a") as f:
+        f.write(" ")
+    assert cache.key(gcyc, OPTIONS) != key
+
+
+def test_hit_and_miss(tmp_path, gcyc):
+    cache = ImportCache(str(tmp_path / "cache"))
+    key = cache.key(gcyc, OPTIONS)
+    assert cache.get(key) is None
+    path = store(cache, key)
+    assert cache.get(key) == path
+    assert (cache.hits, cache.misses) == (1, 1)
+    # nothing left behind by the store
+    assert os.listdir(cache.directory) == [key + IMPORT_CACHE_SUFFIX]
+
+
+def test_version_bump_invalidates_old_references(tmp_path, gcyc, monkeypatch):
+    cache = ImportCache(str(tmp_path / "cache"))
+    old_key = cache.key(gcyc, OPTIONS)
+    old_path = store(cache, old_key)
+
+    monkeypatch.setattr(import_cache, "IMPORT_CACHE_VERSION", import_cache.IMPORT_CACHE_VERSION + 1)
+    new_key = cache.key(gcyc, OPTIONS)
+    assert new_key != old_key
+    assert cache.get(new_key) is None
+
+    # the next store drops the references of the old version
+    new_path = store(cache, new_key)
+    assert not os.path.exists(old_path)
+    assert os.path.exists(new_path)
+
+
+def test_least_recently_used_are_evicted(tmp_path, gcyc):
+    cache = ImportCache(str(tmp_path / "cache"), max_bytes=25)
+    paths = []
+    for i in range(3):
+        key = cache.key(gcyc, dict(OPTIONS, index=i))
+        paths.append(store(cache, key, b"0123456789"))
+        os.utime(paths[-1], (i, i))
+    # 30 bytes, the oldest reference goes
+    cache.evict()
+    assert [os.path.exists(path) for path in paths] == [False, True, True]
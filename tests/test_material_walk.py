@@ -0,0 +1,37 @@
+import sys
+
+import pytest
+
+from blender_stand_in import build_chain, build_fan_in
+from benchmarks.bench_material_walk import (
+    CHAIN_DEPTH, FAN_IN_WIDTH, RecursiveMaterialExporter, build_random_graph, trace
+)
+
+
+def test_deep_chain_does_not_recurse():
+    material = build_chain(CHAIN_DEPTH)
+    assert CHAIN_DEPTH > sys.getrecursionlimit()
+    network = trace(material)
+    assert len(network["nodes"]) == CHAIN_DEPTH + 1
+    assert len(network["links"]) == CHAIN_DEPTH
+
+
+def test_deep_chain_broke_the_recursive_walk():
+    with pytest.raises(RecursionError):
+        trace(build_chain(CHAIN_DEPTH), RecursiveMaterialExporter)
+
+
+def test_fan_in():
+    network = trace(build_fan_in(FAN_IN_WIDTH))
+    # output, hub, root and one node per branch
+    assert len(network["nodes"]) == FAN_IN_WIDTH + 3
+    # hub -> output, branch -> hub and root -> branch
+    assert len(network["links"]) == 2 * FAN_IN_WIDTH + 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_same_order_as_recursive_walk(seed):
+    stack = trace(build_random_graph(seed))
+    recursive = trace(build_random_graph(seed), RecursiveMaterialExporter)
+    assert list(stack["nodes"]) == list(recursive["nodes"])
+    assert stack["links"] == recursive["links"]
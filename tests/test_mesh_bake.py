@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_mesh_bake import PerVertexHierarchyExporter, bake
+from functions.Blender_Hierarchy_Crawler import ScheneHierarchyExporter
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_texspace_matches_per_vertex_math(seed):
+    texspace, _, _ = bake(ScheneHierarchyExporter, size=40, seed=seed)
+    reference, _, _ = bake(PerVertexHierarchyExporter, size=40, seed=seed)
+    assert texspace.dtype == np.float32
+    # bit identical, not just close
+    assert texspace.tobytes() == reference.tobytes()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_face_mat_indices_match_per_face_loop(seed):
+    _, mat_ids, used_indices = bake(ScheneHierarchyExporter, size=40, material_count=3, seed=seed)
+    _, reference, reference_used = bake(PerVertexHierarchyExporter, size=40, material_count=3, seed=seed)
+    assert mat_ids.tolist() == reference.tolist()
+    assert used_indices == reference_used
+
+
+def test_out_of_range_indices_use_the_last_slot():
+    _, mat_ids, used_indices = bake(ScheneHierarchyExporter, size=20, material_count=2)
+    # the grid has indices from -1 up to material_count + 1
+    assert mat_ids.min() == 0 and mat_ids.max() == 1
+    assert used_indices == [0, 1]
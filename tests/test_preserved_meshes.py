@@ -0,0 +1,67 @@
+import sys
+import types
+
+from blender_stand_in import Material, MeshObject, build_grid_mesh
+from functions.Blender_Hierarchy_Crawler import BAKE_FINGERPRINT_PROP, ScheneHierarchyExporter
+
+
+def export(mesh, preserve_source_meshes):
+    # The hierarchy export and the USD export window of run_export, returns what the USD would see
+    obj = MeshObject("Object", mesh, materials=[Material("Red"), Material("Blue")])
+    exporter = ScheneHierarchyExporter(preserve_source_meshes=preserve_source_meshes)
+    exporter.export_objects = [obj]
+    dict(exporter.iter_serialized_hierarchy())
+    exporter.swap_in_baked_meshes()
+    try:
+        exported = obj.data
+        seen = {"name": exported.name, "attributes": set(exported.attributes), "copy": exported is not mesh}
+    finally:
+        exporter.restore_source_meshes()
+    assert obj.data is mesh
+    return seen
+
+
+def test_preserved_mesh_is_not_modified():
+    mesh = build_grid_mesh("Grid", 10, material_count=2)
+    seen = export(mesh, preserve_source_meshes=True)
+    assert seen == {"name": "Grid", "attributes": {"baked_texturespace", "mat_index"}, "copy": True}
+    assert mesh.name == "Grid"
+    assert not mesh.attributes and BAKE_FINGERPRINT_PROP not in mesh
+    # the copy is removed after the export
+    assert sys.modules["bpy"].data.meshes == []
+
+
+def test_unchanged_bake_is_skipped():
+    mesh = build_grid_mesh("Grid", 10, material_count=2)
+    assert export(mesh, preserve_source_meshes=False)["copy"] is False
+    assert set(mesh[BAKE_FINGERPRINT_PROP]) == {"baked_texturespace", "mat_index"}
+
+    baked = mesh.attributes["baked_texturespace"]
+    baked.data[0].vector = (9.0, 9.0, 9.0)
+    export(mesh, preserve_source_meshes=False)
+    # up to date fingerprint, not rebaked
+    assert baked.data[0].vector == (9.0, 9.0, 9.0)
+
+
+def test_preserve_reuses_a_bake_of_the_source():
+    mesh = build_grid_mesh("Grid", 10, material_count=2)
+    export(mesh, preserve_source_meshes=False)
+    seen = export(mesh, preserve_source_meshes=True)
+    # the source already holds the bake, no copy needed
+    assert seen["copy"] is False
+
+
+def test_linked_mesh_is_baked_into_a_copy_without_renaming():
+    mesh = build_grid_mesh("Grid", 10, material_count=2, library="props.blend")
+    for preserve_source_meshes in (False, True):
+        seen = export(mesh, preserve_source_meshes)
+        assert seen == {"name": "Grid", "attributes": {"baked_texturespace", "mat_index"}, "copy": True}
+        assert mesh.name == "Grid" and not mesh.attributes
+
+
+def test_system_override_is_not_swapped():
+    mesh = build_grid_mesh("Grid", 10, material_count=2)
+    mesh.override_library = types.SimpleNamespace(is_system_override=True)
+    seen = export(mesh, preserve_source_meshes=True)
+    assert seen == {"name": "Grid", "attributes": set(), "copy": False}
+    assert sys.modules["bpy"].data.meshes == []
@@ -0,0 +1,15 @@
+from blender_stand_in import build_multi_link
+from benchmarks.bench_record_link import ListScanMaterialExporter, trace
+
+
+def test_duplicate_links_are_dropped():
+    network = trace(build_multi_link(50, duplicates=3))
+    # sink -> output and one link per source
+    assert len(network["links"]) == 51
+    assert len({tuple(link.values()) for link in network["links"]}) == 51
+
+
+def test_same_links_as_list_scan():
+    keyed = trace(build_multi_link(200, duplicates=2))
+    scanned = trace(build_multi_link(200, duplicates=2), ListScanMaterialExporter)
+    assert keyed["links"] == scanned["links"]
@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from functions.Blender_Texture_Manifest import build_texture_manifest, to_ranges, write_texture_manifest
+from MagicHammer.Cycles_Import.texture_manifest import (
+    check_texture_manifest, describe_frames, from_ranges, load_texture_manifest, manifest_path_for
+)
+
+
+def touch(path, content=b"pixels"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+@pytest.fixture
+def textures(tmp_path):
+    # a single file, a '#' sequence with a gap and UDIM tiles
+    touch(tmp_path / "single.png")
+    for frame in (1, 2, 3, 5, 6):
+        touch(tmp_path / "seq" / f"fire.{frame:04d}.exr")
+    # not part of the sequence
+    touch(tmp_path / "seq" / "fire.12.exr")
+    touch(tmp_path / "seq" / "smoke.0001.exr")
+    for tile in (1001, 1002, 1011):
+        touch(tmp_path / "udim" / f"skin.{tile}.tx")
+    return {
+        "single": {"path": str(tmp_path / "single.png"), "pattern": None},
+        "sequence": {"path": str(tmp_path / "seq" / "fire.0001.exr"), "pattern": str(tmp_path / "seq" / "fire.####.exr")},
+        "udim": {"path": str(tmp_path / "udim" / "skin.<UDIM>.tx"), "pattern": None},
+        "absent": {"path": str(tmp_path / "absent.png"), "pattern": None}
+    }
+
+
+def export(tmp_path, textures):
+    # Writes the manifest like the exporter and reads it back like the importer
+    path = manifest_path_for(tmp_path / "scene.gcyc")
+    write_texture_manifest(path, build_texture_manifest(textures, jobs=4))
+    return load_texture_manifest(path)
+
+
+def test_ranges():
+    assert to_ranges([1, 2, 3, 7, 8, 10]) == [[1, 3], [7, 8], [10, 10]]
+    assert to_ranges([]) == []
+    assert from_ranges([[1, 3], [7, 8], [10, 10]]) == {1, 2, 3, 7, 8, 10}
+    assert describe_frames([1, 2, 3, 7, 8, 10]) == "1-3, 7-8, 10"
+    assert describe_frames(range(0, 20, 2), limit=2) == "0, 2, ..."
+
+
+def test_scan(tmp_path, textures):
+    manifest = export(tmp_path, textures)
+    entries = manifest["textures"]
+    assert manifest["missing"] == ["absent"]
+    assert entries["single"]["exists"] and entries["single"]["size"] == len(b"pixels")
+
+    sequence = entries["sequence"]["sequence"]
+    assert sequence["count"] == 5
+    assert sequence["frames"] == [[1, 3], [5, 6]]
+    assert sorted(sequence["files"], key=int) == ["1", "2", "3", "5", "6"]
+
+    udim = entries["udim"]["sequence"]
+    assert udim["frames"] == [[1001, 1002], [1011, 1011]]
+    assert entries["udim"]["size"] == 3 * len(b"pixels")
+
+
+def test_unchanged(tmp_path, textures):
+    assert check_texture_manifest(export(tmp_path, textures), jobs=4) == {"absent": "missing at export"}
+
+
+def test_missing_files(tmp_path, textures):
+    manifest = export(tmp_path, textures)
+    os.remove(textures["single"]["path"])
+    for name in os.listdir(tmp_path / "udim"):
+        os.remove(tmp_path / "udim" / name)
+    problems = check_texture_manifest(manifest)
+    assert problems["single"] == "missing"
+    assert problems["udim"] == "missing"
+
+
+def test_changed_files(tmp_path, textures):
+    manifest = export(tmp_path, textures)
+    touch(tmp_path / "single.png", b"new pixels")
+    # same size, other mtime
+    os.utime(tmp_path / "udim" / "skin.1002.tx", (0, 0))
+    problems = check_texture_manifest(manifest)
+    assert problems["single"] == "changed since export"
+    assert problems["udim"] == "1 frames changed since export (1002)"
+
+
+def test_changed_frames_with_the_same_count(tmp_path, textures):
+    manifest = export(tmp_path, textures)
+    # frame 5 deleted and frame 101 added, still 5 frames
+    os.remove(tmp_path / "seq" / "fire.0005.exr")
+    touch(tmp_path / "seq" / "fire.0101.exr")
+    problems = check_texture_manifest(manifest)
+    assert problems["sequence"] == "1 frames missing (5), 1 frames added (101)"
+
+
+def test_replaced_tile(tmp_path, textures):
+    manifest = export(tmp_path, textures)
+    touch(tmp_path / "udim" / "skin.1011.tx", b"other tile")
+    assert check_texture_manifest(manifest)["udim"] == "1 frames changed since export (1011)"
+
+
+def test_other_versions_are_ignored(tmp_path, textures):
+    path = manifest_path_for(tmp_path / "scene.gcyc")
+    manifest = build_texture_manifest(textures)
+    manifest["version"] = 1
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+    assert load_texture_manifest(path) is None